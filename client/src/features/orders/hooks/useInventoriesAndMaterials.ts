@@ -41,8 +41,32 @@ interface ApiMaterial {
   notes?: string;
 }
 
+// Grouped inventory from reports/inventory/grouped/
+interface InventoryLicensePlate {
+  license_plate: string;
+  warehouse: string;
+  quantity: number;
+}
+
+interface InventoryLot {
+  lot: string;
+  quantity: number;
+  license_plates: InventoryLicensePlate[];
+}
+
+export interface InventoryMaterialGroup {
+  material: number | null; // materials.Material id, null if the material is not in the portal yet
+  project: string;
+  material_code: string;
+  material_name: string;
+  uom: string;
+  quantity: number;
+  lots: InventoryLot[];
+}
+
 interface UseInventoriesAndMaterialsReturn {
   inventories: ApiInventory[];
+  groups: InventoryMaterialGroup[];
   materials: ApiMaterial[];
   loading: boolean;
   error: string | null;
@@ -53,13 +77,16 @@ interface UseInventoriesAndMaterialsReturn {
  * Hook to get inventories and materials filtered by warehouse
  * @param user Authenticated user
  * @param warehouse ID of the warehouse to filter inventories
- * @returns Inventory and material objects, loading state, possible error, and refresh function
+ * @param project ID of the order's project (defaults to all of the user's projects)
+ * @returns Inventory items, grouped inventory, material objects, loading state, possible error, and refresh function
  */
 const useInventoriesAndMaterials = (
   user: AuthUserData | null, 
-  warehouse: string | number | null
+  warehouse: string | number | null,
+  project?: string | number | null
 ): UseInventoriesAndMaterialsReturn => {
   const [inventories, setInventories] = useState<ApiInventory[]>([]);
+  const [groups, setGroups] = useState<InventoryMaterialGroup[]>([]);
   const [materials, setMaterials] = useState<ApiMaterial[]>([]);
   const [loading, setLoading] = useState<boolean>(true);
   const [error, setError] = useState<string | null>(null);
@@ -98,72 +125,49 @@ const useInventoriesAndMaterials = (
         setLoading(true);
         setError(null);
         
-        // Use SQL Server endpoint
-        const sqlResponse = await apiProtected.get('reports/inventory/?order_type=outbound');
+        // Inventory already grouped on the server (material -> lot -> license plate),
+        // with the real material id; materials are fetched in parallel
+        const projectFilter = project ? `&projects=${project}` : '';
+        const [groupedResponse, materialsData] = await Promise.all([
+          apiProtected.get(`reports/inventory/grouped/?order_type=outbound${projectFilter}`),
+          fetchMaterials(),
+        ]);
         
-        // Fetch materials from PostgreSQL in parallel
-        const materialsData = await fetchMaterials();
-        
-        if (sqlResponse.data && sqlResponse.data.results && Array.isArray(sqlResponse.data.results)) {
-          // Create a unique ID for each material to maintain relationships
-          const materialMap = new Map<string, number>();
-          const materialsArray: ApiMaterial[] = [];
+        if (groupedResponse.data && Array.isArray(groupedResponse.data.materials)) {
+          // Materials not in the portal yet can't be ordered (the API rejects them),
+          // so their groups are left out instead of being given a made-up id
+          const groupsData = (groupedResponse.data.materials as InventoryMaterialGroup[]).filter(
+            (group): group is InventoryMaterialGroup & { material: number } => group.material !== null
+          );
+          const warehouseId = typeof warehouse === 'string' ? parseInt(warehouse, 10) : (warehouse || 0);
           const inventoryItems: ApiInventory[] = [];
           
-          // First pass: identify unique materials
-          sqlResponse.data.results.forEach((item: any, index: number) => {
-            const materialCode = item['Material Code'];
-            if (!materialCode) {
-              return;
-            }
-            
-            if (!materialMap.has(materialCode)) {
-              const materialId = materialsArray.length + 1; // Start IDs from 1
-              const material: ApiMaterial = {
-                id: materialId,
-                name: item['Material Name'] || materialCode,
-                lookup_code: materialCode,
-                description: item['Material Name'] || materialCode,
-                project: 1, // Default project ID
-                status: 1,  // Active status
-                type: 1,    // Default type
-                uom: 1,     // Default UOM
-                is_serialized: false
-              };
-              materialMap.set(materialCode, materialId);
-              materialsArray.push(material);
-            }
-          });
-          
-          // Second pass: create inventory items linked to materials
-          sqlResponse.data.results.forEach((item: any, index: number) => {
-            const materialCode = item['Material Code'];
-            if (!materialCode) return;
-            
-            const materialId = materialMap.get(materialCode) || 0;
-            if (materialId === 0) {
-              return;
-            }
-            
-            const inventory: ApiInventory = {
-              id: index + 1,
-              material: materialId,
-              quantity: item['Available Quantity'] || 0,
-              location: item.warehouse || '',
-              license_plate: item['License Plate'] || '',
-              lot: item.Lot || '',
-              vendor_lot: '',
-              warehouse: typeof warehouse === 'string' ? parseInt(warehouse, 10) : (warehouse || 0)
-            };
-            
-            // Add extra properties needed by the UI
-            (inventory as any).materialCode = materialCode;
-            (inventory as any).materialName = item['Material Name'] || '';
-            (inventory as any).availableQty = item['Available Quantity'] || 0;
-            
-            inventoryItems.push(inventory);
+          // One inventory item per license plate, linked to the material's real id
+          groupsData.forEach((group) => {
+            group.lots.forEach((lot) => {
+              lot.license_plates.forEach((plate) => {
+                const inventory: ApiInventory = {
+                  id: inventoryItems.length + 1,
+                  material: group.material,
+                  quantity: plate.quantity,
+                  location: plate.warehouse,
+                  license_plate: plate.license_plate,
+                  lot: lot.lot,
+                  vendor_lot: '',
+                  warehouse: warehouseId
+                };
+                
+                // Add extra properties needed by the UI
+                (inventory as any).materialCode = group.material_code;
+                (inventory as any).materialName = group.material_name;
+                (inventory as any).availableQty = plate.quantity;
+                
+                inventoryItems.push(inventory);
+              });
+            });
           });
           
+          setGroups(groupsData);
           setMaterials(materialsData);
           setInventories(inventoryItems);
         } else {
@@ -181,9 +185,9 @@ const useInventoriesAndMaterials = (
     };
     
     fetchData();
-  }, [user, warehouse]);
+  }, [user, warehouse, project]);
 
-  return { inventories, materials, loading, error, refreshMaterials };
+  return { inventories, groups, materials, loading, error, refreshMaterials };
 };
 
 export default useInventoriesAndMaterials;
\ No newline at end of file
@@ -84,7 +84,7 @@ const MultiStepCreateOrder: React.FC = () => {
 
   const [formData, dispatch] = useReducer(formReducer, initialFormState);
   const { data: referenceData, refetchReferenceData } = useReferenceData(user);
-  const inventoriesAndMaterials = useInventoriesAndMaterials(user, formData.warehouse);
+  const inventoriesAndMaterials = useInventoriesAndMaterials(user, formData.warehouse, formData.project);
 
   const [orderId, setOrderId] = useState<string | null>(null);
   const [currentStep, setCurrentStep] = useState<number>(0);
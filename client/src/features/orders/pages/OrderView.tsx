@@ -26,23 +26,23 @@ const OrderView: React.FC = () => {
   const [error, setError] = useState<string>('');
 
   const referenceData = useReferenceData(user);
-  const inventoriesAndMaterials = useInventoriesAndMaterials(user, order?.warehouse);
+  const inventoriesAndMaterials = useInventoriesAndMaterials(user, order?.warehouse, order?.project);
 
   useEffect(() => {
     const fetchOrderData = async () => {
       try {
-        const orderResponse = await apiProtected.get(`orders/${orderId}/`);
-        console.log('Order data:', orderResponse.data);
-        setOrder(orderResponse.data);
+        // Una sola petición: la orden con sus líneas (material y UOM incluidos)
+        const orderResponse = await apiProtected.get(`orders/${orderId}/?expand=lines`);
+        const { lines = [], ...orderData } = orderResponse.data;
+        console.log('Order data:', orderData);
+        setOrder(orderData);
 
-        const linesResponse = await apiProtected.get(`order-lines/order/${orderId}/`);
-        const mappedLines = linesResponse.data.map((line: any) => ({
+        const mappedLines = lines.map((line: any) => ({
           ...line,
           orderQuantity: line.quantity // Add orderQuantity field
         }));
         setOrderLines(mappedLines);
-        console.log('Order lines:', mappedLines); // Log the mapped lines instead
-        setOrderLines(linesResponse.data);
+        console.log('Order lines:', mappedLines);
       } catch (err) {
         setError('Failed to load order details or lines.');
         console.error('Error fetching data:', err);
@@ -1,6 +1,5 @@
 import apiProtected from '../../../services/api/secureApi';
 import { ApiError } from '../../../types/auth';
-import { ApiResponse } from '../../../types/api';
 import { OrderStatus, OrderFormData } from '../../../types/orders';
 
 /**
@@ -14,6 +13,15 @@ export interface OrderLinePayload {
   lot: string | null; // Agregar el campo para el lote
 }
 
+/**
+ * Resultado del reemplazo masivo de líneas de orden
+ */
+export interface OrderLinesReplaceResult {
+  inserted: number;
+  updated: number;
+  deleted: number;
+}
+
 /**
  * Maneja errores de API y extrae mensajes de error
  * @param error Error de la API
@@ -56,22 +64,15 @@ export const saveOrderLines = async (
     console.log('Saving lines with orderId:', orderId);
     console.log('Selected inventories:', formData.selectedInventories);
 
-    // Eliminar líneas existentes
-    await apiProtected.delete(`order-lines/order/${orderId}/clear/`);
-    
-    // Crear nuevas líneas de orden
-    const orderLinePromises = formData.selectedInventories.map((item) => {
-      const orderLineData: OrderLinePayload = {
-        order: orderId,
-        material: typeof item.material === 'string' ? parseInt(item.material, 10) : item.material,
-        quantity: item.orderQuantity || 1,
-        license_plate: item.licensePlate || item.license_plate || null, // Incluir el license plate, usar null si no hay
-        lot: item.lot || null, // Incluir el lote, usar null si no hay lote
-      };
-      return apiProtected.post<ApiResponse<unknown>>('order-lines/', orderLineData);
-    });
-    
-    await Promise.all(orderLinePromises);
+    // Reemplazar todas las líneas de la orden en una sola transacción
+    const lines: Omit<OrderLinePayload, 'order'>[] = formData.selectedInventories.map((item) => ({
+      material: typeof item.material === 'string' ? parseInt(item.material, 10) : item.material,
+      quantity: item.orderQuantity || 1,
+      license_plate: item.licensePlate || item.license_plate || null, // Incluir el license plate, usar null si no hay
+      lot: item.lot || null, // Incluir el lote, usar null si no hay lote
+    }));
+
+    await apiProtected.put<OrderLinesReplaceResult>(`order-lines/order/${orderId}/replace/`, { lines });
     setError('Materials saved successfully');
     setOpenSnackbar(true);
     return true;
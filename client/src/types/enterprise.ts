@@ -41,6 +41,6 @@ export interface Project extends TimeStamped {
   carriers?: Carrier[]; // Optional ManyToMany relationship
   services?: CarrierService[]; // Optional ManyToMany relationship
   contacts?: Contact[]; // Optional ManyToMany relationship
-  export_format: 'JSON' | 'CSV';
+  export_format: 'JSON' | 'JSONL' | 'CSV' | 'TAB' | null;
   notes: string;
 }
\ No newline at end of file
@@ -0,0 +1,22 @@
+import os
+import tempfile
+
+
+def write_atomic(path, write, mode='w'):
+    """
+    Writes a file through a temporary file in the same directory, flushed to disk and
+    renamed into place, so readers never see a partial file.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.part')
+    try:
+        with os.fdopen(fd, mode, **({'newline': ''} if 'b' not in mode else {})) as tmp_file:
+            write(tmp_file)
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
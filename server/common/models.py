@@ -1,6 +1,59 @@
 from django.db import models
 from django.conf import settings
 
+class ChangeTrackingMixin:
+    """
+    Remembers the values of `tracked_fields` as they were loaded from the database,
+    so saves can detect real changes without re-reading the row.
+    Fields deferred at load time are not tracked and never report a change.
+    """
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_tracked_fields()
+        return instance
+
+    def _snapshot_tracked_fields(self, fields=None):
+        """Records the current values of the tracked fields.
+        With `fields`, only those fields (names or attnames) are re-recorded and the
+        rest keep the value they had in the database before."""
+        if fields is None:
+            self._loaded_values = {}
+            names = self.tracked_fields
+        else:
+            written = set(fields)
+            names = [
+                name for name in self.tracked_fields
+                if name in written or self._meta.get_field(name).attname in written
+            ]
+            self._loaded_values = dict(getattr(self, '_loaded_values', {}))
+        for name in names:
+            attname = self._meta.get_field(name).attname
+            if attname in self.__dict__:
+                self._loaded_values[name] = self.__dict__[attname]
+
+    def get_loaded_value(self, field_name):
+        """Returns the value the field had when the instance was loaded or last saved."""
+        return getattr(self, '_loaded_values', {}).get(field_name)
+
+    def has_changed(self, field_name):
+        loaded = getattr(self, '_loaded_values', {})
+        if field_name not in loaded:
+            return False
+        attname = self._meta.get_field(field_name).attname
+        return loaded[field_name] != getattr(self, attname)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Only the fields that were written now match the database
+        self._snapshot_tracked_fields(kwargs.get('update_fields'))
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._snapshot_tracked_fields(kwargs.get('fields'))
+
 class TimeStampedModel(models.Model):
     created_date = models.DateTimeField(auto_now_add=True)
     modified_date = models.DateTimeField(auto_now=True)
@@ -127,6 +127,113 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Order numbers reserved per counter lock. 1 keeps the sequence gap-free;
+# larger values let each worker pre-fetch a block for high-volume projects.
+ORDER_NUMBER_BLOCK_SIZE = 1
+
+# Order file export: submitted orders are written to the local spool directory by
+# the run_order_exports worker and then shipped in batches to the import share.
+ORDER_EXPORT_SPOOL_DIR = BASE_DIR / 'spool' / 'orders'
+ORDER_EXPORT_TARGET_DIR = r'\\wd02\Datex\Import\CRM_Orders_Import\test'
+ORDER_EXPORT_BATCH_SIZE = 50
+ORDER_EXPORT_MAX_ATTEMPTS = 8
+ORDER_EXPORT_RETRY_BASE_SECONDS = 30
+ORDER_EXPORT_RETRY_MAX_SECONDS = 3600
+ORDER_EXPORT_LEASE_SECONDS = 300  # a claimed job is skipped by other workers for this long
+
+# Base de datos de los reportes (ver reports/backends.py). Para trabajar sin SQL Server:
+# REPORTS_BACKEND = {
+#     'BACKEND': 'reports.backends.SQLiteBackend',
+#     'OPTIONS': {'path': BASE_DIR / 'local_footprint'},  # generada con manage.py seed_report_db
+# }
+REPORTS_BACKEND = {
+    'BACKEND': 'reports.backends.SQLServerBackend',
+    'OPTIONS': {
+        'server': 'WD02',
+        'database': 'FootPrint',
+        'driver': 'ODBC Driver 17 for SQL Server',
+    },
+}
+
+# SQL Server connection pool used by the reports app (one pool per worker process)
+REPORTS_POOL = {
+    'MAX_SIZE': 10,
+    'IDLE_TIMEOUT': 300,  # seconds before an unused connection is closed
+    'CHECKOUT_TIMEOUT': 30,  # seconds to wait for a free connection
+    'HEALTH_CHECK_INTERVAL': 30,  # connections idle longer than this are checked before reuse
+}
+
+# Rows fetched per fetchmany() call when a report is streamed (?stream=ndjson|csv)
+REPORTS_STREAM_CHUNK_SIZE = 1000
+
+# Tiempo máximo por consulta de reporte en segundos (ReportDefinition.timeout_seconds lo sobreescribe)
+REPORTS_QUERY_TIMEOUT = 120
+
+# Reportes en segundo plano (POST reports/<id>/jobs/)
+REPORTS_JOBS = {
+    'RESULT_DIR': BASE_DIR / 'spool' / 'reports',
+    'MAX_WORKERS': 4,  # threads per process running report queries
+    'MAX_ACTIVE': 8,  # pending + running jobs across all workers
+    'MAX_ACTIVE_PER_USER': 2,
+    'RETENTION_HOURS': 24,  # finished jobs and their files are pruned after this
+    # Running jobs not updated for this long are marked failed. They touch updated_at
+    # per streamed chunk, but not while the query runs: keep it above QUERY_TIMEOUT
+    'STALE_MINUTES': 60,
+    'HEARTBEAT_SECONDS': 30,  # minimum seconds between updated_at writes of a running job
+    'DISPATCH_GRACE_SECONDS': 60,  # PENDING jobs older than this are re-queued by run_report_jobs
+    'QUERY_TIMEOUT': 1800,  # seconds; background queries get a larger budget
+}
+
+# Reportes de varios proyectos: una consulta por proyecto en paralelo (threads por proceso)
+REPORTS_PROJECT_WORKERS = 8
+REPORTS_PROJECT_COLUMN = 'project_lookup_code'
+
+# Telemetría de ejecuciones de reportes (ReportExecution), escrita en lotes
+REPORTS_TELEMETRY = {
+    'ENABLED': True,
+    'BATCH_SIZE': 100,
+    'FLUSH_INTERVAL': 10,  # seconds
+}
+
+# Paginación en servidor de los reportes (?page_size=&cursor=&sort=)
+REPORTS_PAGE_SIZE = 100
+REPORTS_MAX_PAGE_SIZE = 5000
+
+# Reportes de ventana móvil (ReportDefinition.window_column/window_days), cacheados por día
+REPORTS_WINDOW = {
+    'OPEN_DAYS': 1,  # days (today included) always queried; older days are cached
+    'TIME_ZONE': TIME_ZONE,  # zone of the dates in FootPrint, decides where a day ends
+}
+
+# Caché de resultados de reportes: en la base de datos para compartirla entre workers
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'reports': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'reports_cache',  # creada por la migración reports.0002
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+}
+
+REPORTS_CACHE = {
+    'ALIAS': 'reports',
+    'INVENTORY_TTL': 60,  # seconds; reports declare their own cache_ttl
+    'LOCK_TIMEOUT': 120,  # minimum seconds a worker holds the fill lock (raised to the query timeout)
+    'POLL_INTERVAL': 0.2,  # seconds between checks while another worker fills the key
+    'RETRY_AFTER': 5,  # Retry-After of the 503 sent when a concurrent miss outlives the lock
+}
+
+# Copia local del inventario de FootPrint (manage.py sync_inventory)
+INVENTORY_SYNC = {
+    'SOURCE': 'snapshot',  # 'snapshot' sirve reports/inventory/ desde Postgres, 'sqlserver' siempre en vivo
+    'INTERVAL': 300,  # seconds between sync passes
+    'MAX_AGE': 1800,  # seconds; older snapshots are not served (SQL Server is queried instead)
+    'QUERY_TIMEOUT': 600,  # seconds for each project's source query
+    'BATCH_SIZE': 1000,  # rows per upsert statement
+}
+
 # Configure CORS and authentication
 CORS_ALLOWED_ORIGINS = [
     'http://localhost:3000',  # React Frontend
@@ -9,7 +9,7 @@ from materials.views import UOMViewSet, MaterialTypeViewSet, MaterialViewSet, Ma
 from inventory.views import InventoryViewSet, InventorySerialNumberViewSet
 from logistics.views import AddressViewSet, ContactViewSet, WarehouseViewSet, CarrierViewSet, CarrierServiceViewSet
 from orders.views import OrderStatusViewSet, OrderTypeViewSet, OrderClassViewSet, OrderViewSet, OrderLineViewSet
-from reports.views import ReportViewSet
+from reports.views import ReportViewSet, ReportJobViewSet
 
 # Swagger Configuration
 schema_view = get_schema_view(
@@ -47,6 +47,7 @@ router.register(r'order-classes', OrderClassViewSet)
 router.register(r'orders', OrderViewSet)
 router.register(r'order-lines', OrderLineViewSet)
 router.register(r'reports', ReportViewSet)
+router.register(r'report-jobs', ReportJobViewSet, basename='report-job')
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.6 on 2026-10-17 15:50
+
+from django.db import migrations, models
+
+
+def fill_missing_export_format(apps, schema_editor):
+    # Los proyectos sin formato siguen con el .tab de siempre; los configurados no se tocan
+    Project = apps.get_model('enterprise', 'Project')
+    Project.objects.filter(models.Q(export_format__isnull=True) | models.Q(export_format='')).update(export_format='TAB')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('enterprise', '0003_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='project',
+            name='export_format',
+            field=models.CharField(blank=True, choices=[('JSON', 'JSON File'), ('JSONL', 'JSON Lines File'), ('CSV', 'CSV File'), ('TAB', 'Tab-delimited File')], default='TAB', help_text='Export format for orders', max_length=5, null=True),
+        ),
+        migrations.RunPython(fill_missing_export_format, migrations.RunPython.noop),
+    ]
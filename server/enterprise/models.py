@@ -42,7 +42,9 @@ class Client(TimeStampedModel):
 class Project(TimeStampedModel):
     EXPORT_FORMAT_CHOICES = [
         ('JSON', 'JSON File'),
-        ('CSV', 'CSV File')
+        ('JSONL', 'JSON Lines File'),
+        ('CSV', 'CSV File'),
+        ('TAB', 'Tab-delimited File')
     ]
 
     is_active = models.BooleanField(default=True)
@@ -68,9 +70,9 @@ class Project(TimeStampedModel):
     contacts = models.ManyToManyField('logistics.Contact', related_name="projects", blank=True)
     # Ensure null=True and blank=True are present
     export_format = models.CharField(
-        max_length=4,
+        max_length=5,
         choices=EXPORT_FORMAT_CHOICES,
-        default='JSON',
+        default='TAB',
         help_text="Export format for orders",
         null=True,
         blank=True
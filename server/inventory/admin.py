@@ -1,12 +1,24 @@
 from django.contrib import admin
-from .models import Inventory, InventorySerialNumber
+from .models import Inventory, InventorySerialNumber, InventorySnapshot
 
 @admin.register(Inventory)
 class InventoryAdmin(admin.ModelAdmin):
-    list_display = ('project', 'warehouse', 'material', 'license_plate_id', 'quantity')
-    search_fields = ('license_plate_id',)
+    list_display = ('project', 'warehouse_name', 'material_code', 'lot', 'license_plate', 'quantity', 'snapshot_version')
+    list_filter = ('project',)
+    search_fields = ('license_plate_id', 'license_plate', 'material_code', 'lot')
 
 @admin.register(InventorySerialNumber)
 class InventorySerialNumberAdmin(admin.ModelAdmin):
     list_display = ('lookup_code', 'license_plate', 'status')
     search_fields = ('lookup_code',)
+
+@admin.register(InventorySnapshot)
+class InventorySnapshotAdmin(admin.ModelAdmin):
+    list_display = ('project', 'version', 'synced_at', 'row_count', 'changed_count', 'deleted_count', 'duration_ms')
+    list_filter = ('project',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,89 @@
+# inventory/grouping.py
+"""
+Inventario agrupado material -> lote -> LP para el formulario de órdenes, con las
+cantidades sumadas en cada nivel y el id real de materials.Material.
+
+Las filas vienen de inventory_by_project.sql (o de snapshot_inventory, con las mismas
+columnas) y la columna de proyecto al frente. Los materiales se resuelven por
+lookup_code con una sola consulta para todos los proyectos; los que aún no existen en
+el portal quedan con material = None.
+"""
+from decimal import Decimal
+from django.conf import settings
+from materials.models import Material
+
+
+def _quantity(value):
+    # pyodbc devuelve Decimal; la copia local puede traer float o texto
+    return value if isinstance(value, Decimal) else Decimal(str(value or 0))
+
+
+def material_ids(projects, keys):
+    """{(project_id, lookup_code): id} de los materiales del portal, en una consulta."""
+    codes = {code for _, code in keys}
+    if not codes:
+        return {}
+    return {
+        (project_id, lookup_code): material_id
+        for project_id, lookup_code, material_id in Material.objects.filter(
+            project__in=projects, lookup_code__in=codes
+        ).values_list('project_id', 'lookup_code', 'id')
+    }
+
+
+def group_inventory(columns, rows, projects):
+    """
+    Agrupa las filas del inventario. Devuelve la lista de materiales ordenada por
+    proyecto y código:
+
+        [{'material', 'project', 'material_code', 'material_name', 'uom', 'quantity',
+          'lots': [{'lot', 'quantity',
+                    'license_plates': [{'license_plate', 'warehouse', 'quantity'}]}]}]
+
+    El mismo LP en varias ubicaciones del mismo almacén se suma en una sola entrada.
+    """
+    position = {column: columns.index(column) for column in (
+        settings.REPORTS_PROJECT_COLUMN, 'Material Code', 'Material Name', 'Lot',
+        'License Plate', 'Available Quantity', 'UOM', 'warehouse',
+    )}
+    project_ids = {project.lookup_code: project.id for project in projects}
+
+    groups = {}
+    for row in rows:
+        project_code = row[position[settings.REPORTS_PROJECT_COLUMN]]
+        material_code = (row[position['Material Code']] or '').strip()
+        key = (project_ids[project_code], material_code)
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {
+                'material': None,
+                'project': project_code,
+                'material_code': material_code,
+                'material_name': row[position['Material Name']] or '',
+                'uom': row[position['UOM']] or '',
+                'lots': {},
+            }
+        lot = group['lots'].setdefault((row[position['Lot']] or '').strip(), {})
+        plate = ((row[position['License Plate']] or '').strip(), row[position['warehouse']] or '')
+        lot[plate] = lot.get(plate, 0) + _quantity(row[position['Available Quantity']])
+
+    ids = material_ids(projects, groups)
+    materials = []
+    for key in sorted(groups):
+        group = groups[key]
+        group['material'] = ids.get(key)
+        lots = []
+        for lot_code, plates in sorted(group.pop('lots').items()):
+            license_plates = [
+                {'license_plate': license_plate, 'warehouse': warehouse, 'quantity': quantity}
+                for (license_plate, warehouse), quantity in sorted(plates.items())
+            ]
+            lots.append({
+                'lot': lot_code,
+                'quantity': sum(plate['quantity'] for plate in license_plates),
+                'license_plates': license_plates,
+            })
+        group['quantity'] = sum(lot['quantity'] for lot in lots)
+        group['lots'] = lots
+        materials.append(group)
+    return materials
@@ -0,0 +1,33 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from enterprise.models import Project
+from inventory.sync import sync_inventory
+
+
+class Command(BaseCommand):
+    help = "Copies each project's inventory from FootPrint into Inventory and records a snapshot version."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', action='append', help="Only sync these project lookup codes")
+        parser.add_argument('--once', action='store_true', help="Sync a single pass and exit")
+        parser.add_argument('--interval', type=float, help="Seconds between passes (defaults to INVENTORY_SYNC['INTERVAL'])")
+
+    def handle(self, *args, **options):
+        interval = options['interval'] or settings.INVENTORY_SYNC['INTERVAL']
+        while True:
+            projects = Project.objects.order_by('lookup_code')
+            if options['project']:
+                projects = projects.filter(lookup_code__in=options['project'])
+                if not projects.exists():
+                    raise CommandError(f"Unknown project(s): {', '.join(options['project'])}")
+            for snapshot in sync_inventory(projects):
+                self.stdout.write(
+                    f"{snapshot.project.lookup_code} v{snapshot.version}: {snapshot.row_count} rows, "
+                    f"{snapshot.changed_count} changed, {snapshot.deleted_count} deleted ({snapshot.duration_ms:.0f} ms)"
+                )
+            if options['once']:
+                break
+            close_old_connections()
+            time.sleep(interval)
@@ -0,0 +1,82 @@
+# Generated by Django 5.1.6 on 2026-10-17 16:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('enterprise', '0004_project_export_format_choices'),
+        ('inventory', '0002_initial'),
+        ('logistics', '0002_initial'),
+        ('materials', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InventorySnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField()),
+                ('synced_at', models.DateTimeField()),
+                ('row_count', models.PositiveIntegerField(default=0)),
+                ('changed_count', models.PositiveIntegerField(default=0)),
+                ('deleted_count', models.PositiveIntegerField(default=0)),
+                ('duration_ms', models.FloatField(default=0)),
+            ],
+            options={
+                'get_latest_by': 'version',
+            },
+        ),
+        migrations.AddField(
+            model_name='inventory',
+            name='material_code',
+            field=models.CharField(blank=True, max_length=50),
+        ),
+        migrations.AddField(
+            model_name='inventory',
+            name='material_name',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='inventory',
+            name='snapshot_version',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='inventory',
+            name='uom',
+            field=models.CharField(blank=True, max_length=50),
+        ),
+        migrations.AddField(
+            model_name='inventory',
+            name='warehouse_name',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='inventory',
+            name='material',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='inventories', to='materials.material'),
+        ),
+        migrations.AlterField(
+            model_name='inventory',
+            name='warehouse',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='inventories', to='logistics.warehouse'),
+        ),
+        migrations.AddConstraint(
+            model_name='inventory',
+            constraint=models.UniqueConstraint(condition=models.Q(('snapshot_version__isnull', False)), fields=('project', 'warehouse_name', 'material_code', 'lot', 'license_plate'), name='inventory_source_key'),
+        ),
+        migrations.AddField(
+            model_name='inventorysnapshot',
+            name='project',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='inventory_snapshots', to='enterprise.project'),
+        ),
+        migrations.AddConstraint(
+            model_name='inventorysnapshot',
+            constraint=models.UniqueConstraint(fields=('project', 'version'), name='inventory_snapshot_version'),
+        ),
+    ]
@@ -6,9 +6,14 @@ from logistics.models import Warehouse
 from materials.models import Material
 
 class Inventory(TimeStampedModel):
+    """
+    Inventario por proyecto. Las filas con snapshot_version las escribe sync_inventory
+    a partir de FootPrint (ver inventory/sync.py); warehouse y material quedan vacíos
+    si no existen en el portal, los nombres de origen se guardan igualmente.
+    """
     project = models.ForeignKey(Project, on_delete=models.PROTECT, related_name='inventories')
-    warehouse = models.ForeignKey(Warehouse, on_delete=models.PROTECT, related_name='inventories')
-    material = models.ForeignKey(Material, on_delete=models.PROTECT, related_name='inventories')
+    warehouse = models.ForeignKey(Warehouse, on_delete=models.PROTECT, related_name='inventories', null=True, blank=True)
+    material = models.ForeignKey(Material, on_delete=models.PROTECT, related_name='inventories', null=True, blank=True)
     quantity = models.DecimalField(max_digits=10, decimal_places=2)
     location = models.CharField(max_length=50, blank=True)
     license_plate_id = models.CharField(
@@ -19,10 +24,46 @@ class Inventory(TimeStampedModel):
     license_plate = models.CharField(max_length=50, blank=True)
     lot = models.CharField(max_length=50, blank=True)
     vendor_lot = models.CharField(max_length=50, blank=True)
+    # Valores de FootPrint, tal como los devuelve reports/sql/inventory/inventory_by_project.sql
+    warehouse_name = models.CharField(max_length=100, blank=True)
+    material_code = models.CharField(max_length=50, blank=True)
+    material_name = models.CharField(max_length=255, blank=True)
+    uom = models.CharField(max_length=50, blank=True)
+    # Versión de InventorySnapshot que escribió la fila por última vez (None = fila manual)
+    snapshot_version = models.PositiveIntegerField(null=True, blank=True, editable=False)
+
+    class Meta:
+        constraints = [
+            # Clave de las filas sincronizadas; las filas manuales (sin snapshot_version) no la usan
+            models.UniqueConstraint(
+                fields=['project', 'warehouse_name', 'material_code', 'lot', 'license_plate'],
+                condition=models.Q(snapshot_version__isnull=False),
+                name='inventory_source_key'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.license_plate}"
 
+class InventorySnapshot(models.Model):
+    """One successful sync of a project's inventory from FootPrint."""
+    project = models.ForeignKey(Project, on_delete=models.PROTECT, related_name='inventory_snapshots')
+    version = models.PositiveIntegerField()
+    synced_at = models.DateTimeField()
+    row_count = models.PositiveIntegerField(default=0)
+    changed_count = models.PositiveIntegerField(default=0)
+    deleted_count = models.PositiveIntegerField(default=0)
+    duration_ms = models.FloatField(default=0)
+
+    class Meta:
+        get_latest_by = 'version'
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'version'], name='inventory_snapshot_version'),
+        ]
+
+    def __str__(self):
+        return f"{self.project} v{self.version}"
+
 class InventorySerialNumber(TimeStampedModel):
     lookup_code = models.CharField(max_length=50, unique=True)
     status = models.ForeignKey(Status, on_delete=models.PROTECT, related_name='serial_numbers')
@@ -0,0 +1,193 @@
+# inventory/sync.py
+"""
+Copia del inventario de FootPrint en Inventory, para que reports/inventory/ no dependa
+de SQL Server en cada carga de pantalla.
+
+Cada pasada lee el inventario del proyecto con la misma consulta del endpoint
+(reports/sql/inventory/inventory_by_project.sql), lo agrupa por clave
+(almacén, material, lote, LP) y compara con lo guardado: solo se escriben las filas
+nuevas o cambiadas (insert o update según la clave) y se borran las que ya no están.
+La vista de FootPrint no expone fechas de modificación, así que la parte incremental
+es la escritura.
+Cada pasada registra un InventorySnapshot con su versión y hora.
+"""
+import logging
+import time
+from datetime import timedelta
+from decimal import Decimal
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from enterprise.models import Project
+from logistics.models import Warehouse
+from materials.models import Material
+from reports.parameters import filter_q
+from reports.report_manager import SQLReportManager
+from .models import Inventory, InventorySnapshot
+
+logger = logging.getLogger(__name__)
+
+# Columnas del resultado de inventory_by_project.sql -> campos de Inventory
+COLUMN_FIELDS = {
+    'warehouse': 'warehouse_name',
+    'Material Code': 'material_code',
+    'Material Name': 'material_name',
+    'Lot': 'lot',
+    'License Plate': 'license_plate',
+    'Available Quantity': 'quantity',
+    'UOM': 'uom',
+}
+SNAPSHOT_COLUMNS = [
+    'Project Lookup Code', 'Material Code', 'Material Name', 'Lot', 'License Plate',
+    'Available Quantity', 'UOM', 'warehouse',
+]
+KEY_FIELDS = ('warehouse_name', 'material_code', 'lot', 'license_plate')
+VALUE_FIELDS = ('material_name', 'uom', 'quantity', 'warehouse_id', 'material_id')
+QUANTITY_STEP = Decimal('0.01')
+
+
+def fetch_inventory(project):
+    """
+    Inventario actual del proyecto en FootPrint: {clave: {campo: valor}}. Las filas con
+    la misma clave (p.ej. el mismo LP en dos ubicaciones) se suman.
+    """
+    from reports.views import report_pool  # el pool de SQL Server vive con las vistas
+
+    manager = SQLReportManager()
+    sql = manager.load_sql('inventory', 'inventory_by_project.sql')
+    inventory = {}
+    with report_pool.connection() as conn:
+        chunks = manager.stream_sql(
+            conn, sql, [project.lookup_code], chunk_size=settings.REPORTS_STREAM_CHUNK_SIZE,
+            timeout=settings.INVENTORY_SYNC['QUERY_TIMEOUT']
+        )
+        columns = next(chunks)
+        positions = {field: columns.index(column) for column, field in COLUMN_FIELDS.items()}
+        for rows in chunks:
+            for row in rows:
+                values = {field: row[position] for field, position in positions.items()}
+                key = tuple((values[field] or '').strip() for field in KEY_FIELDS)
+                quantity = Decimal(values['quantity'] or 0)
+                if key in inventory:
+                    inventory[key]['quantity'] += quantity
+                    continue
+                inventory[key] = {
+                    'material_name': values['material_name'] or '',
+                    'uom': values['uom'] or '',
+                    'quantity': quantity,
+                }
+    return inventory
+
+
+def sync_project(project, inventory=None):
+    """Sincroniza un proyecto y devuelve su nuevo InventorySnapshot."""
+    started = time.perf_counter()
+    if inventory is None:
+        inventory = fetch_inventory(project)
+
+    # Enlazar con el almacén y el material del portal cuando existen
+    warehouses = dict(Warehouse.objects.values_list('lookup_code', 'id'))
+    warehouses.update(Warehouse.objects.values_list('name', 'id'))
+    materials = dict(Material.objects.filter(project=project).values_list('lookup_code', 'id'))
+    for (warehouse_name, material_code, _, _), values in inventory.items():
+        values['quantity'] = values['quantity'].quantize(QUANTITY_STEP)
+        values['warehouse_id'] = warehouses.get(warehouse_name)
+        values['material_id'] = materials.get(material_code)
+
+    with transaction.atomic():
+        # Una sola sincronización por proyecto a la vez
+        Project.objects.select_for_update().filter(pk=project.pk).first()
+        version = (InventorySnapshot.objects.filter(project=project).aggregate(Max('version'))['version__max'] or 0) + 1
+
+        existing = {}
+        for row in Inventory.objects.filter(project=project, snapshot_version__isnull=False).values_list(
+            'id', *KEY_FIELDS, *VALUE_FIELDS
+        ):
+            existing[row[1:1 + len(KEY_FIELDS)]] = (row[0], row[1 + len(KEY_FIELDS):])
+
+        # El proyecto está bloqueado, así que `existing` decide entre insertar y actualizar
+        # (inventory_source_key es parcial y no sirve para ON CONFLICT)
+        now = timezone.now()
+        to_create, to_update = [], []
+        for key, values in inventory.items():
+            if key not in existing:
+                to_create.append(Inventory(project=project, snapshot_version=version, **dict(zip(KEY_FIELDS, key)), **values))
+            elif existing[key][1] != tuple(values[field] for field in VALUE_FIELDS):
+                to_update.append(Inventory(
+                    id=existing[key][0], snapshot_version=version, modified_date=now, **values
+                ))
+        batch_size = settings.INVENTORY_SYNC['BATCH_SIZE']
+        Inventory.objects.bulk_create(to_create, batch_size=batch_size)
+        Inventory.objects.bulk_update(
+            to_update, [*VALUE_FIELDS, 'snapshot_version', 'modified_date'], batch_size=batch_size
+        )
+        changed = to_create + to_update
+
+        gone = Inventory.objects.filter(id__in=[pk for key, (pk, _) in existing.items() if key not in inventory])
+        # Las filas con números de serie no se pueden borrar (PROTECT): quedan en cero
+        gone.filter(serial_numbers__isnull=False).exclude(quantity=0).update(
+            quantity=0, snapshot_version=version, modified_date=timezone.now()
+        )
+        deleted, _ = gone.filter(serial_numbers__isnull=True).delete()
+
+        return InventorySnapshot.objects.create(
+            project=project,
+            version=version,
+            synced_at=timezone.now(),
+            row_count=len(inventory),
+            changed_count=len(changed),
+            deleted_count=deleted,
+            duration_ms=round((time.perf_counter() - started) * 1000, 3),
+        )
+
+
+def sync_inventory(projects=None):
+    """
+    Sincroniza los proyectos indicados (todos por defecto). Un proyecto que falla se
+    registra y no detiene a los demás. Devuelve los snapshots creados.
+    """
+    if projects is None:
+        projects = Project.objects.order_by('lookup_code')
+    snapshots = []
+    for project in projects:
+        try:
+            snapshots.append(sync_project(project))
+        except Exception:
+            logger.exception("Inventory sync failed for project %s", project.lookup_code)
+    return snapshots
+
+
+def latest_snapshots(projects, max_age=None):
+    """
+    Último snapshot de cada proyecto, o None si alguno no tiene (o es más antiguo que
+    `max_age` segundos): entonces hay que consultar FootPrint.
+    """
+    latest_ids = (
+        InventorySnapshot.objects.filter(project__in=projects)
+        .values('project').annotate(latest=Max('id')).values('latest')
+    )
+    latest = {snapshot.project_id: snapshot for snapshot in InventorySnapshot.objects.filter(id__in=latest_ids)}
+    oldest = timezone.now() - timedelta(seconds=max_age) if max_age else None
+    for project in projects:
+        snapshot = latest.get(project.id)
+        if snapshot is None or (oldest and snapshot.synced_at < oldest):
+            return None
+    return [latest[project.id] for project in projects]
+
+
+def snapshot_inventory(projects, filters=(), chunk_size=2000):
+    """
+    El inventario de los proyectos desde Inventory, con las mismas columnas que
+    inventory_by_project.sql. Devuelve (columnas, iterador de filas); `filters` son los
+    de reports.parameters.parse_filters.
+    """
+    lookup_codes = {project.id: project.lookup_code for project in projects}
+    rows = (
+        Inventory.objects.filter(project__in=projects, snapshot_version__isnull=False)
+        .filter(filter_q(filters, COLUMN_FIELDS))
+        .order_by('project_id', *KEY_FIELDS)
+        .values_list('project_id', *(COLUMN_FIELDS[column] for column in SNAPSHOT_COLUMNS[1:]))
+        .iterator(chunk_size=chunk_size)
+    )
+    return SNAPSHOT_COLUMNS, ([lookup_codes[project_id], *values] for project_id, *values in rows)
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import OrderClass, OrderType, OrderStatus, Order, OrderLine, OrderCounter
+from django.utils import timezone
+from .models import OrderClass, OrderType, OrderStatus, Order, OrderLine, OrderCounter, OrderExportJob
 
 @admin.register(OrderStatus)
 class OrderClassAdmin(admin.ModelAdmin):
@@ -29,4 +30,17 @@ class OrderLineAdmin(admin.ModelAdmin):
 @admin.register(OrderCounter)
 class OrderCounterAdmin(admin.ModelAdmin):
     list_display = ('project', 'last_number')
-    search_fields = ('project__name',)
\ No newline at end of file
+    search_fields = ('project__name',)
+
+@admin.register(OrderExportJob)
+class OrderExportJobAdmin(admin.ModelAdmin):
+    list_display = ('order', 'status', 'attempts', 'next_attempt_at', 'shipped_at', 'last_error')
+    list_filter = ('status',)
+    search_fields = ('order__lookup_code_order',)
+    actions = ['retry_jobs']
+
+    @admin.action(description="Retry selected export jobs")
+    def retry_jobs(self, request, queryset):
+        queryset.filter(status=OrderExportJob.FAILED).update(
+            status=OrderExportJob.PENDING, attempts=0, next_attempt_at=timezone.now()
+        )
@@ -0,0 +1,128 @@
+import logging
+import os
+import shutil
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from common.files import write_atomic
+from .models import Order, OrderExportJob, OrderSummary
+from .utils import export_queryset, write_orders
+from .writers import get_writer
+
+logger = logging.getLogger(__name__)
+
+
+def export_file_name(order):
+    return f"order_{order.lookup_code_order}.{get_writer(order.project.export_format).extension}"
+
+
+def claim_jobs(status, order_by, batch_size):
+    """
+    Leases due jobs in a short transaction: their next_attempt_at moves past the lease,
+    so other workers skip them while the files are written outside any row lock. A job
+    whose worker dies becomes due again when the lease runs out.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            OrderExportJob.objects.select_for_update(skip_locked=True)
+            .filter(status=status, next_attempt_at__lte=now)
+            .order_by(*order_by)[:batch_size]
+        )
+        OrderExportJob.objects.filter(pk__in=[job.pk for job in jobs]).update(
+            next_attempt_at=now + timedelta(seconds=settings.ORDER_EXPORT_LEASE_SECONDS)
+        )
+    return jobs
+
+
+def spool_pending(batch_size=None, spool_dir=None):
+    """Writes the files of pending jobs to the spool directory. Returns the number spooled."""
+    batch_size = batch_size or settings.ORDER_EXPORT_BATCH_SIZE
+    spool_dir = str(spool_dir or settings.ORDER_EXPORT_SPOOL_DIR)
+    spooled = 0
+
+    jobs = claim_jobs(OrderExportJob.PENDING, ('id',), batch_size)
+    orders = {order.pk: order for order in export_queryset(Order.objects.filter(id__in=[job.order_id for job in jobs]))}
+
+    for job in jobs:
+        order = orders[job.order_id]
+        try:
+            path = os.path.join(spool_dir, export_file_name(order))
+            write_atomic(path, lambda out: write_orders([order], out, order.project.export_format))
+        except (OSError, ValueError) as exc:
+            logger.warning("Could not spool order %s: %s", order.lookup_code_order, exc)
+            job.record_failure(exc)
+            job.save()
+            continue
+
+        # Only flag the order once its file is safely on disk
+        with transaction.atomic():
+            Order.objects.filter(pk=order.pk).update(file_generated=True, file_generated_at=timezone.now())
+            OrderSummary.objects.filter(order_id=order.pk).update(file_generated=True)
+            job.status = OrderExportJob.SPOOLED
+            job.spool_path = path
+            job.attempts = 0
+            job.next_attempt_at = timezone.now()
+            job.save()
+        spooled += 1
+
+    return spooled
+
+
+def ship_spooled(batch_size=None, target_dir=None):
+    """
+    Copies spooled files to the target directory. A failure stops the batch, since it
+    usually means the share is unavailable, and the job is retried with backoff.
+    Returns the number shipped.
+    """
+    batch_size = batch_size or settings.ORDER_EXPORT_BATCH_SIZE
+    target_dir = str(target_dir or settings.ORDER_EXPORT_TARGET_DIR)
+    shipped = 0
+
+    jobs = claim_jobs(OrderExportJob.SPOOLED, ('next_attempt_at', 'id'), batch_size)
+    for position, job in enumerate(jobs):
+        target_path = os.path.join(target_dir, os.path.basename(job.spool_path))
+        if not os.path.exists(job.spool_path):
+            if not os.path.exists(target_path):
+                # The spool file is gone and never reached the share: write it again
+                logger.warning("Spool file %s is missing, re-spooling", job.spool_path)
+                job.status = OrderExportJob.PENDING
+                job.next_attempt_at = timezone.now()
+                job.save()
+                continue
+            # Shipped before the status was saved (e.g. the worker stopped in between)
+        else:
+            try:
+                with open(job.spool_path, 'rb') as spool_file:
+                    write_atomic(target_path, lambda out: shutil.copyfileobj(spool_file, out), mode='wb')
+            except OSError as exc:
+                logger.warning("Could not ship %s: %s", job.spool_path, exc)
+                job.record_failure(exc)
+                job.save()
+                # Give the rest of the batch back without waiting for the lease
+                OrderExportJob.objects.bulk_update(jobs[position + 1:], ['next_attempt_at'])
+                break
+
+        with transaction.atomic():
+            job.status = OrderExportJob.SHIPPED
+            job.shipped_at = timezone.now()
+            job.last_error = ''
+            job.save()
+            # The spool file is only removed once SHIPPED is committed
+            transaction.on_commit(lambda path=job.spool_path: _remove_spool_file(path))
+        shipped += 1
+
+    return shipped
+
+
+def _remove_spool_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def process_exports(batch_size=None):
+    """Runs one spool pass and one ship pass."""
+    return spool_pending(batch_size), ship_spooled(batch_size)
@@ -0,0 +1,73 @@
+import io
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from materials.models import Material
+from orders.models import Order, OrderLine
+from orders.utils import export_orders, prefetch_for_export, write_orders
+
+
+class Command(BaseCommand):
+    help = (
+        "Exports throwaway orders with growing line counts and reports queries and time, "
+        "to check that the export query count stays constant. All data is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lines', type=int, nargs='+', default=[1, 10, 100, 1000])
+        parser.add_argument('--template-order', type=int, help="Order whose relations are copied (defaults to the latest)")
+
+    def handle(self, *args, **options):
+        template = Order.objects.order_by('-id')
+        if options['template_order']:
+            template = template.filter(id=options['template_order'])
+        template = template.first()
+        if template is None:
+            raise CommandError("An existing order is needed to copy relations from")
+        material = Material.objects.filter(project_id=template.project_id).first() or Material.objects.first()
+        if material is None:
+            raise CommandError("At least one material is needed to build order lines")
+
+        with transaction.atomic():
+            for line_count in options['lines']:
+                order = self._build_order(template, material, line_count)
+                single = self._measure(lambda: self._export_single(order.pk))
+                batch = self._measure(lambda: export_orders(Order.objects.filter(pk=order.pk), io.StringIO()))
+                self.stdout.write(
+                    f"lines={line_count:<6} single: {single[0]:>3} queries {single[1] * 1000:8.1f} ms   "
+                    f"queryset: {batch[0]:>3} queries {batch[1] * 1000:8.1f} ms"
+                )
+            transaction.set_rollback(True)
+
+    def _build_order(self, template, material, line_count):
+        order = Order.objects.create(
+            order_type_id=template.order_type_id,
+            order_class_id=template.order_class_id,
+            order_status_id=template.order_status_id,
+            project_id=template.project_id,
+            warehouse_id=template.warehouse_id,
+            contact_id=template.contact_id,
+            shipping_address_id=template.shipping_address_id,
+            billing_address_id=template.billing_address_id,
+            carrier_id=template.carrier_id,
+            service_type_id=template.service_type_id,
+        )
+        OrderLine.objects.bulk_create(
+            OrderLine(order=order, material=material, quantity=1, license_plate=f"LP{i}")
+            for i in range(line_count)
+        )
+        return order
+
+    def _export_single(self, order_id):
+        # Same path as the save hook: a plain fetched order, relations loaded by the exporter
+        order = Order.objects.get(pk=order_id)
+        prefetch_for_export([order])
+        write_orders([order], io.StringIO())
+
+    def _measure(self, func):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+        return len(queries.captured_queries), elapsed
@@ -0,0 +1,109 @@
+import time
+import threading
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from enterprise.models import Project
+from orders.models import Order, OrderCounter, OrderNumberAllocator
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates orders from N concurrent threads and compares throughput of the per-order "
+        "row lock against block-reserved order numbers. Runs on a throwaway project that is "
+        "removed afterwards."
+    )
+
+    MODES = ('row-lock', 'block', 'prefetch')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--orders', type=int, default=50, help="Orders created by each thread")
+        parser.add_argument('--block-size', type=int, default=50, help="Block size for the prefetch mode")
+        parser.add_argument('--template-order', type=int, help="Order whose relations are copied (defaults to the latest)")
+        parser.add_argument('--mode', choices=self.MODES, action='append', help="Modes to run (defaults to all)")
+
+    def handle(self, *args, **options):
+        template = Order.objects.order_by('-id')
+        if options['template_order']:
+            template = template.filter(id=options['template_order'])
+        template = template.select_related('project').first()
+        if template is None:
+            raise CommandError("An existing order is needed to copy relations from")
+
+        for mode in options['mode'] or self.MODES:
+            project = self._create_project(template.project, mode)
+            try:
+                elapsed = self._run(mode, project, template, options)
+                total = options['threads'] * options['orders']
+                self.stdout.write(
+                    f"{mode:<10} threads={options['threads']:<3} orders={total:<6} "
+                    f"{elapsed:8.3f}s {total / elapsed:10.1f} orders/s"
+                )
+            finally:
+                Order.objects.filter(project=project).delete()
+                OrderCounter.objects.filter(project=project).delete()
+                project.delete()
+
+    def _create_project(self, source, mode):
+        suffix = f"{int(time.time() * 1000) % 100000}{self.MODES.index(mode)}"
+        return Project.objects.create(
+            name=f"Benchmark {mode}",
+            lookup_code=f"__bench_{suffix}",
+            orders_prefix=f"B{suffix}"[:10],
+            client_id=source.client_id,
+            is_active=False,
+        )
+
+    def _allocator(self, mode, block_size):
+        if mode == 'row-lock':
+            def next_number(project):
+                # Previous path: get_or_create plus SELECT ... FOR UPDATE on every order
+                counter, _ = OrderCounter.objects.get_or_create(project=project)
+                with transaction.atomic():
+                    counter = OrderCounter.objects.select_for_update().get(id=counter.id)
+                    counter.last_number += 1
+                    counter.save()
+                    return counter.last_number
+            return next_number
+        return OrderNumberAllocator(block_size if mode == 'prefetch' else 1).next_number
+
+    def _run(self, mode, project, template, options):
+        next_number = self._allocator(mode, options['block_size'])
+        errors = []
+        barrier = threading.Barrier(options['threads'] + 1)
+
+        def worker():
+            try:
+                barrier.wait()
+                for _ in range(options['orders']):
+                    with transaction.atomic():
+                        code = f"{project.orders_prefix}-{str(next_number(project)).zfill(6)}"
+                        Order.objects.create(
+                            lookup_code_order=code,
+                            lookup_code_shipment=code,
+                            order_type_id=template.order_type_id,
+                            order_class_id=template.order_class_id,
+                            order_status_id=template.order_status_id,
+                            project=project,
+                            warehouse_id=template.warehouse_id,
+                            contact_id=template.contact_id,
+                            shipping_address_id=template.shipping_address_id,
+                            billing_address_id=template.billing_address_id,
+                        )
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(options['threads'])]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        if errors:
+            raise CommandError(f"{mode}: {len(errors)} worker(s) failed, first error: {errors[0]!r}")
+        return elapsed
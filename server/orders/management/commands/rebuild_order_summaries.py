@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from orders.models import Order, OrderSummary
+
+
+class Command(BaseCommand):
+    help = "Recomputes the OrderSummary read table from Order and OrderLine."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', type=int, action='append', help="Only rebuild these project ids")
+
+    def handle(self, *args, **options):
+        orders = Order.objects.all()
+        if options['project']:
+            orders = orders.filter(project_id__in=options['project'])
+
+        with transaction.atomic():
+            order_ids = list(orders.order_by('id').values_list('id', flat=True))
+            OrderSummary.refresh(order_ids)
+        self.stdout.write(f"Rebuilt {len(order_ids)} order summaries")
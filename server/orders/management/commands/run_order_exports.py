@@ -0,0 +1,21 @@
+import time
+from django.core.management.base import BaseCommand
+from orders.export import process_exports
+
+
+class Command(BaseCommand):
+    help = "Writes queued order files to the spool directory and ships them to the import share."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Process a single pass and exit")
+        parser.add_argument('--interval', type=float, default=5, help="Seconds between passes")
+        parser.add_argument('--batch-size', type=int, help="Jobs per pass (defaults to ORDER_EXPORT_BATCH_SIZE)")
+
+    def handle(self, *args, **options):
+        while True:
+            spooled, shipped = process_exports(options['batch_size'])
+            if spooled or shipped:
+                self.stdout.write(f"Spooled {spooled}, shipped {shipped}")
+            if options['once']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.6 on 2026-10-17 15:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('enterprise', '0004_project_export_format_choices'),
+        ('logistics', '0002_initial'),
+        ('orders', '0004_orderexportjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['project', '-created_date', '-id'], name='order_project_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['project', 'order_status', '-created_date'], name='order_project_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['project', 'order_type', '-created_date'], name='order_project_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['lookup_code_order'], name='order_lookup_code_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
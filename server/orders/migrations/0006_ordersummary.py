@@ -0,0 +1,90 @@
+# Generated by Django 5.1.6 on 2026-10-17 15:52
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_summaries(apps, schema_editor):
+    Order = apps.get_model('orders', 'Order')
+    OrderSummary = apps.get_model('orders', 'OrderSummary')
+    orders = (
+        Order.objects.select_related('order_status', 'order_type', 'contact', 'shipping_address')
+        .annotate(line_count=Count('lines'), total_quantity=Coalesce(Sum('lines__quantity'), Decimal('0')))
+        .order_by('id')
+    )
+    OrderSummary.objects.bulk_create(
+        (
+            OrderSummary(
+                order_id=order.id,
+                project_id=order.project_id,
+                warehouse_id=order.warehouse_id,
+                order_status_id=order.order_status_id,
+                order_type_id=order.order_type_id,
+                order_class_id=order.order_class_id,
+                contact_id=order.contact_id,
+                shipping_address_id=order.shipping_address_id,
+                lookup_code_order=order.lookup_code_order,
+                reference_number=order.reference_number,
+                status_name=order.order_status.status_name,
+                type_name=order.order_type.type_name,
+                contact_company=order.contact.company_name,
+                ship_to_city=order.shipping_address.city,
+                ship_to_state=order.shipping_address.state,
+                line_count=order.line_count,
+                total_quantity=order.total_quantity,
+                file_generated=order.file_generated,
+                expected_delivery_date=order.expected_delivery_date,
+                delivery_date=order.delivery_date,
+                created_date=order.created_date,
+                modified_date=order.modified_date,
+            )
+            for order in orders.iterator(chunk_size=500)
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('enterprise', '0004_project_export_format_choices'),
+        ('logistics', '0002_initial'),
+        ('orders', '0005_order_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderSummary',
+            fields=[
+                ('order', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='orders.order')),
+                ('lookup_code_order', models.CharField(max_length=50)),
+                ('reference_number', models.CharField(blank=True, max_length=50, null=True)),
+                ('status_name', models.CharField(max_length=50)),
+                ('type_name', models.CharField(max_length=50)),
+                ('contact_company', models.CharField(max_length=100)),
+                ('ship_to_city', models.CharField(max_length=50)),
+                ('ship_to_state', models.CharField(max_length=50)),
+                ('line_count', models.PositiveIntegerField(default=0)),
+                ('total_quantity', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('file_generated', models.BooleanField(default=False)),
+                ('expected_delivery_date', models.DateTimeField(blank=True, null=True)),
+                ('delivery_date', models.DateTimeField(blank=True, null=True)),
+                ('created_date', models.DateTimeField()),
+                ('modified_date', models.DateTimeField()),
+                ('contact', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='logistics.contact')),
+                ('order_class', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='orders.orderclass')),
+                ('order_status', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='orders.orderstatus')),
+                ('order_type', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='orders.ordertype')),
+                ('project', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='enterprise.project')),
+                ('shipping_address', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='logistics.address')),
+                ('warehouse', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='logistics.warehouse')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['project', '-created_date', '-order'], name='summary_project_created_idx'), models.Index(fields=['project', 'order_status', '-created_date'], name='summary_project_status_idx'), models.Index(fields=['project', 'order_type', '-created_date'], name='summary_project_type_idx'), models.Index(fields=['lookup_code_order'], name='summary_lookup_code_idx', opclasses=['varchar_pattern_ops'])],
+            },
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.6 on 2026-10-17 17:19
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0006_ordersummary'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='order',
+            name='order_project_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='order',
+            name='order_project_status_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='order',
+            name='order_project_type_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='order',
+            name='order_lookup_code_prefix_idx',
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.1.6 on 2026-10-17 17:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_order_fields(apps, schema_editor):
+    Order = apps.get_model('orders', 'Order')
+    OrderSummary = apps.get_model('orders', 'OrderSummary')
+    summaries = []
+    for order in Order.objects.order_by('id').iterator(chunk_size=500):
+        summaries.append(OrderSummary(
+            order_id=order.id,
+            billing_address_id=order.billing_address_id,
+            carrier_id=order.carrier_id,
+            service_type_id=order.service_type_id,
+            lookup_code_shipment=order.lookup_code_shipment,
+            notes=order.notes,
+        ))
+    OrderSummary.objects.bulk_update(
+        summaries,
+        ['billing_address', 'carrier', 'service_type', 'lookup_code_shipment', 'notes'],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logistics', '0002_initial'),
+        ('orders', '0007_remove_order_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ordersummary',
+            name='billing_address',
+            field=models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='logistics.address'),
+        ),
+        migrations.AddField(
+            model_name='ordersummary',
+            name='carrier',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='logistics.carrier'),
+        ),
+        migrations.AddField(
+            model_name='ordersummary',
+            name='service_type',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='logistics.carrierservice'),
+        ),
+        migrations.AddField(
+            model_name='ordersummary',
+            name='lookup_code_shipment',
+            field=models.CharField(default='', max_length=50),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='ordersummary',
+            name='notes',
+            field=models.TextField(blank=True),
+        ),
+        migrations.RunPython(backfill_order_fields, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='ordersummary',
+            name='billing_address',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='logistics.address'),
+        ),
+    ]
@@ -1,13 +1,18 @@
-import csv
+import threading
+from collections import deque
+from datetime import timedelta
+from django.conf import settings
 from django.db import models
-from common.models import TimeStampedModel, Status
+from decimal import Decimal
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Coalesce
+from common.models import ChangeTrackingMixin, TimeStampedModel
 from enterprise.models import Project
 from logistics.models import Warehouse, Contact, Address, Carrier, CarrierService
 from materials.models import Material
-from inventory.models import Inventory, InventorySerialNumber
+from inventory.models import InventorySerialNumber
 from django.db import transaction
 from django.utils import timezone
-from .utils import generate_order_csv
 
 class OrderStatus(TimeStampedModel):
     status_name = models.CharField(max_length=50)
@@ -54,14 +59,63 @@ class OrderCounter(TimeStampedModel):
 
     def get_next_number(self):
         """Returns the next number and updates the counter."""
+        return self.reserve_block(1).start
+
+    def reserve_block(self, size):
+        """Reserves `size` consecutive numbers with a single locked update and returns them as a range."""
+        if size < 1:
+            raise ValueError("Block size must be at least 1")
         with transaction.atomic():
-            # Blocks it to avoid concurrency conflicts
-            counter = OrderCounter.objects.select_for_update().get(id=self.id)
-            counter.last_number += 1
-            counter.save()
-            return counter.last_number
+            # The UPDATE takes the row lock, so concurrent callers never get overlapping blocks
+            OrderCounter.objects.filter(id=self.id).update(
+                last_number=F('last_number') + size,
+                modified_date=timezone.now()
+            )
+            self.last_number = OrderCounter.objects.values_list('last_number', flat=True).get(id=self.id)
+        return range(self.last_number - size + 1, self.last_number + 1)
+
+class OrderNumberAllocator:
+    """
+    Hands out order numbers per project from blocks reserved on OrderCounter.
+    With block_size=1 every number is reserved on demand and the sequence has no gaps.
+    Larger blocks are kept in memory by each worker process, so busy projects take the
+    counter row lock once per block; unused numbers are lost when the worker stops.
+    """
+    def __init__(self, block_size=1):
+        self.block_size = block_size
+        self._blocks = {}
+        self._lock = threading.Lock()
+
+    def next_number(self, project):
+        with self._lock:
+            pending = self._blocks.get(project.pk)
+            if pending:
+                number = pending.popleft()
+                if not pending:
+                    del self._blocks[project.pk]
+                return number
+
+        counter, _ = OrderCounter.objects.get_or_create(project=project)
+        block = counter.reserve_block(self.block_size)
+        if len(block) > 1:
+            # Only keep the rest of the block once the reservation is committed,
+            # otherwise a rollback would hand out numbers the counter no longer covers
+            transaction.on_commit(lambda: self._release(project.pk, block[1:]))
+        return block.start
+
+    def _release(self, project_id, numbers):
+        with self._lock:
+            self._blocks.setdefault(project_id, deque()).extend(numbers)
+
+    def clear(self):
+        with self._lock:
+            self._blocks.clear()
+
+order_number_allocator = OrderNumberAllocator(getattr(settings, 'ORDER_NUMBER_BLOCK_SIZE', 1))
+
+class Order(ChangeTrackingMixin, TimeStampedModel):
+    tracked_fields = ('order_status',)
 
-class Order(TimeStampedModel):
     lookup_code_order = models.CharField(
         max_length=50,
         unique=True,
@@ -103,27 +157,34 @@ class Order(TimeStampedModel):
 
     def generate_order_code(self):
         """Genera el código de orden y envío basado en el prefijo del proyecto y el contador."""
-        counter, _ = OrderCounter.objects.get_or_create(project=self.project)
-        next_number = counter.get_next_number()
+        next_number = order_number_allocator.next_number(self.project)
         code = f"{self.project.orders_prefix}-{str(next_number).zfill(6)}"
         return code
     
-    def generate_csv_file(self):
-        """Genera un archivo CSV para la orden usando la función en utils."""
-        generate_order_csv(self)
+    def enqueue_export(self):
+        """Queues the order file; the export worker writes and ships it outside the request."""
+        return OrderExportJob.objects.create(order=self, created_by=self.modified_by, modified_by=self.modified_by)
+
+    def _saves_field(self, update_fields, field_name):
+        if update_fields is None:
+            return True
+        field = self._meta.get_field(field_name)
+        return field.name in update_fields or field.attname in update_fields
 
     def save(self, *args, **kwargs):
-        """Sobrescribe el método save para detectar cambios de estado y generar el CSV."""
-        # Si el objeto ya existe en la base de datos, verificamos el cambio de estado
-        if self.pk:
-            old_instance = Order.objects.get(pk=self.pk)
-            old_status_id = old_instance.order_status_id
-            new_status_id = self.order_status_id
-
-            # Si cambia de "Created" (id=1) a "Submitted" (id=2)
-            if old_status_id == 1 and new_status_id == 2:
-                self.generate_csv_file()
-        
+        """Sobrescribe el método save para detectar cambios de estado y encolar el archivo."""
+        update_fields = kwargs.get('update_fields')
+
+        # The loaded status is tracked on the instance, so no extra SELECT is needed
+        # Si cambia de "Created" (id=1) a "Submitted" (id=2)
+        submitted = (
+            not self._state.adding
+            and self._saves_field(update_fields, 'order_status')
+            and self.has_changed('order_status')
+            and self.get_loaded_value('order_status') == 1
+            and self.order_status_id == 2
+        )
+
         """Genera automáticamente lookup_code_order y lookup_code_shipment si no están definidos."""
         if not self.lookup_code_order or not self.lookup_code_shipment:
             generated_code = self.generate_order_code()
@@ -131,7 +192,13 @@ class Order(TimeStampedModel):
                 self.lookup_code_order = generated_code
             if not self.lookup_code_shipment:
                 self.lookup_code_shipment = generated_code
-        super().save(*args, **kwargs)
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if submitted:
+                self.enqueue_export()
+            if OrderSummary.reads_fields(self, update_fields):
+                OrderSummary.refresh_on_commit([self.pk])
 
     def __str__(self):
         return f"{self.order_type} - {self.lookup_code_order}"
@@ -155,5 +222,221 @@ class OrderLine(TimeStampedModel):
     )
     notes = models.TextField(blank=True)
 
+    # Line fields behind OrderSummary.line_count and total_quantity
+    SUMMARY_FIELDS = frozenset({'order', 'quantity'})
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        if OrderSummary.reads_fields(self, kwargs.get('update_fields'), self.SUMMARY_FIELDS):
+            OrderSummary.refresh_on_commit([self.order_id])
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        OrderSummary.refresh_on_commit([self.order_id])
+        return result
+
     def __str__(self):
         return f"Order {self.order.lookup_code_order} - {self.material.name} ({self.quantity})"
+
+
+def _summary_reference(model, **options):
+    # Plain id columns that mirror Order's relations without extra constraints
+    return models.ForeignKey(model, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+', **options)
+
+class OrderSummary(models.Model):
+    """
+    Denormalized read model for order lists: one row per order with the related names,
+    line count and total quantity already resolved. Order/OrderLine saves queue their
+    order ids and the rows are refreshed together when the transaction commits; bulk
+    paths call refresh() directly. rebuild_order_summaries recomputes it from scratch.
+    """
+    order = models.OneToOneField(Order, on_delete=models.CASCADE, primary_key=True, related_name='summary')
+    project = _summary_reference(Project)
+    warehouse = _summary_reference(Warehouse)
+    order_status = _summary_reference(OrderStatus)
+    order_type = _summary_reference(OrderType)
+    order_class = _summary_reference(OrderClass)
+    contact = _summary_reference(Contact)
+    shipping_address = _summary_reference(Address)
+    billing_address = _summary_reference(Address)
+    carrier = _summary_reference(Carrier, null=True, blank=True)
+    service_type = _summary_reference(CarrierService, null=True, blank=True)
+    lookup_code_order = models.CharField(max_length=50)
+    lookup_code_shipment = models.CharField(max_length=50)
+    reference_number = models.CharField(max_length=50, null=True, blank=True)
+    status_name = models.CharField(max_length=50)
+    type_name = models.CharField(max_length=50)
+    contact_company = models.CharField(max_length=100)
+    ship_to_city = models.CharField(max_length=50)
+    ship_to_state = models.CharField(max_length=50)
+    line_count = models.PositiveIntegerField(default=0)
+    total_quantity = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    file_generated = models.BooleanField(default=False)
+    notes = models.TextField(blank=True)
+    expected_delivery_date = models.DateTimeField(null=True, blank=True)
+    delivery_date = models.DateTimeField(null=True, blank=True)
+    created_date = models.DateTimeField()
+    modified_date = models.DateTimeField()
+
+    REFRESH_BATCH_SIZE = 500
+
+    # Order fields copied into the row; saving only other fields leaves it as it is
+    ORDER_FIELDS = frozenset({
+        'project', 'warehouse', 'order_status', 'order_type', 'order_class', 'contact',
+        'shipping_address', 'billing_address', 'carrier', 'service_type', 'lookup_code_order',
+        'lookup_code_shipment', 'reference_number', 'file_generated', 'notes',
+        'expected_delivery_date', 'delivery_date', 'created_date', 'modified_date',
+    })
+
+    class Meta:
+        # Dashboard pages: one project, optional status/type filter, newest first
+        indexes = [
+            models.Index(fields=['project', '-created_date', '-order'], name='summary_project_created_idx'),
+            models.Index(fields=['project', 'order_status', '-created_date'], name='summary_project_status_idx'),
+            models.Index(fields=['project', 'order_type', '-created_date'], name='summary_project_type_idx'),
+            models.Index(
+                fields=['lookup_code_order'],
+                name='summary_lookup_code_idx',
+                opclasses=['varchar_pattern_ops']
+            ),
+        ]
+
+    @classmethod
+    def reads_fields(cls, instance, update_fields, fields=ORDER_FIELDS):
+        """Whether a save with `update_fields` (None = all fields) writes any of `fields`."""
+        if update_fields is None:
+            return True
+        return any(instance._meta.get_field(name).name in fields for name in update_fields)
+
+    @classmethod
+    def refresh_on_commit(cls, order_ids):
+        """
+        Refreshes the orders once the current transaction commits, together with every
+        other order queued in it, so N line writes cost one refresh. Outside a
+        transaction the refresh runs right away.
+        """
+        connection = transaction.get_connection()
+        if not connection.in_atomic_block:
+            cls.refresh(order_ids)
+            return
+        batch = getattr(connection, 'order_summary_batch', None)
+        # A rolled back transaction drops the callback but not the attribute
+        if batch is None or batch.done or not any(func == batch.run for _, func, _ in connection.run_on_commit):
+            batch = connection.order_summary_batch = _SummaryBatch(cls)
+            transaction.on_commit(batch.run)
+        batch.order_ids.update(order_ids)
+
+    @classmethod
+    def refresh(cls, order_ids):
+        """Recomputes the summary rows of the given orders with one query and one upsert per batch."""
+        order_ids = list(order_ids)
+        for start in range(0, len(order_ids), cls.REFRESH_BATCH_SIZE):
+            batch = order_ids[start:start + cls.REFRESH_BATCH_SIZE]
+            orders = (
+                Order.objects.filter(id__in=batch)
+                .select_related('order_status', 'order_type', 'contact', 'shipping_address')
+                .annotate(
+                    line_count=Count('lines'),
+                    total_quantity=Coalesce(Sum('lines__quantity'), Decimal('0'))
+                )
+            )
+            summaries = [cls.from_order(order) for order in orders]
+            cls.objects.bulk_create(
+                summaries,
+                update_conflicts=True,
+                unique_fields=['order'],
+                update_fields=[field.name for field in cls._meta.concrete_fields if not field.primary_key],
+            )
+
+    @classmethod
+    def from_order(cls, order):
+        """Builds the row from an order annotated with line_count and total_quantity."""
+        return cls(
+            order_id=order.id,
+            project_id=order.project_id,
+            warehouse_id=order.warehouse_id,
+            order_status_id=order.order_status_id,
+            order_type_id=order.order_type_id,
+            order_class_id=order.order_class_id,
+            contact_id=order.contact_id,
+            shipping_address_id=order.shipping_address_id,
+            billing_address_id=order.billing_address_id,
+            carrier_id=order.carrier_id,
+            service_type_id=order.service_type_id,
+            lookup_code_order=order.lookup_code_order,
+            lookup_code_shipment=order.lookup_code_shipment,
+            reference_number=order.reference_number,
+            status_name=order.order_status.status_name,
+            type_name=order.order_type.type_name,
+            contact_company=order.contact.company_name,
+            ship_to_city=order.shipping_address.city,
+            ship_to_state=order.shipping_address.state,
+            line_count=order.line_count,
+            total_quantity=order.total_quantity,
+            file_generated=order.file_generated,
+            notes=order.notes,
+            expected_delivery_date=order.expected_delivery_date,
+            delivery_date=order.delivery_date,
+            created_date=order.created_date,
+            modified_date=order.modified_date,
+        )
+
+    def __str__(self):
+        return f"Summary {self.lookup_code_order}"
+
+class _SummaryBatch:
+    """Order ids waiting for OrderSummary.refresh at commit time."""
+
+    def __init__(self, summary_model):
+        self.summary_model = summary_model
+        self.order_ids = set()
+        self.done = False
+
+    def run(self):
+        self.done = True
+        self.summary_model.refresh(sorted(self.order_ids))
+
+class OrderExportJob(TimeStampedModel):
+    """
+    Durable queue entry for an order file. The export worker writes the file to the
+    local spool directory and then ships it to the import share with retries.
+    """
+    PENDING = 'pending'
+    SPOOLED = 'spooled'
+    SHIPPED = 'shipped'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (SPOOLED, 'Spooled'),
+        (SHIPPED, 'Shipped'),
+        (FAILED, 'Failed'),
+    ]
+
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='export_jobs')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    spool_path = models.CharField(max_length=255, blank=True)
+    shipped_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='order_export_job_due_idx'),
+        ]
+
+    def record_failure(self, error):
+        """Schedules the next attempt with exponential backoff, or gives up after the max attempts."""
+        self.attempts += 1
+        self.last_error = f"{type(error).__name__}: {error}"
+        if self.attempts >= settings.ORDER_EXPORT_MAX_ATTEMPTS:
+            self.status = self.FAILED
+        else:
+            delay = min(
+                settings.ORDER_EXPORT_RETRY_BASE_SECONDS * 2 ** (self.attempts - 1),
+                settings.ORDER_EXPORT_RETRY_MAX_SECONDS
+            )
+            self.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+
+    def __str__(self):
+        return f"Export {self.order.lookup_code_order} ({self.status})"
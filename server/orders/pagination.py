@@ -0,0 +1,19 @@
+from rest_framework.pagination import CursorPagination
+
+
+class OrderCursorPagination(CursorPagination):
+    """
+    Keyset pagination over (created_date, pk), newest first. Pagination is only applied
+    when the client asks for it with `cursor` or `page_size`, so existing callers that
+    expect a plain list keep working.
+    """
+    ordering = ('-created_date', '-pk')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
@@ -1,5 +1,17 @@
+from collections import Counter
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
-from .models import OrderStatus, OrderClass, OrderType, Order, OrderLine
+from materials.models import Material
+from logistics.serializers import (
+    AddressSerializer,
+    ContactSerializer,
+    WarehouseSerializer,
+    CarrierSerializer,
+    CarrierServiceSerializer
+)
+from inventory.models import InventorySerialNumber
+from .models import OrderStatus, OrderClass, OrderType, Order, OrderLine, OrderSummary
 
 class OrderStatusSerializer(serializers.ModelSerializer):
     class Meta:
@@ -16,15 +28,142 @@ class OrderClassSerializer(serializers.ModelSerializer):
         model = OrderClass
         fields = '__all__'
 
+class OrderLineSerializer(serializers.ModelSerializer):
+    lot = serializers.CharField(allow_null=True, allow_blank=True, required=False)
+    class Meta:
+        model = OrderLine
+        fields = '__all__'
+
+class OrderLineDetailSerializer(OrderLineSerializer):
+    """Order line with the material code, name and UOM nested, for expanded order reads."""
+    material_code = serializers.CharField(source='material.lookup_code', read_only=True)
+    material_name = serializers.CharField(source='material.name', read_only=True)
+    uom = serializers.CharField(source='material.uom.lookup_code', read_only=True)
+
 class OrderSerializer(serializers.ModelSerializer):
     order_status_name = serializers.CharField(source='order_status.status_name', read_only=True)
+
+    # ?expand= name -> serializer that replaces the plain id
+    EXPANDABLE = {
+        'lines': lambda: OrderLineDetailSerializer(many=True, read_only=True),
+        'contact': lambda: ContactSerializer(read_only=True),
+        'shipping_address': lambda: AddressSerializer(read_only=True),
+        'billing_address': lambda: AddressSerializer(read_only=True),
+        'carrier': lambda: CarrierSerializer(read_only=True),
+        'service_type': lambda: CarrierServiceSerializer(read_only=True),
+        'warehouse': lambda: WarehouseSerializer(read_only=True),
+    }
+
     class Meta:
         model = Order
         fields = '__all__'
         read_only_fields = ['lookup_code_order', 'lookup_code_shipment']
 
-class OrderLineSerializer(serializers.ModelSerializer):
-    lot = serializers.CharField(allow_null=True, allow_blank=True, required=False)
+    def __init__(self, *args, expand=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        for name in expand:
+            self.fields[name] = self.EXPANDABLE[name]()
+
+class OrderLineItemSerializer(serializers.Serializer):
+    """A single line inside a bulk replace payload. Foreign keys are plain ids,
+    they are checked in batch by OrderLineReplaceSerializer."""
+    id = serializers.IntegerField(required=False, allow_null=True)
+    material = serializers.IntegerField()
+    quantity = serializers.DecimalField(max_digits=10, decimal_places=2)
+    lot = serializers.CharField(max_length=50, allow_null=True, allow_blank=True, required=False, default=None)
+    vendor_lot = serializers.CharField(max_length=50, allow_blank=True, required=False, default='')
+    license_plate = serializers.CharField(max_length=50, allow_null=True, allow_blank=True, required=False, default=None)
+    serial_number = serializers.IntegerField(allow_null=True, required=False, default=None)
+    notes = serializers.CharField(allow_blank=True, required=False, default='')
+
+class OrderLineReplaceSerializer(serializers.Serializer):
+    """Validates the full set of lines for an order with a fixed number of queries."""
+    lines = OrderLineItemSerializer(many=True, allow_empty=True)
+
+    def validate_lines(self, lines):
+        order = self.context['order']
+        material_ids = {line['material'] for line in lines}
+        serial_ids = {line['serial_number'] for line in lines if line['serial_number'] is not None}
+        id_counts = Counter(line['id'] for line in lines if line.get('id') is not None)
+        line_ids = set(id_counts)
+        duplicate_ids = {line_id for line_id, count in id_counts.items() if count > 1}
+
+        known_materials = set(Material.objects.filter(id__in=material_ids).values_list('id', flat=True))
+        known_serials = set(InventorySerialNumber.objects.filter(id__in=serial_ids).values_list('id', flat=True))
+        known_lines = set(OrderLine.objects.filter(order=order, id__in=line_ids).values_list('id', flat=True))
+
+        errors = []
+        for line in lines:
+            line_errors = {}
+            if line['material'] not in known_materials:
+                line_errors['material'] = [f"Invalid pk \"{line['material']}\" - object does not exist."]
+            if line['serial_number'] is not None and line['serial_number'] not in known_serials:
+                line_errors['serial_number'] = [f"Invalid pk \"{line['serial_number']}\" - object does not exist."]
+            if line.get('id') is not None:
+                if line['id'] in duplicate_ids:
+                    line_errors['id'] = [f"Order line {line['id']} appears more than once."]
+                elif line['id'] not in known_lines:
+                    line_errors['id'] = [f"Order line {line['id']} does not belong to this order."]
+            errors.append(line_errors)
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return lines
+
+    def save(self, user=None):
+        """Replaces the order lines in one transaction using bulk operations."""
+        order = self.context['order']
+        lines = self.validated_data['lines']
+        fields = ['material_id', 'quantity', 'lot', 'vendor_lot', 'license_plate', 'serial_number_id', 'notes']
+
+        to_create, to_update = [], []
+        for line in lines:
+            values = {
+                'material_id': line['material'],
+                'quantity': line['quantity'],
+                'lot': line['lot'],
+                'vendor_lot': line['vendor_lot'],
+                'license_plate': line['license_plate'],
+                'serial_number_id': line['serial_number'],
+                'notes': line['notes'],
+                'modified_by': user,
+            }
+            if line.get('id') is not None:
+                to_update.append(OrderLine(id=line['id'], order=order, **values))
+            else:
+                to_create.append(OrderLine(order=order, created_by=user, **values))
+
+        with transaction.atomic():
+            kept_ids = [line.id for line in to_update]
+            deleted, _ = OrderLine.objects.filter(order=order).exclude(id__in=kept_ids).delete()
+            if to_update:
+                # bulk_update bypasses auto_now, so stamp modified_date explicitly
+                now = timezone.now()
+                for line in to_update:
+                    line.modified_date = now
+                OrderLine.objects.bulk_update(to_update, fields + ['modified_by', 'modified_date'])
+            OrderLine.objects.bulk_create(to_create)
+            OrderSummary.refresh([order.pk])
+
+        return {
+            'inserted': len(to_create),
+            'updated': len(to_update),
+            'deleted': deleted,
+        }
+
+class OrderSummarySerializer(serializers.ModelSerializer):
+    """Flat order row for list views, read from the OrderSummary table without joins."""
+    id = serializers.IntegerField(source='order_id', read_only=True)
+    order_status_name = serializers.CharField(source='status_name', read_only=True)
+    order_type_name = serializers.CharField(source='type_name', read_only=True)
+    contact_name = serializers.CharField(source='contact_company', read_only=True)
+
     class Meta:
-        model = OrderLine
-        fields = '__all__'
+        model = OrderSummary
+        fields = [
+            'id', 'lookup_code_order', 'lookup_code_shipment', 'reference_number', 'project', 'warehouse',
+            'order_status', 'order_status_name', 'order_type', 'order_type_name', 'order_class',
+            'contact', 'contact_name', 'shipping_address', 'billing_address', 'ship_to_city', 'ship_to_state',
+            'carrier', 'service_type', 'line_count', 'total_quantity', 'expected_delivery_date', 'delivery_date',
+            'file_generated', 'notes', 'created_date', 'modified_date',
+        ]
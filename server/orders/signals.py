@@ -0,0 +1,22 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from logistics.models import Address, Contact
+from .models import Order, OrderStatus, OrderSummary, OrderType
+
+# Names copied into OrderSummary: related model -> Order field pointing at it
+SUMMARY_SOURCES = {
+    OrderStatus: 'order_status',
+    OrderType: 'order_type',
+    Contact: 'contact',
+    Address: 'shipping_address',
+}
+
+
+@receiver(post_save)
+def refresh_summaries_for_related(sender, instance, created, raw=False, **kwargs):
+    """Keeps the names stored in OrderSummary in step with renames of related records."""
+    field = SUMMARY_SOURCES.get(sender)
+    if field is None or created or raw:
+        return
+    order_ids = Order.objects.filter(**{field: instance}).values_list('id', flat=True)
+    OrderSummary.refresh(order_ids)
@@ -0,0 +1,30 @@
+import pytest
+from enterprise.models import Client, Enterprise, Project
+from logistics.models import Address, Contact, Warehouse
+from orders.models import Order, OrderClass, OrderStatus, OrderType
+
+
+@pytest.fixture
+def order(db, django_capture_on_commit_callbacks):
+    enterprise = Enterprise.objects.create(name='Enterprise', lookup_code='ENT')
+    client = Client.objects.create(name='Client', lookup_code='CLI', enterprise=enterprise)
+    project = Project.objects.create(
+        name='Project', lookup_code='PRJ', orders_prefix='PR', client=client, export_format='TAB'
+    )
+    address = Address.objects.create(
+        address_line_1='1 Main St', city='Austin', state='TX', postal_code='78701',
+        country='US', entity_type='recipient'
+    )
+    order_type = OrderType.objects.create(type_name='Outbound', lookup_code='OUT')
+    # Tests run inside a transaction: run the summary refresh queued for commit
+    with django_capture_on_commit_callbacks(execute=True):
+        return Order.objects.create(
+            order_type=order_type,
+            order_class=OrderClass.objects.create(order_type=order_type, class_name='Sales', lookup_code='SO'),
+            order_status=OrderStatus.objects.create(status_name='Submitted', lookup_code='SUB'),
+            project=project,
+            warehouse=Warehouse.objects.create(name='Main', lookup_code='WH1', address=address),
+            contact=Contact.objects.create(company_name='Acme', contact_name='Jane', phone='555'),
+            shipping_address=address,
+            billing_address=address,
+        )
@@ -0,0 +1,114 @@
+import os
+from datetime import timedelta
+import pytest
+from django.utils import timezone
+from orders.export import ship_spooled, spool_pending
+from orders.models import Order, OrderExportJob
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    spool_dir, share_dir = tmp_path / 'spool', tmp_path / 'share'
+    share_dir.mkdir()
+    return spool_dir, share_dir
+
+
+def make_due(job):
+    OrderExportJob.objects.filter(pk=job.pk).update(next_attempt_at=timezone.now())
+
+
+def test_spool_then_ship(order, dirs, django_capture_on_commit_callbacks):
+    spool_dir, share_dir = dirs
+    job = order.enqueue_export()
+
+    assert spool_pending(spool_dir=spool_dir) == 1
+    job.refresh_from_db()
+    assert job.status == OrderExportJob.SPOOLED
+    assert os.path.exists(job.spool_path)
+    assert Order.objects.get(pk=order.pk).file_generated
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert ship_spooled(target_dir=share_dir) == 1
+    job.refresh_from_db()
+    assert job.status == OrderExportJob.SHIPPED
+    assert (share_dir / os.path.basename(job.spool_path)).read_text().startswith('OrderDate\t')
+    assert not os.path.exists(job.spool_path)
+
+
+def test_claimed_jobs_are_skipped_until_the_lease_ends(order, dirs):
+    spool_dir, _ = dirs
+    job = order.enqueue_export()
+    OrderExportJob.objects.filter(pk=job.pk).update(next_attempt_at=timezone.now() + timedelta(minutes=5))
+
+    assert spool_pending(spool_dir=spool_dir) == 0
+    assert OrderExportJob.objects.get(pk=job.pk).status == OrderExportJob.PENDING
+
+
+def test_share_failure_backs_off_and_retries(order, dirs, django_capture_on_commit_callbacks):
+    spool_dir, share_dir = dirs
+    job = order.enqueue_export()
+    spool_pending(spool_dir=spool_dir)
+
+    # A regular file where the share directory should be makes every copy fail
+    unavailable = share_dir / 'offline'
+    unavailable.write_text('')
+    assert ship_spooled(target_dir=unavailable / 'import') == 0
+    job.refresh_from_db()
+    assert job.status == OrderExportJob.SPOOLED
+    assert job.attempts == 1
+    assert job.last_error
+    assert job.next_attempt_at > timezone.now()
+    assert os.path.exists(job.spool_path)
+
+    # Not due yet: nothing is attempted
+    assert ship_spooled(target_dir=share_dir) == 0
+
+    make_due(job)
+    with django_capture_on_commit_callbacks(execute=True):
+        assert ship_spooled(target_dir=share_dir) == 1
+    job.refresh_from_db()
+    assert job.status == OrderExportJob.SHIPPED
+    assert job.last_error == ''
+
+
+def test_share_failure_gives_up_after_max_attempts(order, dirs, settings):
+    settings.ORDER_EXPORT_MAX_ATTEMPTS = 2
+    spool_dir, share_dir = dirs
+    job = order.enqueue_export()
+    spool_pending(spool_dir=spool_dir)
+    unavailable = share_dir / 'offline'
+    unavailable.write_text('')
+
+    for _ in range(2):
+        make_due(job)
+        ship_spooled(target_dir=unavailable / 'import')
+    job.refresh_from_db()
+    assert job.status == OrderExportJob.FAILED
+    assert job.attempts == 2
+
+
+def test_missing_spool_file_of_a_shipped_file_counts_as_shipped(order, dirs):
+    spool_dir, share_dir = dirs
+    job = order.enqueue_export()
+    spool_pending(spool_dir=spool_dir)
+    job.refresh_from_db()
+    # The worker copied the file and stopped before saving SHIPPED
+    os.replace(job.spool_path, share_dir / os.path.basename(job.spool_path))
+
+    assert ship_spooled(target_dir=share_dir) == 1
+    assert OrderExportJob.objects.get(pk=job.pk).status == OrderExportJob.SHIPPED
+
+
+def test_missing_spool_file_is_spooled_again(order, dirs):
+    spool_dir, share_dir = dirs
+    job = order.enqueue_export()
+    spool_pending(spool_dir=spool_dir)
+    job.refresh_from_db()
+    os.remove(job.spool_path)
+
+    assert ship_spooled(target_dir=share_dir) == 0
+    assert OrderExportJob.objects.get(pk=job.pk).status == OrderExportJob.PENDING
+    assert spool_pending(spool_dir=spool_dir) == 1
+    assert os.path.exists(OrderExportJob.objects.get(pk=job.pk).spool_path)
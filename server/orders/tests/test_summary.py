@@ -0,0 +1,58 @@
+import pytest
+from django.db import transaction
+from common.models import Status
+from materials.models import Material, MaterialType, UOM
+from orders.models import OrderLine, OrderSummary
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def material(order):
+    return Material.objects.create(
+        name='Widget', lookup_code='W1', project=order.project,
+        status=Status.objects.create(name='Active', code='ACT'),
+        type=MaterialType.objects.create(name='Finished', lookup_code='FG'),
+        uom=UOM.objects.create(name='Each', lookup_code='EA'),
+    )
+
+
+def test_save_without_summary_fields_skips_refresh(order, django_assert_num_queries):
+    summary = OrderSummary.objects.get(pk=order.pk)
+    order.delivery_date = None
+    order.file_generated_at = None
+    with django_assert_num_queries(3):  # savepoint, update, release
+        order.save(update_fields=['file_generated_at'])
+    assert OrderSummary.objects.get(pk=order.pk).modified_date == summary.modified_date
+
+
+def test_save_with_summary_field_refreshes(order, django_capture_on_commit_callbacks):
+    order.notes = 'Leave at the dock'
+    with django_capture_on_commit_callbacks(execute=True):
+        order.save(update_fields=['notes'])
+    assert OrderSummary.objects.get(pk=order.pk).notes == 'Leave at the dock'
+
+
+def test_line_writes_refresh_once_at_commit(order, material, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        with transaction.atomic():
+            for quantity in (1, 2, 3):
+                OrderLine.objects.create(order=order, material=material, quantity=quantity)
+            assert OrderSummary.objects.get(pk=order.pk).line_count == 0
+    assert len(callbacks) == 1
+    summary = OrderSummary.objects.get(pk=order.pk)
+    assert (summary.line_count, summary.total_quantity) == (3, 6)
+
+
+def test_rolled_back_batch_does_not_swallow_later_refreshes(order, material, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    OrderLine.objects.create(order=order, material=material, quantity=5)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            OrderLine.objects.create(order=order, material=material, quantity=2)
+    summary = OrderSummary.objects.get(pk=order.pk)
+    assert (summary.line_count, summary.total_quantity) == (1, 2)
@@ -1,100 +1,90 @@
-import csv
-from django.utils import timezone
-
-def generate_order_csv(order):
-    """Genera un archivo TAB para la orden en la ruta de red con las columnas especificadas."""
-    file_path = f"\\\\wd02\\Datex\\Import\\CRM_Orders_Import\\test\\order_{order.lookup_code_order}.tab"
-    with open(file_path, 'w', newline='') as tabfile:
-        writer = csv.writer(tabfile, delimiter='\t')
-        # Definimos las columnas en el orden exacto
-        columns = [
-            'OrderDate', 'Owner', 'Project', 'OrderNumber', 'Status', 'ReferenceNumber', 'Notes',
-            'Material', 'Lot', 'Quantity', 'UOM', 'AccountID', 'AccountName', 'ContactLookup',
-            'Title', 'FirstName', 'MiddleName', 'LastName', 'Addr1', 'Addr2', 'City', 'State',
-            'Zip', 'Territory', 'CountryName', 'Phone', 'Carrier', 'ServiceType', 'StateLic',
-            'StateofLicensure', 'StateLicExp', 'DEANumber', 'DEAExp', 'ME', 'Email', 'Fax',
-            'OrderFullfillmentDate'
-        ]
-        writer.writerow(columns)
-
-        # Obtenemos las líneas de la orden
-        order_lines = order.lines.all()
-
-        # Si no hay líneas, escribimos una fila con datos de la orden y campos vacíos
-        if not order_lines:
-            writer.writerow([
-                order.modified_date.strftime('%m/%d/%Y') if order.modified_date else '',  # OrderDate
-                order.project.client.lookup_code if order.project.client else '',          # Owner
-                order.project.lookup_code,                                                 # Project
-                order.lookup_code_order,                                                   # OrderNumber
-                '',                                                                        # Status
-                order.reference_number or '',                                              # ReferenceNumber
-                order.notes or '',                                                         # Notes
-                '',                                                                        # Material
-                '',                                                                        # Lot
-                '',                                                                        # Quantity
-                '',                                                                        # UOM
-                order.contact.id if order.contact else '',                                 # AccountID
-                order.contact.company_name if order.contact and hasattr(order.contact, 'company_name') else '',  # AccountName
-                order.contact.id if order.contact else '',                                 # ContactLookup
-                '',                                                                        # Title
-                order.contact.company_name if order.contact and hasattr(order.contact, 'company_name') else '',  # FirstName
-                '',                                                                        # MiddleName
-                '',                                                                        # LastName
-                order.shipping_address.address_line_1 if order.shipping_address else '',   # Addr1
-                order.shipping_address.address_line_2 if order.shipping_address else '',   # Addr2
-                order.shipping_address.city if order.shipping_address else '',             # City
-                order.shipping_address.state if order.shipping_address else '',            # State
-                order.shipping_address.postal_code if order.shipping_address else '',      # Zip
-                '',                                                                        # Territory
-                order.shipping_address.country if order.shipping_address else '',          # CountryName
-                order.contact.phone if order.contact and hasattr(order.contact, 'phone') else '',  # Phone
-                order.carrier.name if order.carrier and hasattr(order.carrier, 'name') else '',    # Carrier
-                order.service_type.service_name if order.service_type and hasattr(order.service_type, 'service_name') else '',  # ServiceType
-                '', '', '', '', '', '', '', '', ''                                         # Campos en blanco
-            ])
-        else:
-            # Escribimos una fila por cada OrderLine
-            for line in order_lines:
-                # Obtener el lookup_code del UOM desde la línea o el material si no está en la línea
-                uom_lookup_code = ''
-                if hasattr(line, 'uom') and line.uom:
-                    uom_lookup_code = line.uom.lookup_code  # Usar lookup_code en lugar de name
-                elif line.material and line.material.uom:
-                    uom_lookup_code = line.material.uom.lookup_code  # Usar lookup_code en lugar de name
-
-                writer.writerow([
-                    order.modified_date.strftime('%m/%d/%Y') if order.modified_date else '',  # OrderDate
-                    order.project.client.lookup_code if order.project.client else '',          # Owner
-                    order.project.lookup_code,                                                 # Project
-                    order.lookup_code_order,                                                   # OrderNumber
-                    '',                                                                        # Status
-                    order.reference_number or '',                                              # ReferenceNumber
-                    order.notes or '',                                                         # Notes
-                    line.material.lookup_code if hasattr(line.material, 'lookup_code') else line.material.name,  # Material
-                    '',                                                                        # Lot
-                    str(line.quantity),                                                        # Quantity
-                    uom_lookup_code,                                                           # UOM
-                    order.contact.id if order.contact else '',                                 # AccountID
-                    order.contact.company_name if order.contact and hasattr(order.contact, 'company_name') else '',  # AccountName
-                    order.contact.id if order.contact else '',                                 # ContactLookup
-                    '',                                                                        # Title
-                    order.contact.company_name if order.contact and hasattr(order.contact, 'company_name') else '',  # FirstName
-                    '',                                                                        # MiddleName
-                    '',                                                                        # LastName
-                    order.shipping_address.address_line_1 if order.shipping_address else '',   # Addr1
-                    order.shipping_address.address_line_2 if order.shipping_address else '',   # Addr2
-                    order.shipping_address.city if order.shipping_address else '',             # City
-                    order.shipping_address.state if order.shipping_address else '',            # State
-                    order.shipping_address.postal_code if order.shipping_address else '',      # Zip
-                    '',                                                                        # Territory
-                    order.shipping_address.country if order.shipping_address else '',          # CountryName
-                    order.contact.phone if order.contact and hasattr(order.contact, 'phone') else '',  # Phone
-                    order.carrier.name if order.carrier and hasattr(order.carrier, 'name') else '',    # Carrier
-                    order.service_type.service_name if order.service_type and hasattr(order.service_type, 'service_name') else '',  # ServiceType
-                    '', '', '', '', '', '', '', '', ''                                         # Campos en blanco
-                ])
-
-    # Actualizamos los campos file_generated y file_generated_at en el objeto order
-    order.file_generated = True
-    order.file_generated_at = timezone.now()
\ No newline at end of file
+from django.db.models import Prefetch, prefetch_related_objects
+from .writers import get_writer
+
+# Columnas del archivo de exportación en el orden exacto (compartidas por todos los formatos)
+ORDER_EXPORT_COLUMNS = [
+    'OrderDate', 'Owner', 'Project', 'OrderNumber', 'Status', 'ReferenceNumber', 'Notes',
+    'Material', 'Lot', 'Quantity', 'UOM', 'AccountID', 'AccountName', 'ContactLookup',
+    'Title', 'FirstName', 'MiddleName', 'LastName', 'Addr1', 'Addr2', 'City', 'State',
+    'Zip', 'Territory', 'CountryName', 'Phone', 'Carrier', 'ServiceType', 'StateLic',
+    'StateofLicensure', 'StateLicExp', 'DEANumber', 'DEAExp', 'ME', 'Email', 'Fax',
+    'OrderFullfillmentDate'
+]
+
+# Relations read by the exporter, loaded once per order instead of per row
+EXPORT_RELATED = ('project__client', 'contact', 'shipping_address', 'carrier')
+
+_MATERIAL = ORDER_EXPORT_COLUMNS.index('Material')
+_QUANTITY = ORDER_EXPORT_COLUMNS.index('Quantity')
+_UOM = ORDER_EXPORT_COLUMNS.index('UOM')
+
+
+def _lines_prefetch():
+    from .models import OrderLine
+    return Prefetch('lines', queryset=OrderLine.objects.select_related('material__uom').order_by('id'))
+
+
+def export_queryset(queryset):
+    """Applies the export loading plan: a constant number of queries whatever the line count."""
+    return queryset.select_related(*EXPORT_RELATED).prefetch_related(_lines_prefetch())
+
+
+def prefetch_for_export(orders):
+    """Loads the export relations onto already fetched orders (keeps unsaved field values)."""
+    prefetch_related_objects(list(orders), *EXPORT_RELATED, _lines_prefetch())
+
+
+def order_columns(order):
+    """Builds the order-level part of a row once; line columns are left blank."""
+    project = order.project
+    contact = order.contact
+    address = order.shipping_address
+    values = {
+        'OrderDate': order.modified_date.strftime('%m/%d/%Y') if order.modified_date else '',
+        'Owner': project.client.lookup_code if project.client else '',
+        'Project': project.lookup_code,
+        'OrderNumber': order.lookup_code_order,
+        'ReferenceNumber': order.reference_number or '',
+        'Notes': order.notes or '',
+        'AccountID': contact.id if contact else '',
+        'AccountName': getattr(contact, 'company_name', '') if contact else '',
+        'ContactLookup': contact.id if contact else '',
+        'FirstName': getattr(contact, 'company_name', '') if contact else '',
+        'Addr1': address.address_line_1 if address else '',
+        'Addr2': address.address_line_2 if address else '',
+        'City': address.city if address else '',
+        'State': address.state if address else '',
+        'Zip': address.postal_code if address else '',
+        'CountryName': address.country if address else '',
+        'Phone': getattr(contact, 'phone', '') if contact else '',
+        'Carrier': getattr(order.carrier, 'name', '') if order.carrier else '',
+        # The CRM importer has always received this column blank; keep it that way
+        'ServiceType': '',
+    }
+    return [values.get(column, '') for column in ORDER_EXPORT_COLUMNS]
+
+
+def iter_order_rows(order):
+    """Yields one row per order line, or a single row with blank line fields if there are none."""
+    base = order_columns(order)
+    lines = order.lines.all()
+    if not lines:
+        yield base
+        return
+    for line in lines:
+        row = base.copy()
+        row[_MATERIAL] = getattr(line.material, 'lookup_code', line.material.name)
+        row[_QUANTITY] = str(line.quantity)
+        row[_UOM] = line.material.uom.lookup_code if line.material.uom else ''
+        yield row
+
+
+def write_orders(orders, fileobj, export_format=None):
+    """Streams the rows of every order to an open file in the given export format."""
+    rows = (row for order in orders for row in iter_order_rows(order))
+    get_writer(export_format).write(fileobj, ORDER_EXPORT_COLUMNS, rows)
+
+
+def export_orders(queryset, fileobj, export_format=None, chunk_size=200):
+    """Exports a queryset of orders in a single streaming pass."""
+    write_orders(export_queryset(queryset).iterator(chunk_size=chunk_size), fileobj, export_format)
@@ -1,14 +1,25 @@
-from rest_framework import viewsets
+from datetime import datetime, time, timedelta
+from django.db.models import Case, Count, DateField, Prefetch, When
+from django.db.models.functions import TruncDate
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import viewsets, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from .models import OrderStatus, OrderType, OrderClass, Order, OrderLine
+from django.db import transaction
+from .models import OrderStatus, OrderType, OrderClass, Order, OrderLine, OrderSummary
 from .serializers import (
     OrderStatusSerializer,
     OrderTypeSerializer,
     OrderClassSerializer,
     OrderSerializer,
-    OrderLineSerializer
+    OrderLineSerializer,
+    OrderLineReplaceSerializer,
+    OrderSummarySerializer
 )
+from .pagination import OrderCursorPagination
 
 class OrderStatusViewSet(viewsets.ModelViewSet):
     queryset = OrderStatus.objects.all()
@@ -25,12 +36,154 @@ class OrderClassViewSet(viewsets.ModelViewSet):
 class OrderViewSet(viewsets.ModelViewSet):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
+    pagination_class = OrderCursorPagination
+
+    # Query param -> field filtered with a comma-separated list of ids
+    id_filters = {
+        'order_status': 'order_status_id__in',
+        'order_type': 'order_type_id__in',
+        'order_class': 'order_class_id__in',
+        'warehouse': 'warehouse_id__in',
+        'project': 'project_id__in',
+    }
 
     def get_queryset(self):
         if not self.request.user.is_authenticated:
             return Order.objects.none()
         user_projects = self.request.user.projects.all()
-        return Order.objects.filter(project__in=user_projects)
+        if self.action in ('list', 'summary'):
+            # List views read the denormalized summary rows, so they never join
+            return self.filter_list(OrderSummary.objects.filter(project__in=user_projects))
+        queryset = Order.objects.filter(project__in=user_projects).select_related('order_status')
+        if self.action == 'retrieve':
+            queryset = self.expand_queryset(queryset, self.get_expand())
+        return queryset
+
+    def get_expand(self):
+        value = self.request.query_params.get('expand', '')
+        expand = [name for name in value.split(',') if name]
+        unknown = [name for name in expand if name not in OrderSerializer.EXPANDABLE]
+        if unknown:
+            raise ValidationError({'expand': f"Unknown relation(s): {', '.join(unknown)}"})
+        return expand
+
+    def expand_queryset(self, queryset, expand):
+        """Loads the expanded relations with a fixed number of queries, whatever the line count."""
+        related = [name for name in expand if name != 'lines']
+        if related:
+            queryset = queryset.select_related(*related)
+        if 'contact' in expand:
+            queryset = queryset.prefetch_related('contact__addresses')
+        if 'lines' in expand:
+            queryset = queryset.prefetch_related(
+                Prefetch('lines', queryset=OrderLine.objects.select_related('material__uom').order_by('id'))
+            )
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        if self.action == 'retrieve':
+            kwargs['expand'] = self.get_expand()
+        return super().get_serializer(*args, **kwargs)
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return OrderSummarySerializer
+        return super().get_serializer_class()
+
+    def filter_list(self, queryset):
+        """Applies the dashboard filters; each one maps onto a composite index on OrderSummary."""
+        params = self.request.query_params
+        filters = {}
+        for param, lookup in self.id_filters.items():
+            if params.get(param):
+                try:
+                    filters[lookup] = [int(value) for value in params[param].split(',')]
+                except ValueError:
+                    raise ValidationError({param: 'Expected a comma-separated list of ids.'})
+        if params.get('created_from'):
+            filters['created_date__gte'] = self._parse_date_param('created_from')
+        if params.get('created_to'):
+            filters['created_date__lte'] = self._parse_date_param('created_to', end_of_day=True)
+        if params.get('lookup_code'):
+            filters['lookup_code_order__startswith'] = params['lookup_code']
+        return queryset.filter(**filters)
+
+    @action(detail=False, methods=['get'])
+    def summary(self, request):
+        """
+        Dashboard counts per project grouped by status, type and day (last `days` days),
+        from one aggregate query over OrderSummary, plus the `recent` newest orders.
+        """
+        days = self._parse_int_param('days', default=30, maximum=366)
+        recent = self._parse_int_param('recent', default=10, maximum=100)
+        queryset = self.get_queryset()
+        since = timezone.now() - timedelta(days=days)
+
+        rows = (
+            queryset.order_by()
+            .values(
+                'project_id', 'order_status_id', 'status_name', 'order_type_id', 'type_name',
+                day=Case(When(created_date__gte=since, then=TruncDate('created_date')), output_field=DateField()),
+            )
+            .annotate(count=Count('pk'))
+        )
+
+        projects = {}
+        for row in rows:
+            summary = projects.setdefault(row['project_id'], {
+                'project': row['project_id'], 'total': 0, 'by_status': {}, 'by_type': {}, 'by_day': {},
+            })
+            summary['total'] += row['count']
+            by_status = summary['by_status'].setdefault(row['order_status_id'], {
+                'order_status': row['order_status_id'],
+                'status_name': row['status_name'],
+                'count': 0,
+            })
+            by_status['count'] += row['count']
+            by_type = summary['by_type'].setdefault(row['order_type_id'], {
+                'order_type': row['order_type_id'],
+                'type_name': row['type_name'],
+                'count': 0,
+            })
+            by_type['count'] += row['count']
+            if row['day'] is not None:
+                summary['by_day'][row['day']] = summary['by_day'].get(row['day'], 0) + row['count']
+
+        for summary in projects.values():
+            summary['by_status'] = list(summary['by_status'].values())
+            summary['by_type'] = list(summary['by_type'].values())
+            summary['by_day'] = [{'date': day, 'count': count} for day, count in sorted(summary['by_day'].items())]
+
+        recent_orders = queryset.order_by('-created_date', '-pk')[:recent]
+        return Response({
+            'days': days,
+            'projects': list(projects.values()),
+            'recent': OrderSummarySerializer(recent_orders, many=True).data,
+        })
+
+    def _parse_int_param(self, param, default, maximum):
+        value = self.request.query_params.get(param)
+        if not value:
+            return default
+        try:
+            number = int(value)
+        except ValueError:
+            raise ValidationError({param: 'Expected an integer.'})
+        if not 0 < number <= maximum:
+            raise ValidationError({param: f'Expected a value between 1 and {maximum}.'})
+        return number
+
+    def _parse_date_param(self, param, end_of_day=False):
+        value = self.request.query_params[param]
+        parsed = parse_datetime(value)
+        if parsed is None:
+            date = parse_date(value)
+            if date is None:
+                raise ValidationError({param: 'Expected a date (YYYY-MM-DD) or datetime.'})
+            parsed = datetime.combine(date, time.max if end_of_day else time.min)
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
     
     def perform_create(self, serializer):
         """Asigna el usuario autenticado como created_by al crear una orden."""
@@ -64,9 +217,21 @@ class OrderLineViewSet(viewsets.ModelViewSet):
         """Delete all order lines for the specified order."""
         if not order_id:
             return Response({'detail': 'Order ID is required.'}, status=400)
-        OrderLine.objects.filter(order_id=order_id).delete()
+        with transaction.atomic():
+            OrderLine.objects.filter(order_id=order_id).delete()
+            OrderSummary.refresh([order_id])
         return Response({'detail': 'All order lines deleted successfully.'})
     
+    @action(detail=False, methods=['put'], url_path='order/(?P<order_id>[^/.]+)/replace')
+    def replace_order_lines(self, request, order_id=None):
+        """Replace the full set of lines for the specified order in a single transaction."""
+        user_projects = request.user.projects.all()
+        order = get_object_or_404(Order, id=order_id, project__in=user_projects)
+        serializer = OrderLineReplaceSerializer(data=request.data, context={'order': order})
+        serializer.is_valid(raise_exception=True)
+        counts = serializer.save(user=request.user)
+        return Response(counts, status=status.HTTP_200_OK)
+
     # Nueva acción personalizada para listar líneas por order_id
     @action(detail=False, methods=['get'], url_path='order/(?P<order_id>[^/.]+)')
     def list_order_lines(self, request, order_id=None):
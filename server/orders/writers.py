@@ -0,0 +1,80 @@
+import csv
+import json
+
+# Export format key -> writer, filled by register_writer
+EXPORT_WRITERS = {}
+
+DEFAULT_EXPORT_FORMAT = 'TAB'
+
+
+def register_writer(key):
+    """Class decorator that makes a writer available under an export format key."""
+    def decorator(writer_class):
+        EXPORT_WRITERS[key] = writer_class()
+        return writer_class
+    return decorator
+
+
+def get_writer(export_format):
+    """Returns the writer for a project's export format; projects without one use TAB."""
+    key = (export_format or DEFAULT_EXPORT_FORMAT).upper()
+    try:
+        return EXPORT_WRITERS[key]
+    except KeyError:
+        raise ValueError(f"Unsupported export format: {export_format}")
+
+
+class ExportWriter:
+    """
+    Serializes rows to an open text file. Rows come from a generator and are written
+    as they arrive, so the whole export is never held in memory.
+    """
+    extension = ''
+
+    def write(self, fileobj, columns, rows):
+        raise NotImplementedError
+
+
+class DelimitedWriter(ExportWriter):
+    delimiter = ','
+
+    def write(self, fileobj, columns, rows):
+        writer = csv.writer(fileobj, delimiter=self.delimiter)
+        writer.writerow(columns)
+        writer.writerows(rows)
+
+
+@register_writer('TAB')
+class TabWriter(DelimitedWriter):
+    extension = 'tab'
+    delimiter = '\t'
+
+
+@register_writer('CSV')
+class CSVWriter(DelimitedWriter):
+    extension = 'csv'
+
+
+@register_writer('JSONL')
+class JSONLinesWriter(ExportWriter):
+    extension = 'jsonl'
+
+    def write(self, fileobj, columns, rows):
+        for row in rows:
+            fileobj.write(json.dumps(dict(zip(columns, row)), default=str))
+            fileobj.write('\n')
+
+
+@register_writer('JSON')
+class JSONWriter(ExportWriter):
+    """Writes a JSON array of row objects, one element at a time."""
+    extension = 'json'
+
+    def write(self, fileobj, columns, rows):
+        fileobj.write('[')
+        for index, row in enumerate(rows):
+            if index:
+                fileobj.write(',')
+            fileobj.write('\n')
+            fileobj.write(json.dumps(dict(zip(columns, row)), default=str))
+        fileobj.write('\n]\n')
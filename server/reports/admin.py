@@ -1,8 +1,43 @@
 from django.contrib import admin
-from .models import ReportDefinition
+from .models import ReportDefinition, ReportExecution, ReportJob
+from .cache import report_cache_key, result_cache
 
 @admin.register(ReportDefinition)
 class ReportDefinitionAdmin(admin.ModelAdmin):
-    list_display = ('name', 'description', 'created_at', 'updated_at')
+    list_display = ('name', 'description', 'cache_ttl', 'window_days', 'timeout_seconds', 'timeout_count', 'last_timeout_at', 'updated_at')
     search_fields = ('name', 'description', 'query')
-    readonly_fields = ('created_at', 'updated_at')
\ No newline at end of file
+    readonly_fields = ('timeout_count', 'last_timeout_at', 'created_at', 'updated_at')
+    actions = ['invalidate_cache']
+
+    @admin.action(description="Invalidate cached results")
+    def invalidate_cache(self, request, queryset):
+        for report in queryset:
+            result_cache.invalidate(report_cache_key(report))
+        self.message_user(request, f"Invalidated cached results for {queryset.count()} report(s).")
+
+
+
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'report', 'user', 'status', 'row_count', 'created_at', 'finished_at', 'error')
+    list_filter = ('status', 'report')
+    search_fields = ('user__username', 'report__name')
+    readonly_fields = ('sql', 'params', 'result_path', 'row_count', 'error', 'started_at', 'finished_at',
+                       'created_at', 'updated_at')
+
+
+
+@admin.register(ReportExecution)
+class ReportExecutionAdmin(admin.ModelAdmin):
+    list_display = ('created_at', 'report', 'endpoint', 'user', 'project', 'total_ms', 'sql_ms', 'fetch_ms',
+                    'serialize_ms', 'row_count', 'response_bytes', 'cache_hit', 'status_code', 'error_class')
+    list_filter = ('endpoint', 'report', 'cache_hit', 'status_code', 'error_class')
+    search_fields = ('user__username', 'report__name', 'params_hash')
+    date_hierarchy = 'created_at'
+    list_select_related = ('report', 'user', 'project')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
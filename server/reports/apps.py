@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class ReportsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reports'
+
+    def ready(self):
+        from .report_manager import sql_registry
+        from . import checks  # noqa: F401
+
+        # Lee todos los archivos SQL una vez; si alguno no se puede leer, falla el arranque
+        sql_registry.load_all()
@@ -0,0 +1,158 @@
+# reports/backends.py
+"""
+Base de datos de la que leen los reportes, elegida con settings.REPORTS_BACKEND:
+
+    REPORTS_BACKEND = {
+        'BACKEND': 'reports.backends.SQLServerBackend',
+        'OPTIONS': {'server': 'WD02', 'database': 'FootPrint'},
+    }
+
+SQLServerBackend es FootPrint en producción (pyodbc se importa al conectar, así la app
+carga sin el driver ODBC). SQLiteBackend es una copia local en archivos con los mismos
+esquemas, generada con `manage.py seed_report_db`, para medir y probar sin SQL Server.
+Cada backend resuelve lo que cambia entre dialectos: conexión, timeout por consulta,
+paginación y los archivos SQL propios en reports/sql/dialects/<dialect>/.
+"""
+import os
+import sqlite3
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# Esquemas de FootPrint que usan los archivos SQL
+FOOTPRINT_SCHEMAS = ('datex_footprint', 'datex_footprint_reporting', 'woodfield_reporting')
+
+
+class QueryTimeout(Exception):
+    """La consulta superó su tiempo máximo o fue cancelada en el servidor."""
+
+    def __init__(self, timeout, cancelled=False):
+        self.timeout = timeout
+        self.cancelled = cancelled
+        reason = "was cancelled" if cancelled else f"exceeded {timeout}s"
+        super().__init__(f"Report query {reason}")
+
+
+class ReportBackend:
+    """Interfaz de los backends de reportes."""
+    vendor = None
+    # Subdirectorio de reports/sql/dialects/ con versiones propias de los archivos (None = T-SQL)
+    dialect = None
+    # Cláusula de paginación que page_sql añade tras el ORDER BY
+    limit_clause = 'OFFSET ? ROWS FETCH NEXT ? ROWS ONLY'
+
+    def connect(self):
+        """Nueva conexión DB-API en modo solo lectura/autocommit."""
+        raise NotImplementedError
+
+    def set_timeout(self, connection, timeout):
+        """Tiempo máximo de las siguientes consultas de la conexión (None o 0 = sin límite)."""
+
+    def query_timeout(self, exc, timeout):
+        """QueryTimeout equivalente a `exc`, o None si el error no es un timeout."""
+        return None
+
+    def page_params(self, offset, limit):
+        """Parámetros de limit_clause, en su orden."""
+        return [offset, limit]
+
+
+class SQLServerBackend(ReportBackend):
+    vendor = 'sqlserver'
+
+    # SQLSTATE del driver ODBC: timeout de la consulta y operación cancelada
+    TIMEOUT_SQLSTATES = {'HYT00': False, 'HY008': True}
+
+    def __init__(self, server, database, driver='ODBC Driver 17 for SQL Server', trusted_connection=True,
+                 user=None, password=None):
+        self.server = server
+        self.database = database
+        self.driver = driver
+        self.trusted_connection = trusted_connection
+        self.user = user
+        self.password = password
+
+    def connect(self):
+        """
+        Establece una conexión directa a SQL Server usando pyodbc
+        """
+        import pyodbc
+
+        credentials = 'Trusted_Connection=yes;' if self.trusted_connection else f"UID={self.user};PWD={self.password};"
+        connection_string = f"""
+            DRIVER={{{self.driver}}};
+            SERVER={self.server};
+            DATABASE={self.database};
+            {credentials}
+        """
+        # Solo lectura: autocommit evita dejar transacciones abiertas en conexiones del pool
+        return pyodbc.connect(connection_string, autocommit=True)
+
+    def set_timeout(self, connection, timeout):
+        # pyodbc: Connection.timeout, 0 = sin límite
+        connection.timeout = timeout or 0
+
+    def query_timeout(self, exc, timeout):
+        sqlstate = exc.args[0] if exc.args else None
+        if sqlstate in self.TIMEOUT_SQLSTATES:
+            return QueryTimeout(timeout, cancelled=self.TIMEOUT_SQLSTATES[sqlstate])
+        return None
+
+
+class SQLiteBackend(ReportBackend):
+    """
+    FootPrint local: `path` tiene main.db y un archivo por esquema (<esquema>.db), que
+    se adjuntan con ATTACH para que `esquema.tabla` funcione igual que en SQL Server.
+    """
+    vendor = 'sqlite'
+    dialect = 'sqlite'
+    limit_clause = 'LIMIT ? OFFSET ?'
+
+    def __init__(self, path, schemas=FOOTPRINT_SCHEMAS):
+        self.path = str(path)
+        self.schemas = tuple(schemas)
+        # Mismos tipos de parámetro que acepta pyodbc
+        sqlite3.register_adapter(Decimal, str)
+        sqlite3.register_adapter(datetime, lambda value: value.isoformat(' '))
+        sqlite3.register_adapter(date, lambda value: value.isoformat())
+
+    def database_path(self, schema=None):
+        return os.path.join(self.path, f"{schema or 'main'}.db")
+
+    def connect(self, create=False):
+        if create:
+            os.makedirs(self.path, exist_ok=True)
+        elif not os.path.exists(self.database_path()):
+            raise FileNotFoundError(f"No local report database in {self.path}; run manage.py seed_report_db")
+        connection = sqlite3.connect(self.database_path(), check_same_thread=False, isolation_level=None)
+        for schema in self.schemas:
+            connection.execute('ATTACH DATABASE ? AS ' + schema, [self.database_path(schema)])
+        # Funciones de T-SQL que usan las consultas (ISNULL es un operador en SQLite: usar IFNULL)
+        connection.create_function('GETDATE', 0, lambda: datetime.now().isoformat(' ', 'seconds'))
+        return connection
+
+    def set_timeout(self, connection, timeout):
+        if not timeout:
+            connection.set_progress_handler(None, 0)
+            return
+        deadline = time.monotonic() + timeout
+        # Se llama cada N instrucciones de la VM; devolver True interrumpe la consulta
+        connection.set_progress_handler(lambda: time.monotonic() > deadline, 10000)
+
+    def query_timeout(self, exc, timeout):
+        if isinstance(exc, sqlite3.OperationalError) and 'interrupted' in str(exc):
+            return QueryTimeout(timeout)
+        return None
+
+    def page_params(self, offset, limit):
+        return [limit, offset]
+
+
+def load_backend(config):
+    """Instancia el backend de un diccionario como settings.REPORTS_BACKEND."""
+    return import_string(config['BACKEND'])(**config.get('OPTIONS', {}))
+
+
+report_backend = load_backend(settings.REPORTS_BACKEND)
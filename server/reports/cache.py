@@ -0,0 +1,142 @@
+# reports/cache.py
+import hashlib
+import json
+import threading
+import time
+import uuid
+from django.conf import settings
+from django.core.cache import caches
+
+
+class ResultPending(Exception):
+    """Otro worker sigue ejecutando la misma consulta; el cliente debe reintentar."""
+
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+        super().__init__("The same report query is still running, retry later")
+
+
+class ResultCache:
+    """
+    Caché de resultados (columnas, filas) compartida entre workers.
+
+    La clave combina el reporte, el hash del SQL, los parámetros y una versión por
+    reporte; invalidar cambia la versión y deja las entradas anteriores huérfanas
+    hasta que expiran. Los fallos concurrentes de la misma clave ejecutan una sola
+    consulta: dentro del proceso esperan un Event y entre workers un lock con
+    cache.add, sondeando hasta que el resultado aparece. La espera dura lo mismo que
+    el lock; si al terminar otro worker sigue con la consulta se lanza ResultPending
+    en vez de ejecutarla otra vez.
+    """
+
+    def __init__(self, alias, lock_timeout=120, poll_interval=0.2, retry_after=5):
+        self.alias = alias
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self.retry_after = retry_after
+        self._inflight = {}  # clave -> threading.Event del hilo que ejecuta la consulta
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @staticmethod
+    def _digest(value):
+        return hashlib.sha1(value.encode()).hexdigest()
+
+    def _version_key(self, report_key):
+        return f"reports:version:{report_key}"
+
+    def version(self, report_key):
+        version_key = self._version_key(report_key)
+        version = self.cache.get(version_key)
+        if version is None:
+            # add() para que dos workers no creen versiones distintas a la vez
+            self.cache.add(version_key, uuid.uuid4().hex, timeout=None)
+            version = self.cache.get(version_key)
+        return version
+
+    def make_key(self, report_key, sql, params, version=None):
+        params_hash = self._digest(json.dumps(list(params or []), default=str))
+        version = version or self.version(report_key)
+        return f"reports:result:{report_key}:{version}:{self._digest(sql)}:{params_hash}"
+
+    def get_many(self, report_key, sql, params_list):
+        """Resultados guardados de la misma consulta con varios parámetros (None si falta), en una lectura."""
+        version = self.version(report_key)
+        keys = [self.make_key(report_key, sql, params, version) for params in params_list]
+        found = self.cache.get_many(keys)
+        return [found.get(key) for key in keys]
+
+    def set(self, report_key, sql, params, result, ttl):
+        self.cache.set(self.make_key(report_key, sql, params), result, timeout=ttl)
+
+    def invalidate(self, report_key):
+        """Descarta todos los resultados guardados de un reporte."""
+        self.cache.set(self._version_key(report_key), uuid.uuid4().hex, timeout=None)
+
+    def get_or_execute(self, report_key, sql, params, ttl, execute, timeout=None):
+        """
+        Devuelve (resultado, hit). `execute` solo se llama si no hay resultado guardado;
+        con ttl 0 no se usa la caché. `timeout` es el tiempo máximo de la consulta: el
+        lock (y la espera de los demás) dura al menos eso.
+        """
+        if not ttl:
+            return execute(), False
+        hold = max(self.lock_timeout, timeout or 0)
+        key = self.make_key(report_key, sql, params)
+        result = self.cache.get(key)
+        if result is not None:
+            return result, True
+
+        with self._lock:
+            event = self._inflight.get(key)
+            leader = event is None
+            if leader:
+                event = self._inflight[key] = threading.Event()
+        if not leader:
+            event.wait(hold)
+            result = self.cache.get(key)
+            if result is not None:
+                return result, True
+            # El hilo que ejecutaba falló: uno de los que esperan toma el lock
+            return self._fill(key, ttl, execute, hold)
+        try:
+            return self._fill(key, ttl, execute, hold)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            event.set()
+
+    def _fill(self, key, ttl, execute, hold):
+        lock_key = f"{key}:lock"
+        deadline = time.monotonic() + hold
+        while True:
+            if self.cache.add(lock_key, 1, timeout=hold):
+                try:
+                    result = execute()
+                    self.cache.set(key, result, timeout=ttl)
+                    return result, False
+                finally:
+                    self.cache.delete(lock_key)
+            # Otro worker está ejecutando la misma consulta
+            if time.monotonic() >= deadline:
+                raise ResultPending(self.retry_after)
+            time.sleep(self.poll_interval)
+            result = self.cache.get(key)
+            if result is not None:
+                return result, True
+
+
+def report_cache_key(report):
+    """Clave de caché de un ReportDefinition."""
+    return f"report:{report.pk}"
+
+
+result_cache = ResultCache(
+    settings.REPORTS_CACHE['ALIAS'],
+    lock_timeout=settings.REPORTS_CACHE['LOCK_TIMEOUT'],
+    poll_interval=settings.REPORTS_CACHE['POLL_INTERVAL'],
+    retry_after=settings.REPORTS_CACHE['RETRY_AFTER'],
+)
@@ -0,0 +1,31 @@
+# reports/checks.py
+from django.core.checks import Error, Tags, register
+from django.db import DEFAULT_DB_ALIAS, DatabaseError
+
+
+@register(Tags.database)
+def check_report_definitions(app_configs, databases=None, **kwargs):
+    """
+    Every ReportDefinition points to a loaded SQL file with the placeholders it binds.
+    Reads the database, so it only runs with `check --database` and `migrate`.
+    """
+    from .models import ReportDefinition
+    from .report_manager import sql_registry
+
+    if not databases or DEFAULT_DB_ALIAS not in databases:
+        return []
+    try:
+        reports = list(ReportDefinition.objects.only('id', 'name', 'category', 'file_path', 'requires_project_filter'))
+    except DatabaseError:
+        # Base de datos sin migrar o no disponible (p.ej. durante el primer migrate)
+        return []
+    errors = []
+    for report in reports:
+        for message in sql_registry.definition_errors(report.category, report.file_path, report.requires_project_filter):
+            errors.append(Error(
+                f"Report '{report.name}' (id={report.pk}): {message}",
+                hint="Fix the SQL file or the report definition in the admin.",
+                obj=report,
+                id='reports.E001',
+            ))
+    return errors
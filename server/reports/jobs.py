@@ -0,0 +1,213 @@
+# reports/jobs.py
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+from common.files import write_atomic
+from .models import ReportJob
+from .backends import QueryTimeout
+from .report_manager import SQLReportManager
+from .streaming import ENCODERS
+
+logger = logging.getLogger(__name__)
+
+# Clave del advisory lock de Postgres que serializa los envíos de trabajos
+SUBMIT_LOCK_KEY = 0x7265706f7274  # 'report'
+
+
+class JobLimitExceeded(Exception):
+    """Too many report jobs are already pending or running."""
+
+
+class JobInterrupted(Exception):
+    """The job stopped being RUNNING while it ran (prune_jobs marked it as failed)."""
+
+
+class ReportJobRunner:
+    """
+    Runs ReportJobs on a bounded thread pool in this process, so long queries do not
+    hold a request worker. Limits are counted in the database, so they apply across
+    all worker processes. Jobs left PENDING by a restarted worker are picked up again
+    by dispatch_pending() (manage.py run_report_jobs).
+    """
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+        self._executor = None
+        self._queued = set()  # ids waiting in or running on this executor
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='report-job')
+            return self._executor
+
+    def submit(self, report, user, sql, params, result_format='ndjson'):
+        """Queues a job, or raises JobLimitExceeded. The query starts after the transaction commits."""
+        limits = settings.REPORTS_JOBS
+        with transaction.atomic():
+            self._lock_submissions(user)
+            active = ReportJob.objects.filter(status__in=ReportJob.ACTIVE_STATUSES)
+            if active.filter(user=user).count() >= limits['MAX_ACTIVE_PER_USER']:
+                raise JobLimitExceeded(f"You already have {limits['MAX_ACTIVE_PER_USER']} report(s) running")
+            if active.count() >= limits['MAX_ACTIVE']:
+                raise JobLimitExceeded("Too many reports running, try again later")
+            job = ReportJob.objects.create(
+                report=report, user=user, sql=sql, params=params, result_format=result_format
+            )
+            transaction.on_commit(lambda: self.dispatch(job.pk))
+        return job
+
+    def dispatch(self, job_id):
+        """Queues a job on this process's executor, unless it is already queued here."""
+        with self._lock:
+            if job_id in self._queued:
+                return
+            self._queued.add(job_id)
+        self.executor.submit(self._run_queued, job_id)
+
+    def _run_queued(self, job_id):
+        try:
+            self.run(job_id)
+        finally:
+            with self._lock:
+                self._queued.discard(job_id)
+
+    def dispatch_pending(self, grace_seconds=None):
+        """
+        Queues PENDING jobs older than `grace_seconds`, i.e. jobs whose submitting worker
+        stopped before running them. run() claims atomically, so a job dispatched twice
+        still runs once. Returns the number queued.
+        """
+        if grace_seconds is None:
+            grace_seconds = settings.REPORTS_JOBS['DISPATCH_GRACE_SECONDS']
+        job_ids = list(
+            ReportJob.objects.filter(
+                status=ReportJob.PENDING, created_at__lt=timezone.now() - timedelta(seconds=grace_seconds)
+            ).order_by('created_at').values_list('id', flat=True)
+        )
+        for job_id in job_ids:
+            self.dispatch(job_id)
+        return len(job_ids)
+
+    def _lock_submissions(self, user):
+        """
+        Serializes submits until the transaction ends, so the limit counts stay true until
+        the new job is inserted. On Postgres one advisory lock covers both limits; other
+        databases lock the user's row, which covers the per-user limit.
+        """
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_xact_lock(%s)", [SUBMIT_LOCK_KEY])
+        else:
+            list(get_user_model().objects.select_for_update().filter(pk=user.pk))
+
+    def run(self, job_id):
+        try:
+            # Solo un hilo toma el trabajo aunque se envíe dos veces
+            claimed = ReportJob.objects.filter(pk=job_id, status=ReportJob.PENDING).update(
+                status=ReportJob.RUNNING, started_at=timezone.now(), updated_at=timezone.now()
+            )
+            if not claimed:
+                return
+            job = ReportJob.objects.get(pk=job_id)
+            # Only a job that is still ours is finished; prune_jobs may have failed it
+            running = ReportJob.objects.filter(pk=job_id, status=ReportJob.RUNNING)
+            try:
+                path, row_count = self.write_result(job)
+            except JobInterrupted:
+                logger.warning("Report job %s was interrupted while running", job_id)
+            except Exception as exc:
+                logger.warning("Report job %s failed: %s", job_id, exc)
+                if isinstance(exc, QueryTimeout):
+                    job.report.record_timeout()
+                running.update(
+                    status=ReportJob.FAILED, error=f"{type(exc).__name__}: {exc}",
+                    finished_at=timezone.now(), updated_at=timezone.now()
+                )
+            else:
+                finished = running.update(
+                    status=ReportJob.DONE, result_path=path, row_count=row_count,
+                    finished_at=timezone.now(), updated_at=timezone.now()
+                )
+                if not finished and os.path.exists(path):
+                    os.remove(path)
+        finally:
+            # Los hilos del pool no pasan por el ciclo de request: cerrar su conexión a Postgres
+            close_old_connections()
+
+    def write_result(self, job):
+        from .views import report_pool  # el pool de SQL Server vive con las vistas
+
+        path = os.path.join(str(settings.REPORTS_JOBS['RESULT_DIR']), f"report_job_{job.pk}.{job.result_format}")
+        row_count = 0
+
+        def write(out):
+            nonlocal row_count
+            with report_pool.connection() as conn:
+                chunks = SQLReportManager().stream_sql(
+                    conn, job.sql, job.params or None, chunk_size=settings.REPORTS_STREAM_CHUNK_SIZE,
+                    timeout=settings.REPORTS_JOBS['QUERY_TIMEOUT']
+                )
+                columns = next(chunks)
+
+                def counted():
+                    nonlocal row_count
+                    for rows in chunks:
+                        row_count += len(rows)
+                        self.heartbeat(job)
+                        yield rows
+
+                for text in ENCODERS[job.result_format](columns, counted()):
+                    out.write(text)
+
+        write_atomic(path, write)
+        return path, row_count
+
+    def heartbeat(self, job):
+        """
+        Touches updated_at so prune_jobs sees the job is alive, at most every
+        HEARTBEAT_SECONDS. Raises JobInterrupted if the job is no longer RUNNING.
+        """
+        now = timezone.now()
+        last = getattr(job, '_last_heartbeat', None)
+        if last is not None and (now - last).total_seconds() < settings.REPORTS_JOBS['HEARTBEAT_SECONDS']:
+            return
+        if not ReportJob.objects.filter(pk=job.pk, status=ReportJob.RUNNING).update(updated_at=now):
+            raise JobInterrupted(job.pk)
+        job._last_heartbeat = now
+
+
+def prune_jobs(now=None):
+    """
+    Deletes finished jobs (and their files) past the retention period and marks
+    running jobs that stopped sending heartbeats as failed. PENDING jobs are not
+    failed here: dispatch_pending() runs them again. Returns (deleted, failed).
+    """
+    now = now or timezone.now()
+    limits = settings.REPORTS_JOBS
+    failed = ReportJob.objects.filter(
+        status=ReportJob.RUNNING,
+        updated_at__lt=now - timedelta(minutes=limits['STALE_MINUTES']),
+    ).update(status=ReportJob.FAILED, error='Interrupted', finished_at=now, updated_at=now)
+    expired = ReportJob.objects.filter(
+        status__in=(ReportJob.DONE, ReportJob.FAILED),
+        updated_at__lt=now - timedelta(hours=limits['RETENTION_HOURS']),
+    )
+    deleted = 0
+    for job in expired.iterator():
+        if job.result_path and os.path.exists(job.result_path):
+            os.remove(job.result_path)
+        job.delete()
+        deleted += 1
+    return deleted, failed
+
+
+job_runner = ReportJobRunner(settings.REPORTS_JOBS['MAX_WORKERS'])
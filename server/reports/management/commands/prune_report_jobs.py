@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from reports.jobs import prune_jobs
+
+
+class Command(BaseCommand):
+    help = "Deletes expired report jobs and their result files, and fails running jobs that stopped sending heartbeats."
+
+    def handle(self, *args, **options):
+        deleted, failed = prune_jobs()
+        self.stdout.write(f"Deleted {deleted} expired job(s), marked {failed} stale job(s) as failed")
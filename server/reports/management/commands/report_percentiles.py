@@ -0,0 +1,44 @@
+import math
+from collections import defaultdict
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from reports.models import ReportExecution
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class Command(BaseCommand):
+    help = "Shows p50/p95/p99 response times per report over a time window."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=float, default=24, help="Window size (default 24)")
+        parser.add_argument('--field', default='total_ms', choices=['total_ms', 'sql_ms', 'fetch_ms', 'serialize_ms'],
+                            help="Timing to summarize (default total_ms)")
+
+    def handle(self, *args, **options):
+        field = options['field']
+        since = timezone.now() - timedelta(hours=options['hours'])
+        executions = (
+            ReportExecution.objects.filter(created_at__gte=since, **{f'{field}__isnull': False})
+            .values_list('endpoint', 'report__name', field, 'error_class', 'cache_hit')
+        )
+        groups = defaultdict(lambda: {'values': [], 'errors': 0, 'hits': 0})
+        for endpoint, report_name, value, error_class, cache_hit in executions.iterator():
+            group = groups[report_name or endpoint]
+            group['values'].append(value)
+            group['errors'] += bool(error_class)
+            group['hits'] += bool(cache_hit)
+
+        self.stdout.write(f"{field} since {since:%Y-%m-%d %H:%M}")
+        self.stdout.write(f"{'report':<40} {'runs':>6} {'p50':>10} {'p95':>10} {'p99':>10} {'errors':>7} {'hit %':>6}")
+        for name, group in sorted(groups.items(), key=lambda item: -len(item[1]['values'])):
+            values = sorted(group['values'])
+            self.stdout.write(
+                f"{name[:40]:<40} {len(values):>6} {percentile(values, 50):>10.1f} {percentile(values, 95):>10.1f} "
+                f"{percentile(values, 99):>10.1f} {group['errors']:>7} {100 * group['hits'] / len(values):>6.1f}"
+            )
@@ -0,0 +1,25 @@
+import time
+from django.core.management.base import BaseCommand
+from reports.jobs import job_runner, prune_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs report jobs left PENDING by a restarted web worker and fails jobs that "
+        "stopped sending heartbeats."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Process a single pass, wait for its jobs and exit")
+        parser.add_argument('--interval', type=float, default=30, help="Seconds between passes")
+
+    def handle(self, *args, **options):
+        while True:
+            _, failed = prune_jobs()
+            queued = job_runner.dispatch_pending()
+            if queued or failed:
+                self.stdout.write(f"Queued {queued} pending job(s), marked {failed} stale job(s) as failed")
+            if options['once']:
+                job_runner.executor.shutdown(wait=True)
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,187 @@
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from enterprise.models import Project
+from logistics.models import Warehouse
+from materials.models import Material
+from reports.backends import SQLiteBackend, report_backend
+
+# Las tablas y vistas de FootPrint que leen los archivos de reports/sql/, con las
+# columnas que usan e índices parecidos a los de producción
+SCHEMA = """
+CREATE TABLE datex_footprint.Projects (id INTEGER PRIMARY KEY, lookupCode TEXT, name TEXT);
+CREATE UNIQUE INDEX datex_footprint.ix_projects_lookup ON Projects (lookupCode);
+CREATE TABLE datex_footprint.Materials (id INTEGER PRIMARY KEY, projectId INTEGER, lookupCode TEXT, description TEXT);
+CREATE INDEX datex_footprint.ix_materials_project ON Materials (projectId);
+CREATE TABLE datex_footprint.LicensePlates (id INTEGER PRIMARY KEY, lookupCode TEXT, archived INTEGER);
+CREATE UNIQUE INDEX datex_footprint.ix_license_plates_lookup ON LicensePlates (lookupCode);
+CREATE TABLE datex_footprint.InventoryDetailedView (
+    projectLookupCode TEXT, materialId INTEGER, materialName TEXT, materialDescription TEXT,
+    lotLookupCode TEXT, licensePlateLookupCode TEXT, activeAmount NUMERIC, warehouseName TEXT,
+    materialStatusId INTEGER, lotStatusId INTEGER, locationStatusId INTEGER, licensePlateStatusId INTEGER
+);
+CREATE INDEX datex_footprint.ix_inventory_project ON InventoryDetailedView (projectLookupCode);
+CREATE TABLE datex_footprint.Accounts (id INTEGER PRIMARY KEY, name TEXT, lookupCode TEXT);
+CREATE TABLE datex_footprint.Carriers (id INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE datex_footprint.CarrierServiceTypes (id INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE datex_footprint.ShipmentStatuses (id INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE datex_footprint.Orders (
+    id INTEGER PRIMARY KEY, lookupCode TEXT, ownerReference TEXT, vendorReference TEXT,
+    projectId INTEGER, accountId INTEGER
+);
+CREATE INDEX datex_footprint.ix_orders_project ON Orders (projectId);
+CREATE TABLE datex_footprint.Shipments (
+    id INTEGER PRIMARY KEY, lookupCode TEXT, shippedDate TEXT, createdSysDateTime TEXT,
+    trackingIdentifier TEXT, accountId INTEGER, carrierId INTEGER, carrierServiceTypeId INTEGER,
+    statusId INTEGER, typeId INTEGER, billOfLading TEXT
+);
+CREATE INDEX datex_footprint.ix_shipments_shipped ON Shipments (shippedDate);
+CREATE TABLE datex_footprint.ShipmentOrderLookup (shipmentId INTEGER, orderId INTEGER);
+CREATE INDEX datex_footprint.ix_shipment_order_shipment ON ShipmentOrderLookup (shipmentId);
+CREATE TABLE datex_footprint_reporting.MaterialsPackagingsLookupView (materialId INTEGER, packagingId INTEGER, isBasePackaging INTEGER);
+CREATE INDEX datex_footprint_reporting.ix_packagings_material ON MaterialsPackagingsLookupView (materialId);
+CREATE TABLE datex_footprint_reporting.InventoryMeasurementUnitsView (id INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE woodfield_reporting.ePortal_PackingSlipLines (shipmentId INTEGER, materialName TEXT, materialLookupCode TEXT, amount NUMERIC);
+CREATE INDEX woodfield_reporting.ix_packing_slip_shipment ON ePortal_PackingSlipLines (shipmentId);
+"""
+
+UNITS = ['EA', 'CS', 'PL', 'LB', 'KG']
+CARRIERS = ['UPS', 'FedEx', 'USPS', 'DHL', 'LTL']
+SERVICE_TYPES = ['Ground', '2nd Day', 'Overnight', 'Freight']
+# Ids de FootPrint que filtran las consultas: 8 = completado, 2 = salida
+SHIPPED_STATUS, OUTBOUND_TYPE = 8, 2
+BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = (
+        "Builds the local FootPrint copy used by SQLiteBackend, with generated data shaped like "
+        "production, so reports can be benchmarked without SQL Server."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', help="Target directory (defaults to the SQLiteBackend path in REPORTS_BACKEND)")
+        parser.add_argument('--project', action='append', help="Project lookup codes (defaults to the portal's projects)")
+        parser.add_argument('--projects', type=int, default=3, help="Generated projects when the portal has none")
+        parser.add_argument('--materials', type=int, default=200, help="Materials per project")
+        parser.add_argument('--license-plates', type=int, default=5000, help="Inventory rows per project")
+        parser.add_argument('--shipments', type=int, default=2000, help="Shipments per project")
+        parser.add_argument('--days', type=int, default=60, help="Shipped dates are spread over this many days")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--force', action='store_true', help="Replace an existing database")
+
+    def handle(self, *args, **options):
+        backend = self.get_backend(options['path'])
+        if os.path.exists(backend.database_path()):
+            if not options['force']:
+                raise CommandError(f"{backend.path} already has a database; use --force to replace it")
+            for schema in (None, *backend.schemas):
+                if os.path.exists(backend.database_path(schema)):
+                    os.remove(backend.database_path(schema))
+
+        started = time.perf_counter()
+        self.rng = random.Random(options['seed'])
+        self.now = datetime.now().replace(microsecond=0)
+        connection = backend.connect(create=True)
+        try:
+            connection.executescript(SCHEMA)
+            connection.execute('BEGIN')
+            counts = self.populate(connection, options)
+            connection.execute('COMMIT')
+            connection.execute('ANALYZE')
+        finally:
+            connection.close()
+
+        for table, count in counts.items():
+            self.stdout.write(f"{table:<40} {count:>10}")
+        self.stdout.write(f"Seeded {backend.path} in {time.perf_counter() - started:.1f}s")
+
+    def get_backend(self, path):
+        if path:
+            return SQLiteBackend(path)
+        if not isinstance(report_backend, SQLiteBackend):
+            raise CommandError("REPORTS_BACKEND is not a SQLiteBackend; pass --path")
+        return report_backend
+
+    def insert(self, connection, table, rows):
+        rows = list(rows)
+        columns = len(rows[0]) if rows else 0
+        sql = f"INSERT INTO {table} VALUES ({', '.join(['?'] * columns)})"
+        for start in range(0, len(rows), BATCH_SIZE):
+            connection.executemany(sql, rows[start:start + BATCH_SIZE])
+        self.counts[table] = self.counts.get(table, 0) + len(rows)
+
+    def project_codes(self, options):
+        if options['project']:
+            return options['project']
+        codes = list(Project.objects.order_by('lookup_code').values_list('lookup_code', flat=True))
+        return codes or [f"PRJ{number:02d}" for number in range(1, options['projects'] + 1)]
+
+    def populate(self, connection, options):
+        rng = self.rng
+        self.counts = {}
+        warehouses = list(Warehouse.objects.order_by('name').values_list('name', flat=True)) or ['WH1', 'WH2']
+
+        self.insert(connection, 'datex_footprint_reporting.InventoryMeasurementUnitsView', enumerate(UNITS, 1))
+        self.insert(connection, 'datex_footprint.Carriers', enumerate(CARRIERS, 1))
+        self.insert(connection, 'datex_footprint.CarrierServiceTypes', enumerate(SERVICE_TYPES, 1))
+        self.insert(connection, 'datex_footprint.ShipmentStatuses', [(SHIPPED_STATUS, 'Shipped'), (1, 'Open')])
+
+        material_id = license_plate_id = order_id = shipment_id = 0
+        for project_id, code in enumerate(self.project_codes(options), 1):
+            self.insert(connection, 'datex_footprint.Projects', [(project_id, code, f"Project {code}")])
+            self.insert(connection, 'datex_footprint.Accounts', [(project_id, f"Account {code}", f"ACC-{code}")])
+
+            # Los materiales del portal primero, para que los ids locales se puedan resolver
+            lookup_codes = list(
+                Material.objects.filter(project__lookup_code=code).order_by('lookup_code').values_list('lookup_code', flat=True)
+            )
+            lookup_codes += [f"{code}-M{number:05d}" for number in range(len(lookup_codes), options['materials'])]
+            materials = []
+            for lookup_code in lookup_codes:
+                material_id += 1
+                materials.append((material_id, project_id, lookup_code, f"Material {lookup_code}"))
+            self.insert(connection, 'datex_footprint.Materials', materials)
+            self.insert(
+                connection, 'datex_footprint_reporting.MaterialsPackagingsLookupView',
+                [(material[0], rng.randint(1, len(UNITS)), 1) for material in materials]
+            )
+
+            license_plates, inventory = [], []
+            for _ in range(options['license_plates']):
+                license_plate_id += 1
+                material = rng.choice(materials)
+                lookup_code = f"LP{license_plate_id:08d}"
+                license_plates.append((license_plate_id, lookup_code, int(rng.random() < 0.05)))
+                inventory.append((
+                    code, material[0], material[2], material[3],
+                    f"LOT{rng.randint(1, 400):04d}" if rng.random() < 0.98 else 'test-lot',
+                    lookup_code, rng.choice([0, rng.randint(1, 500)]), rng.choice(warehouses),
+                    1, 1, 1, 1 if rng.random() < 0.97 else 2,
+                ))
+            self.insert(connection, 'datex_footprint.LicensePlates', license_plates)
+            self.insert(connection, 'datex_footprint.InventoryDetailedView', inventory)
+
+            orders, shipments, lookups, lines = [], [], [], []
+            for _ in range(options['shipments']):
+                order_id += 1
+                shipment_id += 1
+                shipped = self.now - timedelta(seconds=rng.randint(0, options['days'] * 86400))
+                orders.append((order_id, f"{code}-SO{order_id:07d}", f"PO{rng.randint(1, 99999)}", '', project_id, project_id))
+                shipments.append((
+                    shipment_id, f"SH{shipment_id:08d}", shipped.isoformat(' '),
+                    (shipped - timedelta(hours=rng.randint(1, 72))).isoformat(' '),
+                    'VOID' if rng.random() < 0.01 else f"1Z{rng.randint(10 ** 9, 10 ** 10)}",
+                    project_id, rng.randint(1, len(CARRIERS)), rng.randint(1, len(SERVICE_TYPES)),
+                    SHIPPED_STATUS if rng.random() < 0.95 else 1, OUTBOUND_TYPE, f"BOL{shipment_id:08d}",
+                ))
+                lookups.append((shipment_id, order_id))
+                for material in rng.sample(materials, min(rng.randint(1, 5), len(materials))):
+                    lines.append((shipment_id, material[3], material[2], rng.randint(1, 100)))
+            self.insert(connection, 'datex_footprint.Orders', orders)
+            self.insert(connection, 'datex_footprint.Shipments', shipments)
+            self.insert(connection, 'datex_footprint.ShipmentOrderLookup', lookups)
+            self.insert(connection, 'woodfield_reporting.ePortal_PackingSlipLines', lines)
+        return self.counts
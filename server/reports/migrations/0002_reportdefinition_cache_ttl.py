@@ -0,0 +1,29 @@
+# Generated by Django 5.1.6 on 2026-10-17 15:59
+
+from django.core.management import call_command
+from django.db import migrations, models
+
+
+def create_cache_table(apps, schema_editor):
+    # Tabla de la caché 'reports' (DatabaseCache); no hace nada si ya existe
+    call_command('createcachetable', 'reports_cache', database=schema_editor.connection.alias, verbosity=0)
+
+
+def drop_cache_table(apps, schema_editor):
+    schema_editor.execute(f"DROP TABLE IF EXISTS {schema_editor.quote_name('reports_cache')}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportdefinition',
+            name='cache_ttl',
+            field=models.PositiveIntegerField(default=0, help_text='Segundos que se reutiliza un resultado (0 = sin caché)'),
+        ),
+        migrations.RunPython(create_cache_table, drop_cache_table),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-17 16:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0002_reportdefinition_cache_ttl'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportdefinition',
+            name='parameters',
+            field=models.JSONField(blank=True, default=list, help_text='Filtros opcionales: [{name, column, type, op}] (ver reports/parameters.py)'),
+        ),
+    ]
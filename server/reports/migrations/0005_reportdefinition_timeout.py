@@ -0,0 +1,28 @@
+# Generated by Django 5.1.6 on 2026-10-17 16:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0004_reportjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportdefinition',
+            name='last_timeout_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='reportdefinition',
+            name='timeout_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='reportdefinition',
+            name='timeout_seconds',
+            field=models.PositiveIntegerField(blank=True, help_text='Tiempo máximo de la consulta (vacío = REPORTS_QUERY_TIMEOUT)', null=True),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.6 on 2026-10-17 16:09
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('enterprise', '0004_project_export_format_choices'),
+        ('reports', '0005_reportdefinition_timeout'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportExecution',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('endpoint', models.CharField(max_length=20)),
+                ('project_count', models.PositiveSmallIntegerField(default=0)),
+                ('params_hash', models.CharField(blank=True, max_length=40)),
+                ('sql_ms', models.FloatField(blank=True, help_text='Suma del tiempo de execute de las consultas', null=True)),
+                ('fetch_ms', models.FloatField(blank=True, help_text='Suma del tiempo leyendo filas', null=True)),
+                ('serialize_ms', models.FloatField(blank=True, null=True)),
+                ('total_ms', models.FloatField()),
+                ('row_count', models.PositiveIntegerField(blank=True, null=True)),
+                ('response_bytes', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('cache_hit', models.BooleanField(blank=True, null=True)),
+                ('status_code', models.PositiveSmallIntegerField()),
+                ('error_class', models.CharField(blank=True, max_length=100)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='enterprise.project')),
+                ('report', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='executions', to='reports.reportdefinition')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['report', 'created_at'], name='report_execution_report_idx'), models.Index(fields=['endpoint', 'created_at'], name='report_execution_endpoint_idx')],
+            },
+        ),
+    ]
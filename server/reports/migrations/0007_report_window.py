@@ -0,0 +1,32 @@
+# Generated by Django 5.1.6 on 2026-10-17 16:16
+
+from django.db import migrations, models
+
+
+def set_shipments_window(apps, schema_editor):
+    # El SQL de envíos solo lleva un tope amplio: los 30 días exactos los aplica la ventana
+    ReportDefinition = apps.get_model('reports', 'ReportDefinition')
+    ReportDefinition.objects.filter(file_path='shipments_last_30_days.sql', window_column='').update(
+        window_column='Shipped Date', window_days=30
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0006_reportexecution'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportdefinition',
+            name='window_column',
+            field=models.CharField(blank=True, help_text='Columna de fecha del resultado para reportes de ventana móvil (ver reports/windows.py)', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='reportdefinition',
+            name='window_days',
+            field=models.PositiveIntegerField(blank=True, help_text='Días de la ventana; con cache_ttl > 0 los días cerrados se guardan en caché', null=True),
+        ),
+        migrations.RunPython(set_shipments_window, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,9 @@
 # models.py
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
 
 class ReportDefinition(models.Model):
     """
@@ -10,8 +14,134 @@ class ReportDefinition(models.Model):
     category = models.CharField(max_length=50)
     file_path = models.CharField(max_length=255, help_text="Ruta relativa al archivo SQL")
     requires_project_filter = models.BooleanField(default=True, help_text="Si el reporte debe filtrarse por proyecto")
+    parameters = models.JSONField(
+        default=list, blank=True,
+        help_text="Filtros opcionales: [{name, column, type, op}] (ver reports/parameters.py)"
+    )
+    cache_ttl = models.PositiveIntegerField(default=0, help_text="Segundos que se reutiliza un resultado (0 = sin caché)")
+    timeout_seconds = models.PositiveIntegerField(
+        null=True, blank=True, help_text="Tiempo máximo de la consulta (vacío = REPORTS_QUERY_TIMEOUT)"
+    )
+    window_column = models.CharField(
+        max_length=100, blank=True,
+        help_text="Columna de fecha del resultado para reportes de ventana móvil (ver reports/windows.py)"
+    )
+    window_days = models.PositiveIntegerField(
+        null=True, blank=True, help_text="Días de la ventana; con cache_ttl > 0 los días cerrados se guardan en caché"
+    )
+    timeout_count = models.PositiveIntegerField(default=0, editable=False)
+    last_timeout_at = models.DateTimeField(null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    def clean(self):
+        # El archivo debe existir y tener los parámetros que se le van a pasar
+        from .parameters import parameter_spec_errors
+        from .report_manager import sql_registry
+        from .windows import window_errors
+        errors = {}
+        file_errors = sql_registry.definition_errors(self.category, self.file_path, self.requires_project_filter)
+        if file_errors:
+            errors['file_path'] = file_errors
+        parameter_errors = parameter_spec_errors(self.parameters)
+        if parameter_errors:
+            errors['parameters'] = parameter_errors
+        window_problems = window_errors(self.window_column, self.window_days)
+        if window_problems:
+            errors['window_days'] = window_problems
+        if errors:
+            raise ValidationError(errors)
+
+    def get_timeout(self):
+        return self.timeout_seconds or settings.REPORTS_QUERY_TIMEOUT
+
+    def record_timeout(self):
+        """Cuenta una consulta cortada por timeout (update atómico, sin pisar otros campos)."""
+        ReportDefinition.objects.filter(pk=self.pk).update(
+            timeout_count=models.F('timeout_count') + 1, last_timeout_at=timezone.now()
+        )
+
+    def __str__(self):
+        return self.name
+
+
+class ReportJob(models.Model):
+    """
+    Ejecución en segundo plano de un reporte. Guarda el SQL y los parámetros tal como
+    se resolvieron al enviarlo; el resultado se escribe a un archivo local.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+    ACTIVE_STATUSES = (PENDING, RUNNING)
+
+    RESULT_FORMAT_CHOICES = [
+        ('ndjson', 'NDJSON'),
+        ('csv', 'CSV'),
+    ]
+
+    report = models.ForeignKey(ReportDefinition, on_delete=models.CASCADE, related_name='jobs')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='report_jobs')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    sql = models.TextField()
+    params = models.JSONField(default=list, encoder=DjangoJSONEncoder)
+    result_format = models.CharField(max_length=10, choices=RESULT_FORMAT_CHOICES, default='ndjson')
+    result_path = models.CharField(max_length=255, blank=True)
+    row_count = models.PositiveIntegerField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'status'], name='report_job_user_status_idx'),
+            models.Index(fields=['status', 'updated_at'], name='report_job_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.report.name} #{self.pk} ({self.status})"
+
+
+class ReportExecution(models.Model):
+    """
+    Una ejecución de reporte (execute/ o inventory/) con sus tiempos, para ver qué
+    reportes son lentos o pesados. Se escriben en lotes desde reports.telemetry.
+    """
+    report = models.ForeignKey(
+        ReportDefinition, on_delete=models.SET_NULL, null=True, blank=True, related_name='executions'
+    )
+    endpoint = models.CharField(max_length=20)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    project = models.ForeignKey('enterprise.Project', on_delete=models.SET_NULL, null=True, blank=True)
+    project_count = models.PositiveSmallIntegerField(default=0)
+    params_hash = models.CharField(max_length=40, blank=True)
+    sql_ms = models.FloatField(null=True, blank=True, help_text="Suma del tiempo de execute de las consultas")
+    fetch_ms = models.FloatField(null=True, blank=True, help_text="Suma del tiempo leyendo filas")
+    serialize_ms = models.FloatField(null=True, blank=True)
+    total_ms = models.FloatField()
+    row_count = models.PositiveIntegerField(null=True, blank=True)
+    response_bytes = models.PositiveBigIntegerField(null=True, blank=True)
+    cache_hit = models.BooleanField(null=True, blank=True)
+    status_code = models.PositiveSmallIntegerField()
+    error_class = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['report', 'created_at'], name='report_execution_report_idx'),
+            models.Index(fields=['endpoint', 'created_at'], name='report_execution_endpoint_idx'),
+        ]
+
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return f"{self.report or self.endpoint} {self.total_ms:.0f} ms ({self.status_code})"
\ No newline at end of file
@@ -0,0 +1,86 @@
+# reports/pagination.py
+from base64 import b64decode, b64encode
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class ReportPagination:
+    """
+    Server-side paging and sorting of report results, pushed down to SQL Server as
+    ORDER BY ... OFFSET ... FETCH NEXT. Only applied when the client sends `page_size`
+    or `cursor`, so callers that expect the full result keep working.
+
+    `sort` is a comma-separated list of result columns, `-` prefix for descending; any
+    other column is rejected. The remaining columns are appended as tie-breakers so
+    pages are stable. `count=true` adds the total row count (one extra query).
+    """
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    sort_query_param = 'sort'
+    count_query_param = 'count'
+
+    def __init__(self, request):
+        self.request = request
+        params = request.query_params
+        self.enabled = self.page_size_query_param in params or self.cursor_query_param in params
+        self.page_size = self._parse_page_size(params.get(self.page_size_query_param))
+        self.offset = self._decode_cursor(params.get(self.cursor_query_param))
+        self.sort = [name.strip() for name in params.get(self.sort_query_param, '').split(',') if name.strip()]
+        self.with_count = params.get(self.count_query_param, '').lower() in ('1', 'true', 'yes')
+
+    def _parse_page_size(self, value):
+        if value is None:
+            return settings.REPORTS_PAGE_SIZE
+        try:
+            page_size = int(value)
+        except ValueError:
+            raise ValidationError({self.page_size_query_param: 'Expected an integer.'})
+        if not 1 <= page_size <= settings.REPORTS_MAX_PAGE_SIZE:
+            raise ValidationError({
+                self.page_size_query_param: f'Expected a value between 1 and {settings.REPORTS_MAX_PAGE_SIZE}.'
+            })
+        return page_size
+
+    def _decode_cursor(self, cursor):
+        if not cursor:
+            return 0
+        try:
+            offset = int(b64decode(cursor.encode('ascii')).decode('ascii').removeprefix('o='))
+        except (TypeError, ValueError, UnicodeError):
+            raise ValidationError({self.cursor_query_param: 'Invalid cursor.'})
+        if offset < 0:
+            raise ValidationError({self.cursor_query_param: 'Invalid cursor.'})
+        return offset
+
+    @staticmethod
+    def encode_cursor(offset):
+        return b64encode(f'o={offset}'.encode('ascii')).decode('ascii')
+
+    def order_by(self, columns):
+        """(column, descending) pairs for the requested sort, validated against `columns`."""
+        order_by = []
+        for name in self.sort:
+            descending = name.startswith('-')
+            column = name[1:] if descending else name
+            if column not in columns:
+                raise ValidationError({self.sort_query_param: f"Unknown column: {column}"})
+            order_by.append((column, descending))
+        sorted_columns = {column for column, _ in order_by}
+        order_by.extend((column, False) for column in columns if column not in sorted_columns)
+        return order_by
+
+    def links(self, has_next):
+        url = self.request.build_absolute_uri()
+        next_url = replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.offset + self.page_size)) if has_next else None
+        previous_url = None
+        if self.offset:
+            previous_offset = max(self.offset - self.page_size, 0)
+            if previous_offset:
+                previous_url = replace_query_param(url, self.cursor_query_param, self.encode_cursor(previous_offset))
+            else:
+                previous_url = remove_query_param(url, self.cursor_query_param)
+                if self.page_size_query_param not in self.request.query_params:
+                    # Sin cursor ni page_size la primera página sería el resultado completo
+                    previous_url = replace_query_param(previous_url, self.page_size_query_param, self.page_size)
+        return {'next': next_url, 'previous': previous_url}
@@ -0,0 +1,150 @@
+# reports/parameters.py
+"""
+Optional, typed report parameters declared on ReportDefinition.parameters, e.g.
+
+    [
+        {"name": "warehouse", "column": "warehouse"},
+        {"name": "material", "column": "Material Code", "op": "prefix"},
+        {"name": "shipped", "column": "Shipped Date", "type": "date", "op": "range"},
+        {"name": "min_quantity", "column": "Available Quantity", "type": "number", "op": "gte"}
+    ]
+
+Each one is read from the query string (`range` uses `<name>_from` / `<name>_to`) and
+compiled into a bound condition on the report's result columns, so SQL Server filters
+before rows are sent.
+"""
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+
+
+def _parse_date(value):
+    return date.fromisoformat(value)
+
+
+def _parse_datetime(value):
+    return datetime.fromisoformat(value)
+
+
+def _parse_bool(value):
+    lowered = value.lower()
+    if lowered not in ('1', '0', 'true', 'false', 'yes', 'no'):
+        raise ValueError(value)
+    return lowered in ('1', 'true', 'yes')
+
+
+PARAMETER_TYPES = {
+    'string': str,
+    'integer': int,
+    'number': Decimal,
+    'date': _parse_date,
+    'datetime': _parse_datetime,
+    'boolean': _parse_bool,
+}
+
+COMPARISONS = {'eq': '=', 'gt': '>', 'gte': '>=', 'lt': '<', 'lte': '<='}
+OPERATORS = (*COMPARISONS, 'prefix', 'in', 'range')
+
+# Query parameters the report endpoints already use
+RESERVED_NAMES = {'format', 'stream', 'page_size', 'cursor', 'sort', 'count', 'order_type', 'projects', 'source'}
+
+
+def parameter_spec_errors(specs):
+    """Problemas de una lista de parámetros declarados (lista vacía si es válida)."""
+    if not isinstance(specs, list):
+        return ["Expected a list of parameter definitions."]
+    errors = []
+    names = set()
+    for position, spec in enumerate(specs):
+        if not isinstance(spec, dict):
+            errors.append(f"Parameter {position}: expected an object.")
+            continue
+        name, column = spec.get('name'), spec.get('column')
+        if not isinstance(name, str) or not name.isidentifier():
+            errors.append(f"Parameter {position}: 'name' must be an identifier.")
+        elif name in RESERVED_NAMES or name in names:
+            errors.append(f"Parameter {position}: name '{name}' is reserved or repeated.")
+        names.add(name)
+        if not isinstance(column, str) or not column:
+            errors.append(f"Parameter {position}: 'column' is required.")
+        if spec.get('type', 'string') not in PARAMETER_TYPES:
+            errors.append(f"Parameter {position}: unknown type '{spec.get('type')}'.")
+        if spec.get('op', 'eq') not in OPERATORS:
+            errors.append(f"Parameter {position}: unknown op '{spec.get('op')}'.")
+        if spec.get('op') == 'prefix' and spec.get('type', 'string') != 'string':
+            errors.append(f"Parameter {position}: 'prefix' only applies to strings.")
+    return errors
+
+
+def _convert(spec, param, raw):
+    type_name = spec.get('type', 'string')
+    try:
+        return PARAMETER_TYPES[type_name](raw)
+    except (ValueError, InvalidOperation):
+        raise ValidationError({param: f"Expected a value of type {type_name}."})
+
+
+def _escape_like(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_').replace('[', '\\[')
+
+
+def parse_filters(specs, query_params):
+    """
+    (columna, operador, valor) de cada parámetro presente en la petición, ya
+    convertido a su tipo. Los ausentes no filtran.
+    """
+    filters = []
+    for spec in specs:
+        name, column, op = spec['name'], spec['column'], spec.get('op', 'eq')
+        if op == 'range':
+            for suffix, comparison in (('from', 'gte'), ('to', 'lte')):
+                param = f"{name}_{suffix}"
+                raw = query_params.get(param)
+                if raw not in (None, ''):
+                    filters.append((column, comparison, _convert(spec, param, raw)))
+            continue
+        raw = query_params.get(name)
+        if raw in (None, ''):
+            continue
+        if op == 'in':
+            values = [_convert(spec, name, item.strip()) for item in raw.split(',') if item.strip()]
+            filters.append((column, op, values))
+        else:
+            filters.append((column, op, _convert(spec, name, raw)))
+    return filters
+
+
+def compile_filters(filters, quote):
+    """Fragmento WHERE (sin la palabra WHERE) y sus parámetros, en el mismo orden."""
+    conditions, params = [], []
+    for column, op, value in filters:
+        column = quote(column)
+        if op == 'prefix':
+            conditions.append(f"{column} LIKE ? ESCAPE '\\'")
+            params.append(_escape_like(value) + '%')
+        elif op == 'in':
+            if not value:
+                conditions.append('1 = 0')
+                continue
+            conditions.append(f"{column} IN ({', '.join(['?'] * len(value))})")
+            params.extend(value)
+        else:
+            conditions.append(f"{column} {COMPARISONS[op]} ?")
+            params.append(value)
+    return ' AND '.join(conditions), params
+
+
+# Equivalente en el ORM, sin distinguir mayúsculas como la intercalación de SQL Server
+ORM_LOOKUPS = {'eq': 'exact', 'gt': 'gt', 'gte': 'gte', 'lt': 'lt', 'lte': 'lte', 'prefix': 'istartswith', 'in': 'in'}
+
+
+def filter_q(filters, fields):
+    """Los mismos filtros como Q sobre un modelo; `fields` mapea columna -> campo."""
+    q = Q()
+    for column, op, value in filters:
+        lookup = ORM_LOOKUPS[op]
+        if lookup == 'exact' and isinstance(value, str):
+            lookup = 'iexact'
+        q &= Q(**{f"{fields[column]}__{lookup}": value})
+    return q
@@ -0,0 +1,173 @@
+# reports/pool.py
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class PoolTimeout(Exception):
+    """No connection became available within the checkout timeout."""
+
+
+class ConnectionPool:
+    """
+    Per-process pool of DB-API connections.
+
+    Connections are created on demand up to `max_size`, reused LIFO and closed after
+    `idle_timeout` seconds unused. A connection idle for longer than
+    `health_check_interval` is checked with `health_check` before it is handed out.
+    Always check out with the `connection()` context manager so it is returned even
+    when the caller raises.
+    """
+
+    def __init__(self, connect, max_size=10, idle_timeout=300, checkout_timeout=30,
+                 health_check_interval=30, health_check=None):
+        self._connect = connect
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.health_check_interval = health_check_interval
+        self._health_check = health_check or self._select_one
+        self._idle = deque()  # (connection, returned_at)
+        self._cond = threading.Condition()
+        self._size = 0
+        self._in_use = 0
+        self._counters = {'created': 0, 'closed': 0, 'checkouts': 0, 'waits': 0, 'timeouts': 0, 'failed_checks': 0}
+
+    @staticmethod
+    def _select_one(conn):
+        cursor = conn.cursor()
+        try:
+            cursor.execute('SELECT 1')
+            cursor.fetchall()
+        finally:
+            cursor.close()
+
+    @contextmanager
+    def connection(self):
+        conn = self._acquire()
+        discard = False
+        try:
+            yield conn
+        except BaseException:
+            # Leave no open transaction behind; a connection that cannot roll back is dropped
+            discard = not self._reset(conn)
+            raise
+        finally:
+            self._release(conn, discard)
+
+    def _acquire(self):
+        deadline = time.monotonic() + self.checkout_timeout
+        while True:
+            conn, idle_for = self._reserve(deadline)
+            if conn is None:
+                return self._open()
+            if idle_for < self.health_check_interval or self._is_healthy(conn):
+                return conn
+            # Broken connection: drop it and try again
+            self._close(conn)
+            with self._cond:
+                self._size -= 1
+                self._in_use -= 1
+                self._cond.notify()
+
+    def _reserve(self, deadline):
+        """Takes an idle connection, or a slot for a new one (returned as None)."""
+        with self._cond:
+            waited = False
+            while True:
+                self._prune_idle()
+                if self._idle:
+                    conn, returned_at = self._idle.pop()
+                    self._in_use += 1
+                    self._counters['checkouts'] += 1
+                    return conn, time.monotonic() - returned_at
+                if self._size < self.max_size:
+                    self._size += 1
+                    self._in_use += 1
+                    self._counters['checkouts'] += 1
+                    return None, 0
+                if not waited:
+                    self._counters['waits'] += 1
+                    waited = True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._cond.wait(remaining):
+                    self._counters['timeouts'] += 1
+                    raise PoolTimeout(f"No connection available after {self.checkout_timeout}s")
+
+    def _open(self):
+        try:
+            conn = self._connect()
+        except BaseException:
+            with self._cond:
+                self._size -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._counters['created'] += 1
+        return conn
+
+    def _is_healthy(self, conn):
+        try:
+            self._health_check(conn)
+            return True
+        except Exception:
+            with self._cond:
+                self._counters['failed_checks'] += 1
+            return False
+
+    @staticmethod
+    def _reset(conn):
+        try:
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _release(self, conn, discard=False):
+        if discard:
+            self._close(conn)
+        with self._cond:
+            self._in_use -= 1
+            if discard:
+                self._size -= 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def _prune_idle(self):
+        """Closes connections idle longer than idle_timeout. Called with the lock held."""
+        now = time.monotonic()
+        # Oldest connections are at the left of the deque
+        while self._idle and now - self._idle[0][1] > self.idle_timeout:
+            conn, _ = self._idle.popleft()
+            self._size -= 1
+            self._close(conn)
+
+    def _close(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:  # reentrant, may already be held
+            self._counters['closed'] += 1
+
+    def close_all(self):
+        """Closes the idle connections; connections in use go back to the pool when returned."""
+        with self._cond:
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._size -= 1
+                self._close(conn)
+
+    def stats(self):
+        with self._cond:
+            self._prune_idle()
+            return {
+                'max_size': self.max_size,
+                'size': self._size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                **self._counters,
+            }
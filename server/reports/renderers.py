@@ -0,0 +1,45 @@
+# reports/renderers.py
+from decimal import Decimal
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import msgpack
+except ImportError:  # opcional: sin msgpack solo se ofrece ?format=columnar
+    msgpack = None
+
+# Formatos que devuelven las filas como listas en lugar de diccionarios
+COLUMNAR_FORMATS = ('columnar', 'msgpack')
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    """JSON with `columns` once and `rows` as arrays, selected with ?format=columnar."""
+    format = 'columnar'
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Binary columnar payload for large pulls, selected with ?format=msgpack."""
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    @staticmethod
+    def _default(value):
+        if isinstance(value, Decimal):
+            return float(value)  # igual que la respuesta JSON
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        return str(value)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=self._default, use_bin_type=True)
+
+
+def columnar_renderers():
+    """Renderers added to the defaults on the report endpoints."""
+    renderers = [ColumnarJSONRenderer]
+    if msgpack is not None:
+        renderers.append(MessagePackRenderer)
+    return renderers
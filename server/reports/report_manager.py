@@ -1,49 +1,388 @@
 # reports/report_manager.py
 import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from django.conf import settings
+from .backends import report_backend
+
+SQL_BASE_DIR = os.path.join(settings.BASE_DIR, 'reports', 'sql')
+# Versiones de un archivo para otro dialecto: reports/sql/dialects/<dialect>/<categoria>/<archivo>
+DIALECTS_DIR = 'dialects'
+
+
+def mask_sql(sql):
+    """
+    Copia del SQL del mismo largo con comentarios (espacios), literales e identificadores
+    entre comillas ('#') enmascarados, para buscar `?`, paréntesis o palabras clave.
+    """
+    masked = list(sql)
+    i, n = 0, len(sql)
+    while i < n:
+        char = sql[i]
+        if sql.startswith('--', i):
+            end = sql.find('\n', i)
+            end = n if end == -1 else end
+        elif sql.startswith('/*', i):
+            end = sql.find('*/', i + 2)
+            end = n if end == -1 else end + 2
+        elif char in ("'", '"', '['):
+            closing = ']' if char == '[' else char
+            end = i + 1
+            while end < n:
+                if sql[end] == closing:
+                    # '' dentro de un literal es una comilla escapada
+                    if end + 1 < n and sql[end + 1] == closing and closing != ']':
+                        end += 2
+                        continue
+                    break
+                end += 1
+            end = min(end + 1, n)
+        else:
+            i += 1
+            continue
+        # Comentarios como espacios; literales como '#' para no confundirlos con el final
+        masked[i:end] = (' ' if char in '-/' else '#') * (end - i)
+        i = end
+    return ''.join(masked)
+
+
+def count_placeholders(sql):
+    """Cuenta los parámetros `?` fuera de comentarios, literales e identificadores entre comillas."""
+    return mask_sql(sql).count('?')
+
+
+_ORDER_BY = re.compile(r'\bORDER\s+BY\b', re.IGNORECASE)
+
+
+def strip_trailing_order_by(sql):
+    """
+    Quita el ';' final y el ORDER BY del nivel superior, que SQL Server no admite
+    dentro de una tabla derivada. Los ORDER BY dentro de paréntesis se conservan.
+    """
+    masked = mask_sql(sql)
+    end = len(masked.rstrip())
+    if end and masked[end - 1] == ';':
+        end -= 1
+    for match in reversed(list(_ORDER_BY.finditer(masked, 0, end))):
+        start = match.start()
+        if masked.count('(', 0, start) == masked.count(')', 0, start):
+            end = start
+            break
+    return sql[:end].rstrip()
+
+
+def quote_identifier(name):
+    """Nombre de columna entre corchetes (T-SQL), escapando ']'."""
+    return '[' + name.replace(']', ']]') + ']'
+
+
+def wrap_sql(sql):
+    # Saltos de línea para que un comentario '--' al final no se coma el paréntesis
+    return f"SELECT * FROM (\n{strip_trailing_order_by(sql)}\n) AS r"
+
+
+def filter_sql(sql, where):
+    """Aplica condiciones sobre las columnas del resultado (SQL Server las empuja a la consulta interna)."""
+    return f"{wrap_sql(sql)}\nWHERE {where}"
+
+
+def union_sql(sql, count, column):
+    """
+    La consulta repetida para `count` proyectos en un solo UNION ALL, con el proyecto
+    como primera columna. Cada rama recibe [proyecto, proyecto, *resto de parámetros].
+    """
+    branch = f"SELECT ? AS {quote_identifier(column)}, r.* FROM (\n{strip_trailing_order_by(sql)}\n) AS r"
+    return '\nUNION ALL\n'.join([branch] * count)
+
+
+def describe_sql(sql):
+    """Consulta que no devuelve filas pero sí cursor.description."""
+    return f"{wrap_sql(sql)}\nWHERE 1 = 0"
+
+
+def count_sql(sql):
+    return f"SELECT COUNT(*) FROM (\n{strip_trailing_order_by(sql)}\n) AS r"
+
+
+def page_sql(sql, order_by, limit_clause='OFFSET ? ROWS FETCH NEXT ? ROWS ONLY'):
+    """
+    Una página del resultado: `order_by` es una lista de (columna, descendente) ya
+    validada; los dos últimos parámetros son los de `limit_clause` (ver
+    ReportBackend.page_params).
+    """
+    ordering = ', '.join(f"{quote_identifier(column)} {'DESC' if desc else 'ASC'}" for column, desc in order_by)
+    return f"{wrap_sql(sql)}\nORDER BY {ordering}\n{limit_clause}"
+
+
+@dataclass(frozen=True)
+class SQLFile:
+    key: str
+    path: str
+    sql: str
+    placeholders: int
+    mtime: float
+
+
+class SQLRegistry:
+    """
+    Todos los archivos .sql bajo reports/sql/, leídos una vez al arrancar y
+    guardados por 'categoria/ruta'. Con auto_reload (DEBUG) se vuelve a leer un
+    archivo cuando cambia su mtime; en producción las consultas no tocan el disco.
+    Con `dialect`, un archivo en dialects/<dialect>/ reemplaza al de la misma ruta.
+    """
+
+    def __init__(self, base_dir, auto_reload=False, dialect=None):
+        self.base_dir = os.path.realpath(base_dir)
+        self.auto_reload = auto_reload
+        self.dialect = dialect
+        self._files = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(category, file_path):
+        return f"{category}/{file_path}".replace('\\', '/')
+
+    def _read(self, key):
+        path = os.path.realpath(os.path.join(self.base_dir, key))
+        if os.path.commonpath([path, self.base_dir]) != self.base_dir:
+            raise ValueError(f"SQL file outside of {self.base_dir}: {key}")
+        mtime = os.path.getmtime(path)
+        with open(path, 'r', encoding='utf-8') as sql_file:
+            sql = sql_file.read()
+        return SQLFile(key, path, sql, count_placeholders(sql), mtime)
+
+    def load_all(self):
+        """Lee todos los archivos; un archivo ilegible hace fallar el arranque."""
+        files = {}
+        for root, _dirs, names in os.walk(self.base_dir):
+            for name in sorted(names):
+                if name.endswith('.sql'):
+                    key = os.path.relpath(os.path.join(root, name), self.base_dir).replace(os.sep, '/')
+                    files[key] = self._read(key)
+        with self._lock:
+            self._files = files
+        return files
+
+    def get(self, category, file_path):
+        key = self.make_key(category, file_path)
+        if self.dialect:
+            sql_file = self._get(f"{DIALECTS_DIR}/{self.dialect}/{key}")
+            if sql_file is not None:
+                return sql_file
+        sql_file = self._get(key)
+        if sql_file is None:
+            raise ValueError(f"SQL file not found: {os.path.join(self.base_dir, key)}")
+        return sql_file
+
+    def _get(self, key):
+        sql_file = self._files.get(key)
+        if self.auto_reload:
+            sql_file = self._reload(key, sql_file)
+        return sql_file
+
+    def _reload(self, key, sql_file):
+        path = sql_file.path if sql_file else os.path.join(self.base_dir, key)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            with self._lock:
+                self._files.pop(key, None)
+            return None
+        if sql_file is None or mtime != sql_file.mtime:
+            sql_file = self._read(key)
+            with self._lock:
+                self._files[key] = sql_file
+        return sql_file
+
+    def definition_errors(self, category, file_path, requires_project_filter):
+        """Problemas de un ReportDefinition frente a su archivo SQL (lista vacía si es válido)."""
+        try:
+            sql_file = self.get(category, file_path)
+        except ValueError as e:
+            return [str(e)]
+        expected = 1 if requires_project_filter else 0
+        if sql_file.placeholders != expected:
+            return [
+                f"{sql_file.key} has {sql_file.placeholders} '?' placeholder(s) but "
+                f"requires_project_filter={requires_project_filter} binds {expected}"
+            ]
+        return []
+
+
+# Registro compartido por todas las peticiones del proceso; se carga en ReportsConfig.ready()
+sql_registry = SQLRegistry(SQL_BASE_DIR, auto_reload=settings.DEBUG, dialect=report_backend.dialect)
+
+
+class DescribedColumns:
+    """
+    Columnas de cada consulta (por texto SQL), para validar ?sort sin ejecutarla completa.
+    LRU acotado y protegido con un lock: cada combinación de filtros, orden y parámetros
+    genera un texto SQL distinto.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._columns = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, sql):
+        with self._lock:
+            columns = self._columns.get(sql)
+            if columns is not None:
+                self._columns.move_to_end(sql)
+            return columns
+
+    def set(self, sql, columns):
+        with self._lock:
+            self._columns[sql] = columns
+            self._columns.move_to_end(sql)
+            while len(self._columns) > self.maxsize:
+                self._columns.popitem(last=False)
+
+
+_described_columns = DescribedColumns()
+
 
 class SQLReportManager:
-    def __init__(self):
+    def __init__(self, registry=None, backend=None):
+        self.registry = registry or sql_registry
+        self.backend = backend or report_backend
         # Directorio base para los archivos SQL
-        self.sql_base_dir = os.path.join(settings.BASE_DIR, 'reports', 'sql')
+        self.sql_base_dir = self.registry.base_dir
     
     def get_sql_path(self, category, file_path):
         """Obtiene la ruta completa al archivo SQL"""
         return os.path.join(self.sql_base_dir, category, file_path)
     
     def load_sql(self, category, file_path):
-        """Carga el contenido SQL desde un archivo"""
-        full_path = self.get_sql_path(category, file_path)
-        try:
-            with open(full_path, 'r') as sql_file:
-                return sql_file.read()
-        except FileNotFoundError:
-            raise ValueError(f"SQL file not found: {full_path}")
+        """Devuelve el SQL ya cargado en memoria (ValueError si el archivo no existe)"""
+        return self.registry.get(category, file_path).sql
     
-    def execute_sql_report(self, connection, category, file_path, params=None):
+    def _execute(self, connection, sql, params, timeout):
+        """Abre un cursor y ejecuta con el timeout del backend; traduce timeout/cancelación a QueryTimeout."""
+        self.backend.set_timeout(connection, timeout)
+        cursor = connection.cursor()
+        try:
+            if params:
+                cursor.execute(sql, params)
+            else:
+                cursor.execute(sql)
+        except Exception as e:
+            cursor.close()
+            query_timeout = self.backend.query_timeout(e, timeout)
+            if query_timeout is not None:
+                raise query_timeout from e
+            raise
+        return cursor
+
+    def execute_sql(self, connection, sql, params=None, timeout=None, stats=None):
+        """
+        Ejecuta una consulta y devuelve (columnas, filas como listas) con los valores
+        ya convertidos para serialización. `stats` (ExecutionStats) recibe los tiempos.
+        """
+        started = time.perf_counter()
+        cursor = self._execute(connection, sql, params, timeout)
+        executed = time.perf_counter()
+        try:
+            columns = [column[0] for column in cursor.description]
+            convert = row_converter(cursor.description)
+            rows = [convert(row) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+        if stats is not None:
+            stats.add_query(executed - started, time.perf_counter() - executed, len(rows))
+        return columns, rows
+
+    def describe(self, connection, sql, params=None, timeout=None):
+        """
+        Nombres de columna del resultado; se consulta la base una sola vez por texto SQL.
+        `connection` es una función que devuelve el context manager de la conexión.
+        """
+        columns = _described_columns.get(sql)
+        if columns is None:
+            with connection() as conn:
+                columns, _ = self.execute_sql(conn, describe_sql(sql), params, timeout)
+            _described_columns.set(sql, columns)
+        return columns
+
+    def execute_sql_report(self, connection, category, file_path, params=None, timeout=None):
         """Ejecuta un reporte SQL desde un archivo con parámetros opcionales"""
         sql = self.load_sql(category, file_path)
-        cursor = connection.cursor()
-        
-        if params:
-            cursor.execute(sql, params)
+        columns, rows = self.execute_sql(connection, sql, params, timeout)
+        return columns, rows_to_dicts(columns, rows)
+
+    def stream_sql(self, connection, sql, params=None, chunk_size=1000, timeout=None, stats=None):
+        """
+        Generador: primero devuelve la lista de columnas y luego bloques de filas
+        leídos con fetchmany, para no cargar todo el resultado en memoria.
+        Si se abandona antes de terminar (el cliente cortó), cancela la consulta.
+        """
+        started = time.perf_counter()
+        cursor = self._execute(connection, sql, params, timeout)
+        if stats is not None:
+            stats.add_query(sql_seconds=time.perf_counter() - started)
+        try:
+            yield [column[0] for column in cursor.description]
+            convert = row_converter(cursor.description)
+            while True:
+                started = time.perf_counter()
+                rows = cursor.fetchmany(chunk_size)
+                if stats is not None:
+                    stats.add_query(fetch_seconds=time.perf_counter() - started, rows=len(rows))
+                if not rows:
+                    break
+                yield [convert(row) for row in rows]
+        except GeneratorExit:
+            if hasattr(cursor, 'cancel'):
+                cursor.cancel()
+            raise
+        finally:
+            cursor.close()
+
+
+def _isoformat(value):
+    return None if value is None else value.isoformat()
+
+
+def _infer(value):
+    # El driver no informó el tipo de la columna (p.ej. sqlite): se decide por valor
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+def column_converters(description):
+    """
+    Un conversor por columna a partir de cursor.description, calculado una sola vez
+    por consulta. None significa que el valor se deja tal cual.
+    """
+    converters = []
+    for column in description:
+        type_code = column[1]
+        if not isinstance(type_code, type):
+            converters.append(_infer)
+        elif hasattr(type_code, 'isoformat'):  # date, datetime, time
+            converters.append(_isoformat)
         else:
-            cursor.execute(sql)
-        
-        # Obtener nombres de columnas
-        columns = [column[0] for column in cursor.description]
-        
-        # Convertir resultados a lista de diccionarios
-        results = []
-        for row in cursor.fetchall():
-            # Convertir valores de fecha a string para serialización JSON
-            row_dict = {}
-            for i, value in enumerate(row):
-                if hasattr(value, 'isoformat'):  # Si es una fecha/hora
-                    row_dict[columns[i]] = value.isoformat()
-                else:
-                    row_dict[columns[i]] = value
-            results.append(row_dict)
-        
-        cursor.close()
-        return columns, results
\ No newline at end of file
+            converters.append(None)
+    return converters
+
+
+def row_converter(description):
+    """Devuelve una función fila -> lista que aplica solo los conversores necesarios."""
+    converters = [(i, f) for i, f in enumerate(column_converters(description)) if f is not None]
+    if not converters:
+        return list
+
+    def convert(row):
+        values = list(row)
+        for i, f in converters:
+            values[i] = f(values[i])
+        return values
+    return convert
+
+
+def rows_to_dicts(columns, rows):
+    """Formato clásico de la API: una lista de diccionarios columna -> valor."""
+    return [dict(zip(columns, row)) for row in rows]
@@ -1,9 +1,58 @@
 # serializers.py
+from django.urls import reverse
 from rest_framework import serializers
-from .models import ReportDefinition
+from .models import ReportDefinition, ReportJob
 
 class ReportDefinitionSerializer(serializers.ModelSerializer):
     class Meta:
         model = ReportDefinition
         fields = ['id', 'name', 'description', 'category', 'file_path', 
-                 'requires_project_filter', 'created_at', 'updated_at']
\ No newline at end of file
+                 'requires_project_filter', 'parameters', 'cache_ttl', 'window_column', 'window_days',
+                 'timeout_seconds', 'timeout_count',
+                 'created_at', 'updated_at']
+        read_only_fields = ['timeout_count']
+
+    def validate_parameters(self, value):
+        from .parameters import parameter_spec_errors
+        errors = parameter_spec_errors(value)
+        if errors:
+            raise serializers.ValidationError(errors)
+        return value
+
+    def validate(self, attrs):
+        # Mismas reglas que ReportDefinition.clean() (archivo cargado, parámetros y ventana)
+        from .report_manager import sql_registry
+        from .windows import window_errors
+        instance = self.instance
+        category = attrs.get('category', getattr(instance, 'category', None))
+        file_path = attrs.get('file_path', getattr(instance, 'file_path', None))
+        requires_project_filter = attrs.get(
+            'requires_project_filter', getattr(instance, 'requires_project_filter', True)
+        )
+        errors = sql_registry.definition_errors(category, file_path, requires_project_filter)
+        if errors:
+            raise serializers.ValidationError({'file_path': errors})
+        window_column = attrs.get('window_column', getattr(instance, 'window_column', ''))
+        window_days = attrs.get('window_days', getattr(instance, 'window_days', None))
+        errors = window_errors(window_column, window_days)
+        if errors:
+            raise serializers.ValidationError({'window_days': errors})
+        return attrs
+
+
+class ReportJobSerializer(serializers.ModelSerializer):
+    report_name = serializers.CharField(source='report.name', read_only=True)
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReportJob
+        fields = ['id', 'report', 'report_name', 'status', 'result_format', 'row_count', 'error',
+                  'download_url', 'created_at', 'started_at', 'finished_at']
+        read_only_fields = fields
+
+    def get_download_url(self, obj):
+        if obj.status != ReportJob.DONE:
+            return None
+        url = reverse('report-job-download', kwargs={'pk': obj.pk})
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
@@ -0,0 +1,33 @@
+-- reports/sql/inventory/inventory_by_project.sql
+-- Inventario disponible del proyecto (endpoint reports/inventory/)
+-- Parámetros: lookup_code del proyecto
+-- Filtros opcionales (outbound, warehouse, material, lot, min_quantity): INVENTORY_PARAMETERS en views.py
+
+SELECT
+    I.projectLookupCode AS 'Project Lookup Code',
+    I.materialName AS 'Material Code',
+    I.materialDescription AS 'Material Name',
+    I.lotLookupCode AS Lot,
+    I.licensePlateLookupCode AS 'License Plate',
+    I.activeAmount AS 'Available Quantity',
+    imu.name AS UOM,
+    I.warehouseName AS warehouse
+FROM
+    datex_footprint.InventoryDetailedView AS I
+INNER JOIN
+    datex_footprint_reporting.MaterialsPackagingsLookupView AS mpl
+        ON I.materialId = mpl.materialId AND mpl.isBasePackaging = 1
+INNER JOIN
+    datex_footprint_reporting.InventoryMeasurementUnitsView AS imu
+        ON mpl.packagingId = imu.id
+INNER JOIN
+    datex_footprint.LicensePlates AS LP
+        ON I.licensePlateLookupCode = LP.lookupCode
+WHERE
+  I.projectLookupCode = ?
+  AND I.lotLookupCode NOT LIKE 'test%'
+  AND I.materialStatusId = 1
+  AND I.lotStatusId = 1
+  AND I.locationStatusId = 1
+  AND I.licensePlateStatusId = 1
+  AND LP.archived = 0
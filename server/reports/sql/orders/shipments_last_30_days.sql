@@ -2,6 +2,9 @@
 -- Reporte: Envíos de los últimos 30 días
 -- Descripción: Muestra los envíos realizados en los últimos 30 días
 -- Parámetros: lookup_code del proyecto (filtro obligatorio)
+-- Ventana: window_column = 'Shipped Date', window_days = 30 en el ReportDefinition;
+-- reports/windows.py añade el mismo rango por días para cachear los días cerrados y
+-- recorta el día más antiguo a ahora - 30 días, como el filtro del WHERE
 
 SELECT 
     s.id AS 'Shipment ID',
@@ -42,9 +45,9 @@ FROM
     OUTER APPLY woodfield_reporting.ePortal_PackingSlipLines_Function(s.id) sl
 WHERE
     p.lookupCode = ?  -- Filtro por proyecto (parámetro obligatorio)
-    AND s.shippedDate >= DATEADD(day, -30, GETDATE())  -- Últimos 30 días
     AND s.statusId = 8  -- Solo envíos completados
     AND s.typeId = 2  -- Solo envíos de salida
     AND ISNULL(s.trackingIdentifier, '') <> N'VOID'  -- Excluir envíos anulados
+    AND s.shippedDate >= DATEADD(day, -30, GETDATE())  -- Últimos 30 días
 ORDER BY
     s.shippedDate DESC;
\ No newline at end of file
@@ -0,0 +1,63 @@
+# reports/streaming.py
+import csv
+import io
+import json
+from django.http import StreamingHttpResponse
+
+STREAM_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def _json_default(value):
+    # Las fechas ya llegan convertidas por report_manager.row_converter
+    return str(value)  # Decimal, UUID, bytes...
+
+
+def encode_ndjson(columns, chunks):
+    """One JSON object per line, one string per fetched chunk."""
+    for rows in chunks:
+        yield ''.join(json.dumps(dict(zip(columns, row)), default=_json_default) + '\n' for row in rows)
+
+
+def encode_csv(columns, chunks):
+    """CSV with a header row, one string per fetched chunk."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in chunks:
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def chunked(rows, size):
+    """Groups an iterable of rows into lists of `size`, like fetchmany()."""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+ENCODERS = {
+    'ndjson': encode_ndjson,
+    'csv': encode_csv,
+}
+
+
+def streaming_response(stream_format, columns, chunks, filename):
+    """Builds a StreamingHttpResponse that encodes the chunks as they are fetched."""
+    response = StreamingHttpResponse(
+        ENCODERS[stream_format](columns, chunks),
+        content_type=STREAM_FORMATS[stream_format],
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{stream_format}"'
+    return response
@@ -0,0 +1,122 @@
+# reports/telemetry.py
+import atexit
+import logging
+import threading
+import time
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionStats:
+    """
+    Medidas de una ejecución de reporte. Las consultas (también las de los hilos por
+    proyecto) suman su tiempo de SQL y de fetch; la vista completa el resto.
+    """
+
+    def __init__(self, endpoint, report=None):
+        self.endpoint = endpoint
+        self.report = report
+        self.projects = None
+        self.params_hash = ''
+        self.sql_seconds = 0.0
+        self.fetch_seconds = 0.0
+        self.rows_fetched = 0
+        self.row_count = None
+        self.cache_hit = None
+        self.error_class = ''
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add_query(self, sql_seconds=0.0, fetch_seconds=0.0, rows=0):
+        with self._lock:
+            self.sql_seconds += sql_seconds
+            self.fetch_seconds += fetch_seconds
+            self.rows_fetched += rows
+
+    def to_fields(self, user, status_code, serialize_seconds=None, response_bytes=None):
+        def ms(seconds):
+            return None if seconds is None else round(seconds * 1000, 3)
+        projects = self.projects or []
+        return {
+            'report': self.report,
+            'endpoint': self.endpoint,
+            'user': user if user and user.is_authenticated else None,
+            'project': projects[0] if projects else None,
+            'project_count': len(projects),
+            'params_hash': self.params_hash,
+            'sql_ms': ms(self.sql_seconds),
+            'fetch_ms': ms(self.fetch_seconds),
+            'serialize_ms': ms(serialize_seconds),
+            'total_ms': ms(time.perf_counter() - self.started),
+            'row_count': self.row_count if self.row_count is not None else self.rows_fetched,
+            'response_bytes': response_bytes,
+            'cache_hit': self.cache_hit,
+            'status_code': status_code,
+            'error_class': self.error_class,
+        }
+
+
+class TelemetryBuffer:
+    """
+    Guarda ReportExecution en memoria y los escribe con bulk_create desde un hilo de
+    fondo, cada `flush_interval` segundos o al llegar a `batch_size`, para no sumar
+    una escritura a cada petición. Lo pendiente se escribe al salir del proceso.
+    """
+
+    def __init__(self, batch_size=100, flush_interval=10, enabled=True):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enabled = enabled
+        self._pending = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def record(self, **fields):
+        if not self.enabled:
+            return
+        fields.setdefault('created_at', timezone.now())
+        with self._lock:
+            self._pending.append(fields)
+            full = len(self._pending) >= self.batch_size
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='report-telemetry', daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+        if full:
+            self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+            close_old_connections()
+
+    def flush(self):
+        """Writes the buffered executions; returns how many were written."""
+        from .models import ReportExecution
+
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return 0
+        try:
+            ReportExecution.objects.bulk_create(
+                [ReportExecution(**fields) for fields in pending], batch_size=self.batch_size
+            )
+        except DatabaseError as exc:
+            # La telemetría nunca debe tumbar los reportes: se descarta el lote
+            logger.warning("Dropped %s report execution record(s): %s", len(pending), exc)
+            return 0
+        return len(pending)
+
+
+telemetry = TelemetryBuffer(
+    batch_size=settings.REPORTS_TELEMETRY['BATCH_SIZE'],
+    flush_interval=settings.REPORTS_TELEMETRY['FLUSH_INTERVAL'],
+    enabled=settings.REPORTS_TELEMETRY['ENABLED'],
+)
@@ -1,17 +1,61 @@
 # views.py
-import pyodbc
+import hashlib
+import logging
+import os
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import connections
+from django.http import FileResponse
+from django.utils.http import urlencode
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, PermissionDenied, ValidationError
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
-from .models import ReportDefinition
-from .serializers import ReportDefinitionSerializer
-from .report_manager import SQLReportManager
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.settings import api_settings
+from inventory.grouping import group_inventory
+from inventory.sync import latest_snapshots, snapshot_inventory
+from .backends import QueryTimeout, report_backend
+from .models import ReportDefinition, ReportJob
+from .serializers import ReportDefinitionSerializer, ReportJobSerializer
+from .report_manager import (
+    SQLReportManager, count_sql, filter_sql, page_sql, quote_identifier, rows_to_dicts, union_sql
+)
+from .parameters import compile_filters, parse_filters
+from .pagination import ReportPagination
+from .renderers import COLUMNAR_FORMATS, columnar_renderers
+from .cache import ResultPending, report_cache_key, result_cache
+from .jobs import JobLimitExceeded, job_runner
+from .telemetry import ExecutionStats, telemetry
+from .windows import ReportWindow
+from .pool import ConnectionPool
+from .streaming import STREAM_FORMATS, chunked, streaming_response
 
-# Configuración de conexión a SQL Server
-SQL_SERVER = 'WD02'
-SQL_DATABASE = 'FootPrint'
-SQL_DRIVER = 'ODBC Driver 17 for SQL Server'
+logger = logging.getLogger(__name__)
+
+# Pool de conexiones por proceso, compartido por todas las peticiones
+report_pool = ConnectionPool(
+    report_backend.connect,
+    max_size=settings.REPORTS_POOL['MAX_SIZE'],
+    idle_timeout=settings.REPORTS_POOL['IDLE_TIMEOUT'],
+    checkout_timeout=settings.REPORTS_POOL['CHECKOUT_TIMEOUT'],
+    health_check_interval=settings.REPORTS_POOL['HEALTH_CHECK_INTERVAL'],
+)
+
+# Consultas por proyecto en paralelo; cada una toma su propia conexión del pool
+project_executor = ThreadPoolExecutor(
+    max_workers=settings.REPORTS_PROJECT_WORKERS, thread_name_prefix='report-project'
+)
+
+# Filtros opcionales del endpoint de inventario (mismo formato que ReportDefinition.parameters)
+INVENTORY_PARAMETERS = [
+    {'name': 'warehouse', 'column': 'warehouse'},
+    {'name': 'material', 'column': 'Material Code', 'op': 'prefix'},
+    {'name': 'lot', 'column': 'Lot'},
+    {'name': 'min_quantity', 'column': 'Available Quantity', 'type': 'number', 'op': 'gte'},
+]
 
 class ReportViewSet(viewsets.ModelViewSet):
     """
@@ -20,172 +64,532 @@ class ReportViewSet(viewsets.ModelViewSet):
     queryset = ReportDefinition.objects.all()
     serializer_class = ReportDefinitionSerializer
     permission_classes = [IsAuthenticated]
+    # ?format=columnar (y ?format=msgpack si está instalado) además de los renderers por defecto
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, *columnar_renderers()]
+    # Tiempo máximo de las consultas de esta petición (None = REPORTS_QUERY_TIMEOUT)
+    query_timeout = None
+    # Medidas de la ejecución en curso (execute/ e inventory/), ver reports.telemetry
+    execution = None
+    # Ventana por días del reporte en curso, si la declara (ver reports.windows)
+    window = None
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.report_manager = SQLReportManager()
 
-    def get_sql_connection(self):
+    def sql_connection(self):
+        """
+        Toma una conexión del pool; usar con `with` para que siempre se devuelva
+        """
+        return report_pool.connection()
+
+    def get_stream_format(self, request):
+        """
+        Formato de streaming pedido con ?stream=ndjson|csv, o None para la respuesta JSON normal
+        """
+        stream_format = request.query_params.get('stream')
+        if stream_format and stream_format not in STREAM_FORMATS:
+            raise ValidationError({'stream': f"Unsupported stream format: {stream_format}"})
+        return stream_format
+
+    def _stream_rows(self, sql, params):
+        # El generador es dueño de la conexión: se devuelve al pool al terminar o si el cliente corta
+        with self.sql_connection() as conn:
+            yield from self.report_manager.stream_sql(
+                conn, sql, params, chunk_size=settings.REPORTS_STREAM_CHUNK_SIZE,
+                timeout=self.get_query_timeout(), stats=self.execution
+            )
+
+    def stream_report(self, sql, params, stream_format, filename):
+        """
+        Devuelve el resultado como StreamingHttpResponse leyendo con fetchmany por bloques
+        """
+        chunks = self._stream_rows(sql, params)
+        # Ejecuta la consulta ya, para que los errores se devuelvan como respuesta normal
+        columns = next(chunks)
+        return streaming_response(stream_format, columns, chunks, filename)
+
+    def start_execution(self, request, endpoint, report=None):
+        """Empieza a medir esta ejecución; se registra en finalize_response()."""
+        self.execution = ExecutionStats(endpoint, report)
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        self.execution.params_hash = hashlib.sha1(query.encode()).hexdigest()
+
+    def handle_exception(self, exc):
+        if self.execution is not None:
+            self.execution.error_class = type(exc).__name__
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.execution is not None:
+            self.record_execution(request, response)
+        return response
+
+    def record_execution(self, request, response):
+        """
+        Encola el ReportExecution de esta petición. La respuesta JSON se renderiza aquí
+        para medir la serialización; en streaming se registra al terminar de enviarse.
+        """
+        execution, user = self.execution, request.user
+        if response.streaming:
+            def counted(content):
+                sent = 0
+                try:
+                    for chunk in content:
+                        sent += len(chunk)
+                        yield chunk
+                finally:
+                    telemetry.record(**execution.to_fields(user, response.status_code, response_bytes=sent))
+            response.streaming_content = counted(response.streaming_content)
+            return
+        started = time.perf_counter()
+        response.render()
+        telemetry.record(**execution.to_fields(
+            user, response.status_code,
+            serialize_seconds=time.perf_counter() - started, response_bytes=len(response.content)
+        ))
+
+    def get_query_timeout(self):
+        return self.query_timeout or settings.REPORTS_QUERY_TIMEOUT
+
+    def error_response(self, exc, report=None):
+        """
+        Timeout o cancelación de la consulta: 504 con un error estructurado (y se cuenta
+        en el reporte). Misma consulta aún en curso en otro worker: 503 con Retry-After.
+        Otros errores: 500 sin traceback salvo en DEBUG.
+        """
+        if self.execution is not None:
+            self.execution.error_class = type(exc).__name__
+        if isinstance(exc, QueryTimeout):
+            if report is not None:
+                report.record_timeout()
+            logger.warning("Report %s: %s", report.pk if report else 'inventory', exc)
+            return Response({'error': {
+                'code': 'query_cancelled' if exc.cancelled else 'query_timeout',
+                'message': str(exc),
+                'timeout_seconds': exc.timeout,
+            }}, status=status.HTTP_504_GATEWAY_TIMEOUT)
+        if isinstance(exc, ResultPending):
+            return Response({'error': {
+                'code': 'result_pending',
+                'message': str(exc),
+            }}, status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={'Retry-After': str(exc.retry_after)})
+        logger.exception("Report %s failed", report.pk if report else 'inventory')
+        error_details = {'message': str(exc)}
+        if settings.DEBUG:
+            error_details['traceback'] = traceback.format_exc()
+        return Response({'error': error_details}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def run_query(self, cache_key, sql, params, ttl):
+        """
+        Ejecuta la consulta o reutiliza un resultado guardado (ttl en segundos, 0 = sin caché).
+        Devuelve (columnas, filas, hit); la conexión solo se toma del pool si hay que ejecutar.
+        """
+        (columns, rows), hit = result_cache.get_or_execute(
+            cache_key, sql, params, ttl, lambda: self.execute_query(sql, params),
+            timeout=self.get_query_timeout()
+        )
+        return columns, rows, hit
+
+    def execute_query(self, sql, params):
+        """Ejecuta en SQL Server con una conexión del pool; devuelve (columnas, filas)"""
+        with self.sql_connection() as conn:
+            return self.report_manager.execute_sql(
+                conn, sql, params=params or None, timeout=self.get_query_timeout(), stats=self.execution
+            )
+
+    def run_report_query(self, cache_key, sql, params, ttl):
+        """run_query, o por días si el reporte declara una ventana"""
+        if self.window is None:
+            return self.run_query(cache_key, sql, params, ttl)
+        return self.window.run(cache_key, sql, params, ttl, self.execute_query, timeout=self.get_query_timeout())
+
+    def result_payload(self, request, columns, rows):
+        """
+        Columnas una sola vez y filas como listas en formato columnar,
+        o la lista de diccionarios de siempre
+        """
+        if self.execution is not None:
+            self.execution.row_count = len(rows)
+        if request.accepted_renderer.format in COLUMNAR_FORMATS:
+            return {'columns': columns, 'rows': rows}
+        return {'columns': columns, 'results': rows_to_dicts(columns, rows)}
+
+    def apply_filters(self, request, sql, params, specs, extra_filters=()):
+        """
+        Añade como condiciones con parámetros los filtros declarados que vienen en la
+        petición; sin filtros el SQL queda igual
+        """
+        filters = [*extra_filters, *parse_filters(specs, request.query_params)]
+        if not filters:
+            return sql, params
+        where, filter_params = compile_filters(filters, quote_identifier)
+        return filter_sql(sql, where), [*params, *filter_params]
+
+    def report_results(self, request, cache_key, sql, params, ttl):
+        """
+        Respuesta de un reporte: completo, o una página ordenada en SQL Server si se
+        pidió ?page_size o ?cursor. Devuelve (payload, hit de caché).
+        """
+        pagination = ReportPagination(request)
+        if not pagination.enabled:
+            columns, rows, hit = self.run_query(cache_key, sql, params, ttl)
+            return self.result_payload(request, columns, rows), hit
+
+        columns = self.report_manager.describe(
+            self.sql_connection, sql, params or None, timeout=self.get_query_timeout()
+        )
+        order_by = pagination.order_by(columns)
+        # Una fila de más para saber si hay página siguiente
+        page_params = [*params, *report_backend.page_params(pagination.offset, pagination.page_size + 1)]
+        columns, rows, hit = self.run_query(
+            cache_key, page_sql(sql, order_by, report_backend.limit_clause), page_params, ttl
+        )
+        has_next = len(rows) > pagination.page_size
+        payload = self.result_payload(request, columns, rows[:pagination.page_size])
+        payload.update(pagination.links(has_next))
+        if pagination.with_count:
+            _, count_rows, _ = self.run_query(cache_key, count_sql(sql), params, ttl)
+            payload['count'] = count_rows[0][0]
+        return payload, hit
+
+    def get_projects(self, request):
+        """
+        Proyectos del usuario a consultar: ?projects=<id>,<id> o, por defecto, todos los suyos
+        """
+        projects = request.user.projects.order_by('lookup_code')
+        raw = request.query_params.get('projects')
+        if raw:
+            try:
+                ids = {int(value) for value in raw.split(',') if value.strip()}
+            except ValueError:
+                raise ValidationError({'projects': 'Expected a comma-separated list of ids.'})
+            projects = projects.filter(id__in=ids)
+            missing = ids - {project.id for project in projects}
+            if missing:
+                raise ValidationError({'projects': f"Unknown project(s): {', '.join(map(str, sorted(missing)))}"})
+        projects = list(projects)
+        if not projects:
+            raise PermissionDenied({'error': 'User has no associated projects'})
+        if self.execution is not None:
+            self.execution.projects = projects
+        return projects
+
+    def report_query(self, request, report):
+        """
+        SQL del reporte con los filtros declarados. Devuelve (sql, params, proyectos):
+        si el reporte se filtra por proyecto, su lookup_code va antes que `params`;
+        si no, proyectos es None.
+        """
+        projects = self.get_projects(request) if report.requires_project_filter else None
+        sql = self.report_manager.load_sql(report.category, report.file_path)
+        sql, params = self.apply_filters(request, sql, [], report.parameters)
+        return sql, params, projects
+
+    def bound_query(self, sql, params, projects):
+        """Consulta única de todos los proyectos, con toda la ventana si el reporte la declara"""
+        sql, params = self.bind_projects(sql, params, projects)
+        if self.window is not None:
+            sql, params = self.window.filter(sql, params)
+        return sql, params
+
+    @staticmethod
+    def bind_projects(sql, params, projects):
+        """
+        Una sola consulta para todos los proyectos (UNION ALL) con la columna de proyecto;
+        se usa cuando el resultado se pagina, se ordena o se transmite como un todo.
         """
-        Establece una conexión directa a SQL Server usando pyodbc
+        if projects is None:
+            return sql, params
+        bound = []
+        for project in projects:
+            bound += [project.lookup_code, project.lookup_code, *params]
+        return union_sql(sql, len(projects), settings.REPORTS_PROJECT_COLUMN), bound
+
+    def _run_project(self, cache_key, sql, params, ttl):
+        try:
+            return self.run_report_query(cache_key, sql, params, ttl)
+        finally:
+            # La caché de reportes usa la base de datos: cerrar la conexión de este hilo
+            connections.close_all()
+
+    def project_results(self, request, cache_key, sql, params, projects, ttl):
         """
-        connection_string = f"""
-            DRIVER={{{SQL_DRIVER}}};
-            SERVER={SQL_SERVER};
-            DATABASE={SQL_DATABASE};
-            Trusted_Connection=yes;
+        Resultado de todos los proyectos: una consulta por proyecto en paralelo, unidas con
+        la columna de proyecto (la latencia es la del proyecto más lento). Con paginación
+        se usa una sola consulta UNION ALL. Devuelve (payload, hit de caché).
         """
-        return pyodbc.connect(connection_string)
+        if ReportPagination(request).enabled:
+            sql, params = self.bound_query(sql, params, projects)
+            return self.report_results(request, cache_key, sql, params, ttl)
+        columns, rows, hit = self.project_rows(cache_key, sql, params, projects, ttl)
+        return self.result_payload(request, columns, rows), hit
+
+    def project_rows(self, cache_key, sql, params, projects, ttl):
+        """Filas de todos los proyectos sin paginar, con la columna de proyecto; (columnas, filas, hit)"""
+        if projects is None:
+            return self.run_report_query(cache_key, sql, params, ttl)
+
+        if len(projects) == 1:
+            results = [self.run_report_query(cache_key, sql, [projects[0].lookup_code, *params], ttl)]
+        else:
+            futures = [
+                project_executor.submit(self._run_project, cache_key, sql, [project.lookup_code, *params], ttl)
+                for project in projects
+            ]
+            results = [future.result() for future in futures]
+        columns = [settings.REPORTS_PROJECT_COLUMN, *results[0][0]]
+        rows = [
+            [project.lookup_code, *row]
+            for project, (_, project_rows, _) in zip(projects, results)
+            for row in project_rows
+        ]
+        hit = all(result_hit for _, _, result_hit in results)
+        return columns, rows, hit
+
+    @staticmethod
+    def projects_payload(projects):
+        """Info de los proyectos consultados; 'project' es el primero, como antes"""
+        data = [
+            {'id': project.id, 'name': project.name, 'lookup_code': project.lookup_code}
+            for project in projects
+        ]
+        return {'project': data[0], 'projects': data}
 
     @action(detail=True, methods=['get'])
     def execute(self, request, pk=None):
         """
         Ejecuta una consulta desde un archivo SQL y devuelve los resultados
         """
+        stream_format = self.get_stream_format(request)
+        report = self.get_object()
+        self.query_timeout = report.get_timeout()
+        self.window = ReportWindow.for_report(report)
+        self.start_execution(request, 'execute', report)
         try:
-            # Obtener el reporte
-            report = self.get_object()
-            
-            # Parámetros para la consulta
-            params = []
-            
-            # Si el reporte requiere filtro por proyecto
-            if report.requires_project_filter:
-                # Obtener el proyecto asociado al usuario
-                user_projects = request.user.projects.all()
-                if not user_projects.exists():
-                    return Response({'error': 'User has no associated projects'}, 
-                                  status=status.HTTP_403_FORBIDDEN)
-                
-                project = user_projects.first()  # Si hay múltiples, tomamos el primero
-                lookup_code = project.lookup_code
-                params.append(lookup_code)
-            
-            # Ejecutar una consulta desde el archivo SQL
-            conn = self.get_sql_connection()
-            columns, results = self.report_manager.execute_sql_report(
-                conn,
-                report.category,
-                report.file_path,
-                params=params if params else None
+            # Resolver el SQL del reporte con los parámetros del usuario
+            sql, params, projects = self.report_query(request, report)
+
+            # Respuesta en streaming si se pidió (?stream=ndjson|csv)
+            if stream_format:
+                sql, params = self.bound_query(sql, params, projects)
+                return self.stream_report(sql, params, stream_format, f"report_{report.id}")
+
+            # Ejecutar la consulta de cada proyecto (o reutilizar el resultado en caché)
+            response_data, hit = self.project_results(
+                request, report_cache_key(report), sql, params, projects, report.cache_ttl
             )
-            conn.close()
             
-            # Preparar respuesta
-            response_data = {
-                'columns': columns,
-                'results': results
-            }
+            self.execution.cache_hit = hit
             
-            # Añadir info del proyecto si corresponde
-            if report.requires_project_filter and 'project' in locals():
-                response_data['project'] = {
-                    'id': project.id,
-                    'name': project.name,
-                    'lookup_code': project.lookup_code
-                }
+            # Añadir info de los proyectos si corresponde
+            if projects is not None:
+                response_data.update(self.projects_payload(projects))
             
-            return Response(response_data)
+            return Response(response_data, headers={'X-Report-Cache': 'hit' if hit else 'miss'})
+        except APIException:
+            # Errores de parámetros (?sort, ?cursor...): respuesta normal de DRF
+            raise
         except ValueError as e:
             return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
-            import traceback
-            error_details = {
-                'message': str(e),
-                'traceback': traceback.format_exc()
-            }
-            return Response({'error': error_details}, 
-                          status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            return self.error_response(e, report)
+
+    @action(detail=True, methods=['post'])
+    def jobs(self, request, pk=None):
+        """
+        Ejecuta el reporte en segundo plano; el resultado se consulta en report-jobs/<id>/
+        """
+        report = self.get_object()
+        result_format = request.data.get('result_format', 'ndjson')
+        if result_format not in STREAM_FORMATS:
+            raise ValidationError({'result_format': f"Unsupported format: {result_format}"})
+        self.window = ReportWindow.for_report(report)
+        try:
+            sql, params, projects = self.report_query(request, report)
+            sql, params = self.bound_query(sql, params, projects)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            job = job_runner.submit(report, request.user, sql, params, result_format)
+        except JobLimitExceeded as e:
+            return Response({'error': str(e)}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+        serializer = ReportJobSerializer(job, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
 
     @action(detail=False, methods=['get'], url_path='inventory')
     def inventory_by_project(self, request):
         """Get inventory data for user's project with optional order type filter"""
+        stream_format = self.get_stream_format(request)
+        self.start_execution(request, 'inventory')
         try:
             # Get query parameters
             order_type = request.query_params.get('order_type', 'outbound')
             
-            # Get user's project
-            user_projects = request.user.projects.all()
-            if not user_projects.exists():
-                return Response({'error': 'User has no associated projects'}, 
-                              status=status.HTTP_403_FORBIDDEN)
+            # User's projects (?projects=<id>,<id>, all of them by default)
+            projects = self.get_projects(request)
             
-            project = user_projects.first()  # Use first project if multiple
-            lookup_code = project.lookup_code
+            # Outbound orders only see available quantity; other filters come from the query string
+            extra_filters = self.inventory_filters(order_type)
             
-            # Build the SQL query directly
-            sql = """
-            SELECT
-                I.projectLookupCode AS 'Project Lookup Code',
-                I.materialName AS 'Material Code',
-                I.materialDescription AS 'Material Name',
-                I.lotLookupCode AS Lot,
-                I.licensePlateLookupCode AS 'License Plate',
-                I.activeAmount AS 'Available Quantity',
-                imu.name AS UOM,
-                I.warehouseName AS warehouse
-            FROM
-                datex_footprint.InventoryDetailedView AS I
-            INNER JOIN
-                datex_footprint_reporting.MaterialsPackagingsLookupView AS mpl
-                    ON I.materialId = mpl.materialId AND mpl.isBasePackaging = 1
-            INNER JOIN
-                datex_footprint_reporting.InventoryMeasurementUnitsView AS imu
-                    ON mpl.packagingId = imu.id
-            INNER JOIN
-                datex_footprint.LicensePlates AS LP
-                    ON I.licensePlateLookupCode = LP.lookupCode
-            WHERE
-              I.projectLookupCode = ?
-              AND I.lotLookupCode NOT LIKE 'test%'
-              AND I.materialStatusId = 1
-              AND I.lotStatusId = 1
-              AND I.locationStatusId = 1
-              AND I.licensePlateStatusId = 1
-              AND LP.archived = 0
-            """
+            # Local copy kept by sync_inventory, unless it is missing or stale for a project
+            snapshots = self.inventory_snapshots(request, projects)
+            if snapshots is not None:
+                filters = [*extra_filters, *parse_filters(INVENTORY_PARAMETERS, request.query_params)]
+                return self.snapshot_response(request, projects, snapshots, filters, stream_format)
             
-            # Add quantity filter for outbound orders
-            if order_type.lower() == 'outbound':
-                sql += " AND I.activeAmount > 0"
+            # Query loaded from reports/sql/ at startup
+            sql = self.report_manager.load_sql('inventory', 'inventory_by_project.sql')
+            sql, params = self.apply_filters(request, sql, [], INVENTORY_PARAMETERS, extra_filters)
             
-            # Execute the query
-            conn = self.get_sql_connection()
-            cursor = conn.cursor()
-            cursor.execute(sql, [lookup_code])
-            
-            # Get column names and results
-            columns = [column[0] for column in cursor.description]
-            
-            # Construct results dictionary
-            results = []
-            for row in cursor.fetchall():
-                # Handle datetime values for JSON serialization
-                row_dict = {}
-                for i, value in enumerate(row):
-                    if hasattr(value, 'isoformat'):  # Si es una fecha/hora
-                        row_dict[columns[i]] = value.isoformat()
-                    else:
-                        row_dict[columns[i]] = value
-                results.append(row_dict)
+            # Stream the result if requested (?stream=ndjson|csv)
+            if stream_format:
+                stream_sql, stream_params = self.bind_projects(sql, params, projects)
+                filename = f"inventory_{projects[0].lookup_code}" if len(projects) == 1 else "inventory"
+                response = self.stream_report(stream_sql, stream_params, stream_format, filename)
+                response['X-Inventory-Source'] = 'sqlserver'
+                return response
+
+            # Execute one query per project, or reuse cached results for the same project and filters
+            payload, hit = self.project_results(
+                request, 'inventory', sql, params, projects, settings.REPORTS_CACHE['INVENTORY_TTL']
+            )
             
-            conn.close()
+            self.execution.cache_hit = hit
             
             # Return response
             return Response({
-                'columns': columns,
-                'results': results,
-                'project': {
-                    'id': project.id,
-                    'name': project.name,
-                    'lookup_code': project.lookup_code
-                }
-            })
+                **payload,
+                **self.projects_payload(projects),
+            }, headers={'X-Report-Cache': 'hit' if hit else 'miss', 'X-Inventory-Source': 'sqlserver'})
+        except APIException:
+            raise
+        except Exception as e:
+            return self.error_response(e)
+
+    @action(detail=False, methods=['get'], url_path='inventory/grouped')
+    def inventory_grouped(self, request):
+        """
+        Inventario agrupado material -> lote -> LP con cantidades sumadas y el id del
+        Material del portal; mismos filtros y fuente que reports/inventory/
+        """
+        self.start_execution(request, 'inventory_grouped')
+        try:
+            order_type = request.query_params.get('order_type', 'outbound')
+            projects = self.get_projects(request)
+            extra_filters = self.inventory_filters(order_type)
+
+            snapshots = self.inventory_snapshots(request, projects)
+            if snapshots is not None:
+                filters = [*extra_filters, *parse_filters(INVENTORY_PARAMETERS, request.query_params)]
+                columns, rows = snapshot_inventory(projects, filters)
+                columns = [settings.REPORTS_PROJECT_COLUMN, *columns]
+                rows = ([row[0], *row] for row in rows)
+                source, hit = 'snapshot', None
+            else:
+                sql = self.report_manager.load_sql('inventory', 'inventory_by_project.sql')
+                sql, params = self.apply_filters(request, sql, [], INVENTORY_PARAMETERS, extra_filters)
+                # Mismas entradas de caché que reports/inventory/
+                columns, rows, hit = self.project_rows(
+                    'inventory', sql, params, projects, settings.REPORTS_CACHE['INVENTORY_TTL']
+                )
+                source = 'sqlserver'
+
+            materials = group_inventory(columns, rows, projects)
+            self.execution.row_count = len(materials)
+            self.execution.cache_hit = hit
+            headers = {'X-Inventory-Source': source}
+            if hit is not None:
+                headers['X-Report-Cache'] = 'hit' if hit else 'miss'
+            return Response({
+                'materials': materials,
+                **self.projects_payload(projects),
+            }, headers=headers)
+        except APIException:
+            raise
         except Exception as e:
-            import traceback
-            error_details = {
-                'message': str(e),
-                'traceback': traceback.format_exc()
-            }
-            return Response({'error': error_details}, 
-                          status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            return self.error_response(e)
+
+    @staticmethod
+    def inventory_filters(order_type):
+        """Las órdenes outbound solo ven inventario con cantidad disponible"""
+        return [('Available Quantity', 'gt', 0)] if order_type.lower() == 'outbound' else []
+
+    def inventory_snapshots(self, request, projects):
+        """
+        Snapshots locales con los que servir el inventario, o None para consultar SQL Server:
+        ?source=sqlserver, paginación (se ordena en SQL Server) o un proyecto sin
+        snapshot reciente (INVENTORY_SYNC['MAX_AGE'])
+        """
+        source = request.query_params.get('source', settings.INVENTORY_SYNC['SOURCE'])
+        if source not in ('snapshot', 'sqlserver'):
+            raise ValidationError({'source': "Expected 'snapshot' or 'sqlserver'."})
+        if source == 'sqlserver' or ReportPagination(request).enabled:
+            return None
+        return latest_snapshots(projects, settings.INVENTORY_SYNC['MAX_AGE'])
+
+    def snapshot_response(self, request, projects, snapshots, filters, stream_format):
+        """Inventario desde Postgres, con las mismas columnas que la consulta en vivo"""
+        columns, rows = snapshot_inventory(projects, filters)
+        columns = [settings.REPORTS_PROJECT_COLUMN, *columns]
+        rows = ([row[0], *row] for row in rows)
+        if stream_format:
+            filename = f"inventory_{projects[0].lookup_code}" if len(projects) == 1 else "inventory"
+            response = streaming_response(
+                stream_format, columns, chunked(rows, settings.REPORTS_STREAM_CHUNK_SIZE), filename
+            )
+            response['X-Inventory-Source'] = 'snapshot'
+            return response
+        return Response({
+            **self.result_payload(request, columns, list(rows)),
+            **self.projects_payload(projects),
+            'snapshots': [
+                {'project': project.lookup_code, 'version': snapshot.version, 'synced_at': snapshot.synced_at}
+                for project, snapshot in zip(projects, snapshots)
+            ],
+        }, headers={'X-Inventory-Source': 'snapshot'})
+
+    @action(detail=True, methods=['post'], url_path='invalidate-cache', permission_classes=[IsAdminUser])
+    def invalidate_cache(self, request, pk=None):
+        """Descarta los resultados en caché de un reporte"""
+        report = self.get_object()
+        result_cache.invalidate(report_cache_key(report))
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False, methods=['post'], url_path='inventory/invalidate-cache', permission_classes=[IsAdminUser])
+    def invalidate_inventory_cache(self, request):
+        """Descarta los resultados en caché del inventario"""
+        result_cache.invalidate('inventory')
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False, methods=['get'], url_path='pool-stats', permission_classes=[IsAdminUser])
+    def pool_stats(self, request):
+        """Connection pool counters for this worker process"""
+        return Response(report_pool.stats())
+
+
+
+class ReportJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Estado y resultado de los reportes enviados en segundo plano por el usuario
+    """
+    serializer_class = ReportJobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return ReportJob.objects.filter(user=self.request.user).select_related('report')
+
+    @action(detail=True, methods=['get'], url_name='download')
+    def download(self, request, pk=None):
+        """Archivo con el resultado de un trabajo terminado"""
+        job = self.get_object()
+        if job.status != ReportJob.DONE or not os.path.exists(job.result_path):
+            return Response({'error': f"Result not available (status: {job.status})"},
+                            status=status.HTTP_409_CONFLICT)
+        return FileResponse(
+            open(job.result_path, 'rb'),
+            as_attachment=True,
+            filename=f"report_{job.report_id}_{job.pk}.{job.result_format}",
+            content_type=STREAM_FORMATS[job.result_format],
+        )
@@ -0,0 +1,176 @@
+# reports/windows.py
+"""
+Reportes de ventana móvil (p.ej. los envíos de los últimos 30 días) cacheados por día.
+
+El reporte declara la columna de fecha de su resultado (window_column) y los días de
+la ventana (window_days); su SQL solo lleva un tope amplio por si falta la ventana.
+Con cache_ttl > 0 los días cerrados se guardan cada uno en la caché hasta que salen
+de la ventana y solo los días abiertos (hoy, o los últimos REPORTS_WINDOW['OPEN_DAYS'])
+se consultan en cada ejecución. Los días cerrados que faltan se piden juntos, una
+consulta por tramo continuo. Con cache_ttl 0 la ventana es un filtro más.
+
+La ventana es la misma que un filtro `>= ahora - window_days días`: los días se piden y
+se guardan completos, y al unirlos se recorta el día más antiguo a esa hora.
+"""
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+from django.conf import settings
+from django.utils import timezone
+from .cache import result_cache
+from .parameters import compile_filters
+from .report_manager import filter_sql, quote_identifier
+
+MAX_WINDOW_DAYS = 366
+
+
+def window_errors(column, days):
+    """Problemas de la ventana declarada en un ReportDefinition (lista vacía si es válida)."""
+    if not column and days is None:
+        return []
+    if not column or days is None:
+        return ["window_column and window_days must be set together."]
+    if not 1 <= days <= MAX_WINDOW_DAYS:
+        return [f"window_days must be between 1 and {MAX_WINDOW_DAYS}."]
+    return []
+
+
+def _row_day(value):
+    # Las fechas llegan como isoformat desde report_manager.row_converter
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _row_datetime(value, time_zone):
+    # Hora local sin zona, como las columnas de SQL Server y los límites de _where
+    if not isinstance(value, date):
+        value = datetime.fromisoformat(str(value))
+    if not isinstance(value, datetime):
+        return datetime.combine(value, time.min)
+    if timezone.is_aware(value):
+        return timezone.make_naive(value, time_zone)
+    return value
+
+
+class ReportWindow:
+    """Filtro y caché por días de un reporte con ventana; ver el docstring del módulo."""
+
+    def __init__(self, column, days, open_days=1, time_zone=None, cache=result_cache):
+        self.column = column
+        self.days = days
+        self.open_days = max(open_days, 1)
+        self.time_zone = ZoneInfo(time_zone) if time_zone else None
+        self.cache = cache
+
+    @classmethod
+    def for_report(cls, report):
+        """La ventana del reporte, o None si no declara una."""
+        if not report.window_column:
+            return None
+        return cls(
+            report.window_column, report.window_days,
+            open_days=settings.REPORTS_WINDOW['OPEN_DAYS'], time_zone=settings.REPORTS_WINDOW['TIME_ZONE'],
+        )
+
+    def now(self):
+        return timezone.make_naive(timezone.now(), self.time_zone)
+
+    def start(self, now):
+        """Inicio de la ventana: la misma hora de hace `days` días."""
+        return now - timedelta(days=self.days)
+
+    def first_day(self, today):
+        return today - timedelta(days=self.days)
+
+    def first_open_day(self, today):
+        return max(today - timedelta(days=self.open_days - 1), self.first_day(today))
+
+    def _where(self, start, end=None):
+        filters = [(self.column, 'gte', datetime.combine(start, time.min))]
+        if end is not None:
+            filters.append((self.column, 'lt', datetime.combine(end, time.min)))
+        return compile_filters(filters, quote_identifier)
+
+    def filter(self, sql, params, now=None):
+        """Toda la ventana como una condición más (streaming, trabajos y paginación)."""
+        where, window_params = compile_filters([(self.column, 'gte', self.start(now or self.now()))], quote_identifier)
+        return filter_sql(sql, where), [*params, *window_params]
+
+    def _bucket_sql(self, sql, bounded):
+        # Mismo texto para todos los días: solo cambian los parámetros
+        where, _ = self._where(date.min, date.max if bounded else None)
+        return f"{filter_sql(sql, where)}\nORDER BY {quote_identifier(self.column)} DESC"
+
+    def _bucket_params(self, params, start, end=None):
+        _, window_params = self._where(start, end)
+        return [*params, *window_params]
+
+    def run(self, cache_key, sql, params, ttl, execute, now=None, timeout=None):
+        """
+        Resultado de la ventana, del día más reciente al más antiguo. `execute(sql, params)`
+        consulta SQL Server y `ttl` se aplica a los días abiertos; con ttl 0 no se guarda
+        nada, tampoco los días cerrados. Devuelve (columnas, filas, hit).
+        """
+        now = now or self.now()
+        today = now.date()
+        if not ttl:
+            window_sql, window_params = self.filter(sql, params, now)
+            columns, rows = execute(f"{window_sql}\nORDER BY {quote_identifier(self.column)} DESC", window_params)
+            return columns, rows, False
+        first_open = self.first_open_day(today)
+        closed = [self.first_day(today) + timedelta(days=i) for i in range((first_open - self.first_day(today)).days)]
+
+        day_sql = self._bucket_sql(sql, bounded=True)
+        day_params = [self._bucket_params(params, day, day + timedelta(days=1)) for day in closed]
+        buckets = dict(zip(closed, self.cache.get_many(cache_key, day_sql, day_params)))
+        hit = True
+
+        # Días cerrados sin guardar: una consulta por tramo continuo, repartida por día
+        for start, end in self._missing_ranges(closed, buckets):
+            hit = False
+            columns, rows = execute(day_sql, self._bucket_params(params, start, end))
+            position = columns.index(self.column)
+            by_day = {day: [] for day in closed if start <= day < end}
+            for row in rows:
+                by_day[_row_day(row[position])].append(row)
+            for day, day_rows in by_day.items():
+                buckets[day] = (columns, day_rows)
+                # Se guarda hasta que el día sale de la ventana
+                expires = (day - self.first_day(today)).days + 1
+                self.cache.set(
+                    cache_key, day_sql, self._bucket_params(params, day, day + timedelta(days=1)),
+                    buckets[day], expires * 86400
+                )
+
+        open_sql = self._bucket_sql(sql, bounded=False)
+        open_params = self._bucket_params(params, first_open)
+        (columns, rows), open_hit = self.cache.get_or_execute(
+            cache_key, open_sql, open_params, ttl, lambda: execute(open_sql, open_params), timeout=timeout
+        )
+        rows = list(rows)
+        for day in reversed(closed):
+            rows.extend(buckets[day][1])
+        return columns, self._trim(columns, rows, self.start(now)), hit and open_hit
+
+    def _trim(self, columns, rows, start):
+        """Quita las filas anteriores a `start`; solo puede haberlas al final (el día más antiguo)."""
+        position = columns.index(self.column)
+        end = len(rows)
+        while end and _row_datetime(rows[end - 1][position], self.time_zone) < start:
+            end -= 1
+        return rows[:end]
+
+    @staticmethod
+    def _missing_ranges(days, buckets):
+        """[inicio, fin) de cada tramo de días consecutivos sin resultado guardado."""
+        ranges = []
+        for day in days:
+            if buckets.get(day) is not None:
+                continue
+            if ranges and ranges[-1][1] == day:
+                ranges[-1][1] = day + timedelta(days=1)
+            else:
+                ranges.append([day, day + timedelta(days=1)])
+        return [tuple(day_range) for day_range in ranges]